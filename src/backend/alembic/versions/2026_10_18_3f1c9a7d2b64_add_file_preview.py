@@ -0,0 +1,40 @@
+"""add file preview
+
+Revision ID: 3f1c9a7d2b64
+Revises: 74ba7e1b4810
+Create Date: 2026-10-18 10:12:41.118275
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a7d2b64'
+down_revision: Union[str, None] = '74ba7e1b4810'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('files', sa.Column('preview', sa.String(), nullable=False, server_default=''))
+    op.add_column('files', sa.Column('word_count', sa.Integer(), nullable=False, server_default='0'))
+    # backfill the preview (first 25 words) and word count of existing files
+    op.execute(
+        r"""
+        UPDATE files
+        SET preview = array_to_string((regexp_split_to_array(content, '\s+'))[1:25], ' '),
+            word_count = cardinality(regexp_split_to_array(content, '\s+'))
+        FROM (
+            SELECT id AS file_id, regexp_replace(file_content, '^\s+|\s+$', '', 'g') AS content
+            FROM files
+        ) AS trimmed
+        WHERE files.id = trimmed.file_id AND trimmed.content <> ''
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('files', 'word_count')
+    op.drop_column('files', 'preview')
@@ -0,0 +1,29 @@
+"""add message conversation position index
+
+Revision ID: 5d8a2c9e7b13
+Revises: c47d0e8a1f35
+Create Date: 2026-10-18 16:02:27.614903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '5d8a2c9e7b13'
+down_revision: Union[str, None] = 'c47d0e8a1f35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'message_conversation_id_position',
+        'messages',
+        ['conversation_id', 'position'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('message_conversation_id_position', table_name='messages')
@@ -0,0 +1,52 @@
+"""add file chunks
+
+Revision ID: 9b2e4d61c0a8
+Revises: 3f1c9a7d2b64
+Create Date: 2026-10-18 14:36:05.402117
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '9b2e4d61c0a8'
+down_revision: Union[str, None] = '3f1c9a7d2b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'file_chunks',
+        sa.Column('file_id', sa.String(), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('text', sa.String(), nullable=False),
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('english', text)", persisted=True),
+            nullable=True,
+        ),
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['file_id'], ['files.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('file_chunk_file_id', 'file_chunks', ['file_id'], unique=False)
+    op.create_index(
+        'file_chunk_search_vector',
+        'file_chunks',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('file_chunk_search_vector', table_name='file_chunks', postgresql_using='gin')
+    op.drop_index('file_chunk_file_id', table_name='file_chunks')
+    op.drop_table('file_chunks')
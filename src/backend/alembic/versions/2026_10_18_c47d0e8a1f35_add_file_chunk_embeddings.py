@@ -0,0 +1,28 @@
+"""add file chunk embeddings
+
+Revision ID: c47d0e8a1f35
+Revises: 9b2e4d61c0a8
+Create Date: 2026-10-18 17:02:48.730511
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'c47d0e8a1f35'
+down_revision: Union[str, None] = '9b2e4d61c0a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('file_chunks', sa.Column('embedding', postgresql.ARRAY(sa.REAL()), nullable=True))
+    op.add_column('file_chunks', sa.Column('embedding_model', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('file_chunks', 'embedding_model')
+    op.drop_column('file_chunks', 'embedding')
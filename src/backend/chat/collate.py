@@ -1,10 +1,46 @@
+import asyncio
 import json
-from typing import Any, Dict, List
+import re
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List
 
+import numpy as np
+
+from backend.config.settings import Settings
 from backend.model_deployments.base import BaseDeployment
 from backend.schemas.context import Context
+from backend.services.rerank import get_rerank_token_counter, invoke_rerank
 
 RELEVANCE_THRESHOLD = 0.1
+# Maximum number of rerank requests sent at once by a tool step
+RERANK_MAX_CONCURRENCY = Settings().get("deployments.rerank_max_concurrency") or 4
+WORD_PATTERN = re.compile(r"\S+")
+SENTENCE_ENDINGS = ".!?"
+CLOSING_PUNCTUATION = "\"')]\u201d\u2019"
+# Texts from this length are chunked with array operations, when sizes are in words
+VECTORIZED_CHUNKING_MIN_LENGTH = 100_000
+# Limits of the tool output chunks sent to rerank, in tokens of the rerank model
+RERANK_CHUNK_SOFT_TOKEN_CUT_OFF = 130
+RERANK_CHUNK_HARD_TOKEN_CUT_OFF = 400
+# Characters at the start of a text its tokens per word are measured on
+TOKEN_RATIO_SAMPLE_LENGTH = 2000
+
+
+def _character_table(characters: str) -> np.ndarray:
+    # One more entry than the largest code, for every larger code
+    table = np.zeros(max(map(ord, characters)) + 2, dtype=bool)
+    table[[ord(character) for character in characters]] = True
+    return table
+
+
+# Lookup tables by character code
+_WHITESPACE = _character_table(
+    "\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680"
+    + "".join(chr(code) for code in range(0x2000, 0x200B))
+    + "\u2028\u2029\u202f\u205f\u3000"
+)
+_SENTENCE_ENDINGS = _character_table(SENTENCE_ENDINGS)
+_CLOSING_PUNCTUATION = _character_table(CLOSING_PUNCTUATION)
 
 
 async def rerank_and_chunk(
@@ -47,8 +83,12 @@ async def rerank_and_chunk(
             tool_result["outputs"]
         )
 
-    # Rerank the documents for each query
+    # Chunk sizes are counted with the rerank model's tokenizer, so chunks fit its input
+    count_tokens = await get_rerank_token_counter(model, ctx)
+
+    # Rerank the documents for each query, the reranks are sent concurrently
     reranked_results = {}
+    reranks = {}
     for tool_call_hashable, tool_result in unified_tool_results.items():
         tool_call = tool_result["call"]
         query = tool_call.get("parameters").get("query") or tool_call.get(
@@ -69,37 +109,80 @@ async def rerank_and_chunk(
                 reranked_results[tool_call_hashable] = tool_result
                 continue
 
-            chunks = chunk(text)
+            chunks = chunk(
+                text,
+                soft_word_cut_off=RERANK_CHUNK_SOFT_TOKEN_CUT_OFF,
+                hard_word_cut_off=RERANK_CHUNK_HARD_TOKEN_CUT_OFF,
+                count_tokens=count_tokens,
+            )
             chunked_outputs.extend([dict(output, text=chunk) for chunk in chunks])
 
         # If no documents to rerank, continue to the next query
         if not chunked_outputs:
             continue
 
-        res = await model.invoke_rerank(
+        # Keep the position of the tool result, it is replaced by the reranked one
+        reranked_results[tool_call_hashable] = None
+        reranks[tool_call_hashable] = (tool_result, query, chunked_outputs)
+
+    semaphore = asyncio.Semaphore(max(RERANK_MAX_CONCURRENCY, 1))
+    rerank_outputs = await asyncio.gather(
+        *[
+            rerank_outputs_by_query(model, ctx, semaphore, *rerank)
+            for rerank in reranks.values()
+        ]
+    )
+    for tool_call_hashable, reranked_result in zip(reranks, rerank_outputs):
+        reranked_results[tool_call_hashable] = reranked_result
+
+    return list(reranked_results.values())
+
+
+async def rerank_outputs_by_query(
+    model: BaseDeployment,
+    ctx: Context,
+    semaphore: asyncio.Semaphore,
+    tool_result: Dict[str, Any],
+    query: str,
+    chunked_outputs: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """
+    Rerank the chunked outputs of a tool call, keeping the relevant ones by decreasing relevance.
+
+    Args:
+        model (BaseDeployment): Model deployment.
+        ctx (Context): Context object.
+        semaphore (asyncio.Semaphore): Limits the reranks sent at once.
+        tool_result (Dict[str, Any]): The tool result, returned as is if the rerank fails.
+        query (str): The query of the tool call.
+        chunked_outputs (List[Dict[str, Any]]): The outputs of the tool call, one per chunk.
+
+    Returns:
+        Dict[str, Any]: The tool result with the reranked outputs.
+    """
+    async with semaphore:
+        res = await invoke_rerank(
+            model,
             query=query,
             documents=[output["text"] for output in chunked_outputs],
             ctx=ctx,
         )
 
-        if not res:
-            reranked_results[tool_call_hashable] = tool_result
-            continue
-
-        # Sort the results by relevance score
-        res["results"].sort(key=lambda x: x["relevance_score"], reverse=True)
+    if not res:
+        return tool_result
 
-        # Map the results back to the original documents
-        reranked_results[tool_call_hashable] = {
-            "call": tool_call,
-            "outputs": [
-                chunked_outputs[r["index"]]
-                for r in res["results"]
-                if r["relevance_score"] > RELEVANCE_THRESHOLD
-            ],
-        }
+    # Sort the results by relevance score
+    res["results"].sort(key=lambda x: x["relevance_score"], reverse=True)
 
-    return list(reranked_results.values())
+    # Map the results back to the original documents
+    return {
+        "call": tool_result["call"],
+        "outputs": [
+            chunked_outputs[r["index"]]
+            for r in res["results"]
+            if r["relevance_score"] > RELEVANCE_THRESHOLD
+        ],
+    }
 
 
 def chunk(
@@ -107,41 +190,231 @@ def chunk(
     compact_mode: bool = False,
     soft_word_cut_off: int = 100,
     hard_word_cut_off: int = 300,
+    overlap: int = 0,
+    count_tokens: Callable[[str], int] | None = None,
 ) -> list[str]:
-    if compact_mode:
-        content = content.replace("\n", " ")
-
-    chunks = []
-    current_chunk = ""
-    words = content.split()
-    word_count = 0
-
-    for word in words:
-        if word_count + len(word.split()) > hard_word_cut_off:
-            # If adding the next word exceeds the hard limit, finalize the current chunk
-            chunks.append(current_chunk)
-            current_chunk = ""
-            word_count = 0
-
-        if word_count + len(word.split()) > soft_word_cut_off and word.endswith("."):
-            # If adding the next word exceeds the soft limit and the word ends with a period, finalize the current chunk
-            current_chunk += " " + word
-            chunks.append(current_chunk.strip())
-            current_chunk = ""
-            word_count = 0
-        else:
-            # Add the word to the current chunk
-            if current_chunk == "":
-                current_chunk = word
-            else:
-                current_chunk += " " + word
-            word_count += len(word.split())
-
-    # Add any remaining content as the last chunk
-    if current_chunk != "":
-        chunks.append(current_chunk.strip())
-
-    return chunks
+    """
+    Split a text into chunks, see `chunk_spans` for how chunks are delimited. The words of
+    a chunk are joined by single spaces, use `chunk_spans` to slice the text as is.
+
+    Args:
+        content (str): The text to chunk.
+        compact_mode (bool): Kept for compatibility, chunks never keep newlines.
+        soft_word_cut_off (int): Size after which a chunk ends at the next end of sentence.
+        hard_word_cut_off (int): Maximum size of a chunk.
+        overlap (int): Size of the end of a chunk repeated at the start of the next one.
+        count_tokens (Callable[[str], int] | None): Counts the tokens of a text, sizes are in
+            words if not set.
+
+    Returns:
+        list[str]: The chunks, in content order.
+    """
+    spans = chunk_spans(
+        content, soft_word_cut_off, hard_word_cut_off, overlap, count_tokens
+    )
+    return [" ".join(content[start:end].split()) for start, end in spans]
+
+
+def chunk_many(contents: Iterable[str], **kwargs: Any) -> list[list[str]]:
+    """
+    Split each text into chunks with `chunk`, with the same options. The texts are chunked
+    one after the other, only texts long enough for `chunk_spans`' array operations are
+    chunked with them.
+
+    Returns:
+        list[list[str]]: The chunks of each text, in the order of the texts.
+    """
+    return [chunk(content, **kwargs) if content else [] for content in contents]
+
+
+def chunk_spans(
+    content: str,
+    soft_limit: int = 100,
+    hard_limit: int = 300,
+    overlap: int = 0,
+    count_tokens: Callable[[str], int] | None = None,
+) -> list[tuple[int, int]]:
+    """
+    Find the chunks of a text in a single pass over its words, as offsets into the text.
+
+    A chunk ends at the first end of sentence once it is larger than `soft_limit`, or before
+    the word that would make it larger than `hard_limit`. A single word larger than
+    `hard_limit` is a chunk of its own. Sentences end with `.`, `!` or `?`, optionally
+    followed by closing quotes or brackets.
+
+    With `count_tokens`, sizes are in tokens. Tokenizers are slow to call word by word:
+    the chunks are found in words, with the limits converted at the tokens per word of the
+    start of the text, then each chunk is counted once and split if it is too large.
+
+    Args:
+        content (str): The text to chunk.
+        soft_limit (int): Size after which a chunk ends at the next end of sentence.
+        hard_limit (int): Maximum size of a chunk.
+        overlap (int): Size of the end of a chunk repeated at the start of the next one.
+        count_tokens (Callable[[str], int] | None): Counts the tokens of a text, sizes are in
+            words if not set.
+
+    Returns:
+        list[tuple[int, int]]: The start and end offsets of the chunks.
+    """
+    if count_tokens is not None:
+        return _token_chunk_spans(content, soft_limit, hard_limit, overlap, count_tokens)
+
+    if overlap <= 0 and len(content) >= VECTORIZED_CHUNKING_MIN_LENGTH:
+        return _word_chunk_spans(content, soft_limit, hard_limit)
+
+    spans = []
+    chunk_start = chunk_end = 0
+    size = 0
+    # Words of the current chunk, only kept to start the next chunk with the overlap
+    words: deque[tuple[int, int, int]] | None = deque() if overlap > 0 else None
+
+    for match in WORD_PATTERN.finditer(content):
+        start, end = match.span()
+        word_size = 1
+
+        if size and size + word_size > hard_limit:
+            # Adding the word exceeds the hard limit, end the chunk before it
+            if not spans or chunk_end > spans[-1][1]:
+                spans.append((chunk_start, chunk_end))
+                chunk_start, size = _carry_overlap(words, overlap, start)
+            if size + word_size > hard_limit:
+                # The overlap and the word do not fit in a chunk, drop the overlap
+                chunk_start, size = _carry_overlap(words, 0, start)
+
+        if not size:
+            chunk_start = start
+        chunk_end = end
+        size += word_size
+        if words is not None:
+            words.append((start, end, word_size))
+
+        if size > soft_limit and _ends_sentence(content, start, end):
+            # Past the soft limit, end the chunk with the sentence
+            spans.append((chunk_start, chunk_end))
+            chunk_start, size = _carry_overlap(words, overlap, end)
+
+    if size and (not spans or chunk_end > spans[-1][1]):
+        spans.append((chunk_start, chunk_end))
+
+    return spans
+
+
+def _word_chunk_spans(content: str, soft_limit: int, hard_limit: int) -> list[tuple[int, int]]:
+    # Same chunks as the word loop of `chunk_spans`, without overlap and with sizes in words.
+    # Words and sentence ends are found with array operations over the whole text, then
+    # each chunk is found in one step: it ends at the first sentence end from its
+    # `soft_limit + 1`th word, if that is not past its `hard_limit`th word.
+    codes = np.frombuffer(content.encode("utf-32-le"), dtype=np.uint32)
+    is_word = ~_WHITESPACE[np.minimum(codes, len(_WHITESPACE) - 1)]
+    edges = np.diff(is_word.astype(np.int8), prepend=np.int8(0), append=np.int8(0))
+    word_starts = np.flatnonzero(edges == 1)
+    word_ends = np.flatnonzero(edges == -1)
+    if not len(word_starts):
+        return []
+
+    # Skip the closing quotes and brackets at the end of words
+    last = word_ends - 1
+    while True:
+        closing = (last > word_starts) & _CLOSING_PUNCTUATION[
+            np.minimum(codes[last], len(_CLOSING_PUNCTUATION) - 1)
+        ]
+        if not closing.any():
+            break
+        last[closing] -= 1
+    sentence_ends = np.flatnonzero(
+        _SENTENCE_ENDINGS[np.minimum(codes[last], len(_SENTENCE_ENDINGS) - 1)]
+    )
+
+    spans = []
+    word_count = len(word_starts)
+    hard_limit = max(hard_limit, 1)
+    first = 0
+    while first < word_count:
+        last_word = min(first + hard_limit, word_count) - 1
+        index = np.searchsorted(sentence_ends, first + max(soft_limit, 0))
+        if index < len(sentence_ends) and sentence_ends[index] < last_word:
+            last_word = int(sentence_ends[index])
+        spans.append((int(word_starts[first]), int(word_ends[last_word])))
+        first = last_word + 1
+
+    return spans
+
+
+def _token_chunk_spans(
+    content: str,
+    soft_limit: int,
+    hard_limit: int,
+    overlap: int,
+    count_tokens: Callable[[str], int],
+) -> list[tuple[int, int]]:
+    sample = content[:TOKEN_RATIO_SAMPLE_LENGTH]
+    sample_words = len(sample.split())
+    tokens_per_word = count_tokens(sample) / sample_words if sample_words else 1.0
+    tokens_per_word = max(tokens_per_word, 1e-6)
+
+    spans = []
+    for start, end in chunk_spans(
+        content,
+        int(soft_limit / tokens_per_word),
+        max(int(hard_limit / tokens_per_word), 1),
+        int(overlap / tokens_per_word),
+    ):
+        spans.extend(_fit_span(content, start, end, hard_limit, count_tokens))
+    return spans
+
+
+def _fit_span(
+    content: str,
+    start: int,
+    end: int,
+    hard_limit: int,
+    count_tokens: Callable[[str], int],
+) -> list[tuple[int, int]]:
+    # Split a chunk larger than the hard limit, keeping as many of its first words as
+    # its tokens per word allow, until every part fits
+    spans = []
+    while True:
+        tokens = count_tokens(content[start:end])
+        if tokens <= hard_limit:
+            spans.append((start, end))
+            return spans
+
+        words = [match.span() for match in WORD_PATTERN.finditer(content, start, end)]
+        if len(words) <= 1:
+            # A single word larger than the hard limit is a chunk of its own
+            spans.append((start, end))
+            return spans
+
+        kept = max(1, min(len(words) - 1, len(words) * hard_limit // tokens))
+        spans.extend(_fit_span(content, start, words[kept - 1][1], hard_limit, count_tokens))
+        start = words[kept][0]
+
+
+def _carry_overlap(
+    words: deque[tuple[int, int, int]] | None, overlap: int, next_start: int
+) -> tuple[int, int]:
+    # Keep the last words of the ended chunk that fit in the overlap
+    if words is None:
+        return next_start, 0
+
+    carried = deque()
+    size = 0
+    while words and size + words[-1][2] <= overlap:
+        word = words.pop()
+        size += word[2]
+        carried.appendleft(word)
+    words.clear()
+    words.extend(carried)
+    return (carried[0][0] if carried else next_start), size
+
+
+def _ends_sentence(content: str, start: int, end: int) -> bool:
+    # Closing quotes and brackets may follow the punctuation ending a sentence
+    index = end - 1
+    while index > start and content[index] in CLOSING_PUNCTUATION:
+        index -= 1
+    return content[index] in SENTENCE_ENDINGS
 
 
 def to_dict(obj) -> dict:
@@ -1,25 +1,32 @@
+import logging
 from typing import Any, AsyncGenerator, Dict, List
 
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
 from backend.chat.base import BaseChat
-from backend.chat.custom.tool_calls import async_call_tools
+from backend.chat.custom.tool_calls import SpeculativeToolCalls, async_call_tools
 from backend.chat.custom.utils import get_deployment
 from backend.chat.enums import StreamEvent
+from backend.chat.history import pack_chat_history
+from backend.chat.step_state import ChatStepState
 from backend.config import Settings
-from backend.config.tools import get_available_tools
+from backend.config.tools import get_available_tools, get_tool_schemas
 from backend.database_models.file import File
 from backend.model_deployments.base import BaseDeployment
 from backend.schemas.chat import ChatMessage, ChatRole, EventState
 from backend.schemas.cohere_chat import CohereChatRequest
 from backend.schemas.context import Context
-from backend.schemas.tool import Tool, ToolCategory
+from backend.schemas.tool import ToolCategory
 from backend.services.chat import check_death_loop, generate_tools_preamble
 from backend.services.file import get_file_service
+from backend.services.tracing import start_span
 from backend.tools.utils.tools_checkers import tool_has_category
 
 MAX_STEPS = 15
+# Token budget of each request to the model, 0 to always send the whole chat history
+CHAT_HISTORY_MAX_TOKENS = Settings().get("deployments.chat_history_max_tokens") or 0
+SPECULATIVE_TOOL_CALLS = Settings().get("tools.speculative_tool_calls")
 
 class CustomChat(BaseChat):
     """Custom chat flow not using integrations for models."""
@@ -52,7 +59,9 @@ class CustomChat(BaseChat):
         """
         logger = ctx.get_logger()
         deployment_name = ctx.get_deployment_name()
-        deployment_model = get_deployment(deployment_name, session, ctx)
+        with start_span(ctx, "chat.deployment_resolution") as span:
+            deployment_model = get_deployment(deployment_name, session, ctx)
+            span.set_attribute("chat.deployment", deployment_model.__class__.__name__)
 
         # Bind the logger with the conversation ID
         logger.debug(
@@ -67,9 +76,8 @@ class CustomChat(BaseChat):
         self.chat_request = chat_request
         self.is_first_start = True
 
+        stream = self.call_chat(self.chat_request, deployment_model, session, ctx, **kwargs)
         try:
-            stream = self.call_chat(self.chat_request, deployment_model, session, ctx, **kwargs)
-
             async for event in stream:
                 result = self.handle_event(event, chat_request, ctx)
 
@@ -91,6 +99,9 @@ class CustomChat(BaseChat):
                 "error": str(e),
                 "status_code": 500,
             }
+        finally:
+            # Close the steps stream now rather than when it is garbage collected
+            await stream.aclose()
 
 
     def is_final_event(
@@ -201,45 +212,82 @@ class CustomChat(BaseChat):
         if chat_request.tools and Settings().get("tools.use_tools_preamble"):
             chat_request.preamble = generate_tools_preamble(chat_request)
 
-        # Loop until there are no new tool calls
-        for step in range(MAX_STEPS):
-            logger.debug(
-                event=f"[Custom Chat] Chat request: {chat_request.model_dump()}",
-                step=step + 1,
-            )
+        # Serialized once for all the steps
+        step_state = ChatStepState()
 
-            # Invoke chat stream
-            has_tool_calls = False
-            async for event in deployment_model.invoke_chat_stream(
-                chat_request,
-                ctx,
-            ):
-                if event["event_type"] == StreamEvent.STREAM_END:
-                    chat_request.chat_history = event["response"].get(
-                        "chat_history", []
-                    )
-                elif event["event_type"] == StreamEvent.TOOL_CALLS_GENERATION:
-                    has_tool_calls = True
+        count_tokens = None
+        if CHAT_HISTORY_MAX_TOKENS > 0:
+            count_tokens = await deployment_model.get_token_counter(chat_request.model, ctx)
 
-                yield event
+        # Tools can start while the model is still streaming its tool calls
+        speculative_tool_calls = (
+            SpeculativeToolCalls(session, deployment_model, ctx)
+            if SPECULATIVE_TOOL_CALLS
+            else None
+        )
 
-            logger.info(
-                event=f"[Custom Chat] Chat stream completed: Has tool calls {has_tool_calls}",
-            )
+        # Loop until there are no new tool calls
+        try:
+            for step in range(MAX_STEPS):
+                # Every step sends the chat history again, with the tool results of the previous steps
+                if count_tokens is not None:
+                    chat_request.chat_history = pack_chat_history(
+                        chat_request, CHAT_HISTORY_MAX_TOKENS, count_tokens
+                    )
+
+                if logger.is_enabled_for(logging.DEBUG):
+                    logger.debug(
+                        event=f"[Custom Chat] Chat request: {chat_request.model_dump()}",
+                        step=step + 1,
+                    )
 
-            # Check for new tool calls in the chat history
-            if has_tool_calls:
-                # Handle tool calls
-                tool_results = await async_call_tools(
-                    chat_request.chat_history, deployment_model, ctx, session=session, **kwargs
+                # Invoke chat stream
+                has_tool_calls = False
+                with start_span(ctx, "chat.model_step", **{"chat.step": step + 1}) as span:
+                    async for event in deployment_model.invoke_chat_stream(
+                        chat_request,
+                        ctx,
+                        step_state=step_state,
+                    ):
+                        if speculative_tool_calls is not None:
+                            speculative_tool_calls.handle_event(event)
+
+                        if event["event_type"] == StreamEvent.STREAM_END:
+                            chat_request.chat_history = event["response"].get(
+                                "chat_history", []
+                            )
+                        elif event["event_type"] == StreamEvent.TOOL_CALLS_GENERATION:
+                            has_tool_calls = True
+
+                        yield event
+
+                    span.set_attribute("chat.has_tool_calls", has_tool_calls)
+
+                logger.info(
+                    event=f"[Custom Chat] Chat stream completed: Has tool calls {has_tool_calls}",
                 )
 
-                # Remove the message if tool results are present
-                if tool_results:
-                    chat_request.tool_results = list(tool_results)
-                    chat_request.message = ""
-            else:
-                break  # Exit loop if there are no new tool calls
+                # Check for new tool calls in the chat history
+                if has_tool_calls:
+                    # Handle tool calls
+                    tool_results = await async_call_tools(
+                        chat_request.chat_history,
+                        deployment_model,
+                        ctx,
+                        speculative_tool_calls=speculative_tool_calls,
+                        session=session,
+                        **kwargs,
+                    )
+
+                    # Remove the message if tool results are present
+                    if tool_results:
+                        chat_request.tool_results = list(tool_results)
+                        chat_request.message = ""
+                else:
+                    break  # Exit loop if there are no new tool calls
+        finally:
+            if speculative_tool_calls is not None:
+                speculative_tool_calls.cancel()
 
         # Restore the original chat request message if needed
         self.chat_request = chat_request
@@ -253,18 +301,19 @@ class CustomChat(BaseChat):
         chat_request.chat_history.extend(tool_results)
 
     def get_managed_tools(self, chat_request: CohereChatRequest, full_schema=False):
-        available_tools = get_available_tools()
         if full_schema:
+            available_tools = get_available_tools()
             return [
                 available_tools.get(tool.name)
                 for tool in chat_request.tools
                 if available_tools.get(tool.name)
             ]
 
+        tool_schemas = get_tool_schemas()
         return [
-            Tool(**available_tools.get(tool.name).model_dump())
+            tool_schemas[tool.name]
             for tool in chat_request.tools
-            if available_tools.get(tool.name)
+            if tool.name in tool_schemas
         ]
 
     def add_files_to_chat_history(
@@ -279,13 +328,8 @@ class CustomChat(BaseChat):
         files_message = "The user uploaded the following attachments:\n"
 
         for file in files:
-            word_count = len(file.file_content.split())
-
-            # Use the first 25 words as the document preview in the preamble
-            num_words = min(25, word_count)
-            preview = " ".join(file.file_content.split()[:num_words])
-
-            files_message += f"Filename: {file.file_name}\nFile ID: {file.id}\nWord Count: {word_count} Preview: {preview}\n\n"
+            # Use the preview computed on upload (first 25 words) in the preamble
+            files_message += f"Filename: {file.file_name}\nFile ID: {file.id}\nWord Count: {file.word_count} Preview: {file.preview}\n\n"
 
         chat_history.append(ChatMessage(message=files_message, role=ChatRole.SYSTEM))
         return chat_history
@@ -1,20 +1,34 @@
 import asyncio
-from typing import Any, Dict, List
+import json
+import weakref
+from typing import Any, Awaitable, Dict, List
 
-from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
 from backend.chat.collate import rerank_and_chunk, to_dict
+from backend.chat.enums import StreamEvent
+from backend.config.settings import Settings
 from backend.config.tools import get_available_tools
 from backend.model_deployments.base import BaseDeployment
 from backend.schemas.context import Context
+from backend.schemas.tool import ToolDefinition
 from backend.services.logger.utils import LoggerFactory
+from backend.services.tracing import start_span
 from backend.tools.base import (
     ToolAuthException,
     ToolErrorCode,
 )
+from backend.tools.utils.tools_checkers import validate_tool_parameters
 
-TIMEOUT_SECONDS = 60
+TIMEOUT_SECONDS = Settings().get("tools.calls.timeout") or 60
+# Timeouts and limits of concurrent calls, per tool ID
+TOOL_CALL_TIMEOUTS = Settings().get("tools.calls.timeouts") or {}
+TOOL_CALL_MAX_CONCURRENCY = Settings().get("tools.calls.max_concurrency") or {}
+
+# Semaphores are bound to the event loop they are used in
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
 
 logger = LoggerFactory().get_logger()
 
@@ -23,6 +37,7 @@ async def async_call_tools(
     chat_history: List[Dict[str, Any]],
     deployment_model: BaseDeployment,
     ctx: Context,
+    speculative_tool_calls: "SpeculativeToolCalls | None" = None,
     **kwargs: Any,
 ) -> list[dict[str, str]]:
     logger = ctx.get_logger()
@@ -39,11 +54,21 @@ async def async_call_tools(
         tool_plan=to_dict(tool_plan),
     )
 
-    tool_results = await _call_all_tools_async(
-        kwargs.get("session"), tool_calls, deployment_model, ctx
-    )
+    with start_span(
+        ctx,
+        "chat.tool_calls",
+        **{"chat.tools": [tool_call.get("name", "") for tool_call in tool_calls]},
+    ) as span:
+        if speculative_tool_calls is not None:
+            tool_results = await speculative_tool_calls.join(tool_calls)
+            span.set_attribute("chat.speculative_tool_calls", speculative_tool_calls.joined)
+        else:
+            tool_results = await _call_all_tools_async(
+                kwargs.get("session"), tool_calls, deployment_model, ctx
+            )
 
-    tool_results = await rerank_and_chunk(tool_results, deployment_model, ctx, **kwargs)
+    with start_span(ctx, "chat.rerank_and_chunk"):
+        tool_results = await rerank_and_chunk(tool_results, deployment_model, ctx, **kwargs)
     logger.info(
         event="[Custom Chat] Tool results",
         tool_results=to_dict(tool_results),
@@ -62,18 +87,137 @@ async def _call_all_tools_async(
         _call_tool_async(ctx, db, tool_call, deployment_model)
         for tool_call in tool_calls
     ]
-    combined = asyncio.gather(*tasks)
-    try:
-        tool_results = await asyncio.wait_for(combined, timeout=TIMEOUT_SECONDS)
-        # Flatten a list of list of tool results
-        return [n for m in tool_results for n in m]
-    except asyncio.TimeoutError:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Timeout while calling tools with timeout: {TIMEOUT_SECONDS}",
+    return await _gather_tool_results(tasks)
+
+
+async def _gather_tool_results(tasks: list[Awaitable[List[Dict[str, Any]]]]) -> list[dict[str, Any]]:
+    # Each tool call has its own deadline, a cancelled turn cancels the calls still running
+    tool_results = await asyncio.gather(*tasks)
+    # Flatten a list of list of tool results
+    return [n for m in tool_results for n in m]
+
+
+class SpeculativeToolCalls:
+    """
+    Calls the tools of a chat turn's steps while the model is still streaming its tool calls.
+
+    A tool call starts as soon as its parameters are complete and valid: when the model
+    starts streaming the next tool call, or when the tool calls generation event lists
+    them all, ahead of the end of the stream. `join` then waits for the tool calls of the
+    step, starting those that did not start and cancelling those the model did not keep.
+    """
+
+    def __init__(self, db: Session, deployment_model: BaseDeployment, ctx: Context):
+        self.db = db
+        self.deployment_model = deployment_model
+        self.ctx = ctx
+        # Number of tool calls of the last joined step that had started speculatively
+        self.joined = 0
+        self._streamed: dict[int, dict[str, str]] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    def handle_event(self, event: Dict[str, Any]) -> None:
+        """
+        Start the tool calls completed by a chat stream event.
+        """
+        event_type = event["event_type"]
+        if event_type == StreamEvent.STREAM_START:
+            self._streamed.clear()
+        elif event_type == StreamEvent.TOOL_CALLS_CHUNK:
+            self._handle_tool_call_delta(event.get("tool_call_delta"))
+        elif event_type == StreamEvent.TOOL_CALLS_GENERATION:
+            for tool_call in event.get("tool_calls") or []:
+                self._start(tool_call)
+
+    async def join(self, tool_calls: list[dict]) -> list[dict[str, Any]]:
+        """
+        Get the results of the step's final tool calls.
+
+        Args:
+            tool_calls (list[dict]): The tool calls of the step, from the model's response
+
+        Returns:
+            list[dict[str, Any]]: The tool results, in the order of the tool calls
+        """
+        keys = [_tool_call_key(tool_call) for tool_call in tool_calls]
+        for key, task in self._tasks.items():
+            if key not in keys:
+                task.cancel()
+
+        tasks = []
+        self.joined = 0
+        for key, tool_call in zip(keys, tool_calls):
+            task = self._tasks.pop(key, None)
+            if task is None:
+                task = _call_tool_async(self.ctx, self.db, tool_call, self.deployment_model)
+            else:
+                self.joined += 1
+            tasks.append(task)
+        self._tasks.clear()
+
+        return await _gather_tool_results(tasks)
+
+    def cancel(self) -> None:
+        """
+        Cancel the tool calls that were not joined.
+        """
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+
+    def _handle_tool_call_delta(self, tool_call_delta: Dict[str, Any] | None) -> None:
+        if not tool_call_delta or tool_call_delta.get("index") is None:
+            return
+
+        index = tool_call_delta["index"]
+        if index not in self._streamed:
+            # Tool calls are streamed one after the other, so the previous ones are complete
+            for streamed in self._streamed.values():
+                self._start_streamed(streamed)
+            self._streamed[index] = {"name": "", "parameters": ""}
+
+        streamed = self._streamed[index]
+        streamed["name"] = tool_call_delta.get("name") or streamed["name"]
+        streamed["parameters"] += tool_call_delta.get("parameters") or ""
+
+    def _start_streamed(self, streamed: dict[str, str]) -> None:
+        try:
+            parameters = json.loads(streamed["parameters"] or "{}")
+        except json.JSONDecodeError:
+            return
+
+        if isinstance(parameters, dict):
+            self._start({"name": streamed["name"], "parameters": parameters})
+
+    def _start(self, tool_call: dict) -> None:
+        key = _tool_call_key(tool_call)
+        if key in self._tasks:
+            return
+
+        # Unknown tools and invalid parameters are left to the call at the end of the step
+        tool_definition = get_available_tools().get(tool_call.get("name"))
+        if not tool_definition:
+            return
+        try:
+            validate_tool_parameters(
+                tool_definition.parameter_definitions or {},
+                tool_call.get("parameters") or {},
+            )
+        except (ValueError, TypeError):
+            return
+
+        self._tasks[key] = asyncio.create_task(
+            _call_tool_async(self.ctx, self.db, tool_call, self.deployment_model)
         )
 
 
+def _tool_call_key(tool_call: dict) -> str:
+    return json.dumps(
+        {"name": tool_call.get("name"), "parameters": tool_call.get("parameters") or {}},
+        sort_keys=True,
+        default=str,
+    )
+
 
 async def _call_tool_async(
     ctx: Context,
@@ -94,6 +238,62 @@ async def _call_tool_async(
         ]
         return outputs
 
+    timeout = TOOL_CALL_TIMEOUTS.get(tool_call["name"], TIMEOUT_SECONDS)
+    try:
+        return await asyncio.wait_for(
+            _call_tool_limited(ctx, db, tool_call, tool_definition, deployment_model),
+            timeout=timeout,
+        )
+    except asyncio.TimeoutError:
+        logger.warning(
+            event=f"[Custom Chat] Tool call timed out: {tool_call['name']}",
+            timeout=timeout,
+        )
+        return [
+            {
+                "call": tool_call,
+                "outputs": tool_definition.implementation.get_tool_error(
+                    details=f"The tool did not respond within {timeout} seconds",
+                    text="Tool call timed out",
+                    error_type=ToolErrorCode.TIMEOUT,
+                ),
+            }
+        ]
+
+
+async def _call_tool_limited(
+    ctx: Context,
+    db: Session,
+    tool_call: dict,
+    tool_definition: ToolDefinition,
+    deployment_model: BaseDeployment,
+) -> List[Dict[str, Any]]:
+    semaphore = _get_tool_semaphore(tool_call["name"])
+    if semaphore is None:
+        return await _run_tool(ctx, db, tool_call, tool_definition, deployment_model)
+
+    async with semaphore:
+        return await _run_tool(ctx, db, tool_call, tool_definition, deployment_model)
+
+
+def _get_tool_semaphore(tool_name: str) -> asyncio.Semaphore | None:
+    max_concurrency = TOOL_CALL_MAX_CONCURRENCY.get(tool_name)
+    if not max_concurrency:
+        return None
+
+    semaphores = _semaphores.setdefault(asyncio.get_running_loop(), {})
+    if tool_name not in semaphores:
+        semaphores[tool_name] = asyncio.Semaphore(max_concurrency)
+    return semaphores[tool_name]
+
+
+async def _run_tool(
+    ctx: Context,
+    db: Session,
+    tool_call: dict,
+    tool_definition: ToolDefinition,
+    deployment_model: BaseDeployment,
+) -> List[Dict[str, Any]]:
     tool = tool_definition.implementation()
 
     try:
@@ -0,0 +1,139 @@
+import json
+from typing import Any, Callable
+
+from backend.schemas.chat import ChatMessage, ChatRole
+from backend.schemas.cohere_chat import CohereChatRequest
+
+# Characters kept of each text field of a compressed tool output
+COMPRESSED_TOOL_OUTPUT_CHARACTERS = 200
+# Tokens added per message by the chat template
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def pack_chat_history(
+    chat_request: CohereChatRequest,
+    max_tokens: int,
+    count_tokens: Callable[[str], int],
+) -> list[ChatMessage | dict[str, Any]]:
+    """
+    Fit the chat history of a request in a token budget.
+
+    The preamble, message and tool results of the request, the system messages and the
+    latest turn are always kept. Older tool outputs are compressed first, oldest first,
+    then the oldest turns are dropped until the request fits the budget.
+
+    Args:
+        chat_request (CohereChatRequest): The chat request, it is not modified
+        max_tokens (int): Token budget of the request
+        count_tokens (Callable[[str], int]): Counts the tokens of a text for the model
+
+    Returns:
+        list[ChatMessage | dict[str, Any]]: The packed chat history
+    """
+    chat_history = list(chat_request.chat_history or [])
+    budget = max_tokens - _count_request_tokens(chat_request, count_tokens)
+    costs = [_count_message_tokens(message, count_tokens) for message in chat_history]
+    total = sum(costs)
+    if total <= budget:
+        return chat_history
+
+    # Messages of the latest turn, from the last user message, are never touched
+    latest_turn_start = _latest_turn_start(chat_history)
+
+    for index in range(latest_turn_start):
+        if total <= budget:
+            return chat_history
+        message = chat_history[index]
+        if _get(message, "role") != ChatRole.TOOL or not _get(message, "tool_results"):
+            continue
+
+        chat_history[index] = _compress_tool_message(message)
+        cost = _count_message_tokens(chat_history[index], count_tokens)
+        total -= costs[index] - cost
+        costs[index] = cost
+
+    # Whole turns are dropped, so tool results are never separated from their tool calls
+    kept = [True] * len(chat_history)
+    for start, end in _turns(chat_history, latest_turn_start):
+        if total <= budget:
+            break
+        for index in range(start, end):
+            if _get(chat_history[index], "role") != ChatRole.SYSTEM:
+                kept[index] = False
+                total -= costs[index]
+
+    return [message for message, keep in zip(chat_history, kept) if keep]
+
+
+def _count_request_tokens(
+    chat_request: CohereChatRequest, count_tokens: Callable[[str], int]
+) -> int:
+    tokens = count_tokens(chat_request.preamble or "") + count_tokens(chat_request.message or "")
+    if chat_request.tool_results:
+        tokens += count_tokens(json.dumps(chat_request.tool_results, default=str))
+    return tokens
+
+
+def _count_message_tokens(
+    message: ChatMessage | dict[str, Any], count_tokens: Callable[[str], int]
+) -> int:
+    tokens = MESSAGE_OVERHEAD_TOKENS + count_tokens(_get(message, "message") or "")
+    for key in ("tool_calls", "tool_results"):
+        value = _get(message, key)
+        if value:
+            tokens += count_tokens(json.dumps(value, default=str))
+    return tokens
+
+
+def _latest_turn_start(chat_history: list[ChatMessage | dict[str, Any]]) -> int:
+    for index in range(len(chat_history) - 1, -1, -1):
+        if _get(chat_history[index], "role") == ChatRole.USER:
+            return index
+    return 0
+
+
+def _turns(
+    chat_history: list[ChatMessage | dict[str, Any]], end: int
+) -> list[tuple[int, int]]:
+    # Start and end indexes of the turns before `end`, each starts at a user message
+    starts = [0] + [
+        index
+        for index in range(1, end)
+        if _get(chat_history[index], "role") == ChatRole.USER
+    ]
+    return list(zip(starts, starts[1:] + [end]))
+
+
+def _compress_tool_message(message: ChatMessage | dict[str, Any]) -> ChatMessage | dict[str, Any]:
+    tool_results = [
+        {
+            **tool_result,
+            "outputs": [
+                _compress_tool_output(output) for output in tool_result.get("outputs") or []
+            ],
+        }
+        for tool_result in _get(message, "tool_results")
+    ]
+
+    if isinstance(message, ChatMessage):
+        return message.model_copy(update={"tool_results": tool_results})
+    return {**message, "tool_results": tool_results}
+
+
+def _compress_tool_output(output: Any) -> Any:
+    if not isinstance(output, dict):
+        return output
+
+    return {
+        key: value[:COMPRESSED_TOOL_OUTPUT_CHARACTERS] + "..."
+        if isinstance(value, str) and len(value) > COMPRESSED_TOOL_OUTPUT_CHARACTERS
+        else value
+        for key, value in output.items()
+    }
+
+
+def _get(message: ChatMessage | dict[str, Any], key: str) -> Any:
+    # Chat history holds messages of the request, and dicts of the model's responses
+    if isinstance(message, dict):
+        return message.get(key)
+    return getattr(message, key, None)
@@ -0,0 +1,78 @@
+from typing import Any
+
+from backend.schemas.chat import ChatMessage
+from backend.schemas.cohere_chat import CohereChatRequest
+
+# Fields of the chat request that change between the steps of a turn
+STEP_FIELDS = {"message", "tool_results", "chat_history"}
+
+
+class ChatStepState:
+    """
+    Serialized chat request shared by the steps of a chat turn.
+
+    The fields that do not change between steps (preamble, tools, documents and the
+    generation parameters) are serialized once per turn, and each chat history message
+    once, so a step only serializes what was added since the previous one. History
+    messages from the model's responses are already dicts and are sent as they are.
+    """
+
+    def __init__(self):
+        self._static: dict[str, Any] | None = None
+        self._static_key: tuple | None = None
+        self._messages: dict[int, tuple[ChatMessage, dict[str, Any]]] = {}
+
+    def dump(
+        self, chat_request: CohereChatRequest, exclude: set[str] | None = None
+    ) -> dict[str, Any]:
+        """
+        Serialize the chat request of a step, like `chat_request.model_dump(exclude=exclude)`.
+
+        Args:
+            chat_request (CohereChatRequest): The chat request of the step
+            exclude (set[str] | None): Fields the deployment does not accept
+
+        Returns:
+            dict[str, Any]: The keyword arguments of the deployment's chat call
+        """
+        exclude = exclude or set()
+        request = dict(self._dump_static(chat_request, exclude))
+
+        for field in STEP_FIELDS - exclude:
+            request[field] = getattr(chat_request, field)
+
+        if request.get("chat_history") is not None:
+            request["chat_history"] = self._dump_chat_history(request["chat_history"])
+
+        return request
+
+    def _dump_static(
+        self, chat_request: CohereChatRequest, exclude: set[str]
+    ) -> dict[str, Any]:
+        # Set before the steps, serialized again only if they are replaced
+        key = (
+            frozenset(exclude),
+            chat_request.preamble,
+            id(chat_request.tools),
+            id(chat_request.documents),
+        )
+        if self._static is None or self._static_key != key:
+            self._static = chat_request.model_dump(exclude=exclude | STEP_FIELDS)
+            self._static_key = key
+        return self._static
+
+    def _dump_chat_history(self, chat_history: list[Any]) -> list[Any]:
+        messages = {}
+        dumped = []
+        for message in chat_history:
+            if not isinstance(message, ChatMessage):
+                dumped.append(message)
+                continue
+
+            # The message is kept with its dump, so its ID is not reused while cached
+            _, message_dump = self._messages.get(id(message)) or (message, message.model_dump())
+            messages[id(message)] = (message, message_dump)
+            dumped.append(message_dump)
+
+        self._messages = messages
+        return dumped
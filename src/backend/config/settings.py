@@ -1,7 +1,8 @@
 import sys
-from typing import Any, List, Optional, Tuple, Type
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Type
 
-from pydantic import AliasChoices, BaseModel, Field
+from pydantic import AliasChoices, BaseModel, Field, PrivateAttr
 from pydantic_settings import (
     BaseSettings,
     PydanticBaseSettingsSource,
@@ -287,6 +288,38 @@ class SharepointSettings(BaseSettings, BaseModel):
     )
 
 
+class ToolResultCacheSettings(BaseSettings, BaseModel):
+    model_config = SETTINGS_CONFIG
+    enabled: Optional[bool] = Field(
+        default=True,
+        validation_alias=AliasChoices("TOOL_RESULT_CACHE_ENABLED", "enabled"),
+    )
+    max_entries: Optional[int] = Field(
+        default=1024,
+        validation_alias=AliasChoices("TOOL_RESULT_CACHE_MAX_ENTRIES", "max_entries"),
+    )
+    ttls: Optional[Dict[str, int]] = Field(
+        default={},
+        validation_alias=AliasChoices("TOOL_RESULT_CACHE_TTLS", "ttls"),
+    )
+
+
+class ToolCallSettings(BaseSettings, BaseModel):
+    model_config = SETTINGS_CONFIG
+    timeout: Optional[float] = Field(
+        default=60,
+        validation_alias=AliasChoices("TOOL_CALL_TIMEOUT", "timeout"),
+    )
+    timeouts: Optional[Dict[str, float]] = Field(
+        default={},
+        validation_alias=AliasChoices("TOOL_CALL_TIMEOUTS", "timeouts"),
+    )
+    max_concurrency: Optional[Dict[str, int]] = Field(
+        default={},
+        validation_alias=AliasChoices("TOOL_CALL_MAX_CONCURRENCY", "max_concurrency"),
+    )
+
+
 class ToolSettings(BaseSettings, BaseModel):
     model_config = SETTINGS_CONFIG
 
@@ -325,6 +358,16 @@ class ToolSettings(BaseSettings, BaseModel):
         default=False,
         validation_alias=AliasChoices("USE_TOOLS_PREAMBLE", "use_tools_preamble")
     )
+    speculative_tool_calls: Optional[bool] = Field(
+        default=False,
+        validation_alias=AliasChoices(
+            "SPECULATIVE_TOOL_CALLS", "speculative_tool_calls"
+        ),
+    )
+    result_cache: Optional[ToolResultCacheSettings] = Field(
+        default=ToolResultCacheSettings()
+    )
+    calls: Optional[ToolCallSettings] = Field(default=ToolCallSettings())
 
 
 class DatabaseSettings(BaseSettings, BaseModel):
@@ -335,6 +378,36 @@ class DatabaseSettings(BaseSettings, BaseModel):
     migrate_token: Optional[str] = Field(
         default=None, validation_alias=AliasChoices("MIGRATE_TOKEN", "migrate_token")
     )
+    chat_persistence_checkpoint: Optional[int] = Field(
+        default=0,
+        validation_alias=AliasChoices(
+            "CHAT_PERSISTENCE_CHECKPOINT", "chat_persistence_checkpoint"
+        ),
+    )
+    chat_history_max_messages: Optional[int] = Field(
+        default=100,
+        validation_alias=AliasChoices(
+            "CHAT_HISTORY_MAX_MESSAGES", "chat_history_max_messages"
+        ),
+    )
+    pool_size: Optional[int] = Field(
+        default=5, validation_alias=AliasChoices("DATABASE_POOL_SIZE", "pool_size")
+    )
+    max_overflow: Optional[int] = Field(
+        default=10,
+        validation_alias=AliasChoices("DATABASE_MAX_OVERFLOW", "max_overflow"),
+    )
+    pool_timeout: Optional[int] = Field(
+        default=30,
+        validation_alias=AliasChoices("DATABASE_POOL_TIMEOUT", "pool_timeout"),
+    )
+    pool_recycle: Optional[int] = Field(
+        default=-1,
+        validation_alias=AliasChoices("DATABASE_POOL_RECYCLE", "pool_recycle"),
+    )
+    async_url: Optional[str] = Field(
+        default=None, validation_alias=AliasChoices("DATABASE_ASYNC_URL", "async_url")
+    )
 
 
 class RedisSettings(BaseSettings, BaseModel):
@@ -342,6 +415,14 @@ class RedisSettings(BaseSettings, BaseModel):
     url: Optional[str] = Field(
         default=None, validation_alias=AliasChoices("REDIS_URL", "url")
     )
+    max_connections: Optional[int] = Field(
+        default=50,
+        validation_alias=AliasChoices("REDIS_MAX_CONNECTIONS", "max_connections"),
+    )
+    cache_backend: Optional[str] = Field(
+        default="redis",
+        validation_alias=AliasChoices("REDIS_CACHE_BACKEND", "cache_backend"),
+    )
 
 
 class GoogleCloudSettings(BaseSettings, BaseModel):
@@ -425,6 +506,36 @@ class DeploymentSettings(BaseSettings, BaseModel):
     model_config = SETTINGS_CONFIG
     default_deployment: Optional[str] = None
     enabled_deployments: Optional[List[str]] = None
+    offload_sync_clients: Optional[bool] = Field(
+        default=False,
+        validation_alias=AliasChoices(
+            "DEPLOYMENTS_OFFLOAD_SYNC_CLIENTS", "offload_sync_clients"
+        ),
+    )
+    definitions_cache_ttl: Optional[int] = Field(
+        default=300,
+        validation_alias=AliasChoices(
+            "DEPLOYMENTS_DEFINITIONS_CACHE_TTL", "definitions_cache_ttl"
+        ),
+    )
+    rerank_cache_max_entries: Optional[int] = Field(
+        default=4096,
+        validation_alias=AliasChoices(
+            "DEPLOYMENTS_RERANK_CACHE_MAX_ENTRIES", "rerank_cache_max_entries"
+        ),
+    )
+    rerank_max_concurrency: Optional[int] = Field(
+        default=4,
+        validation_alias=AliasChoices(
+            "DEPLOYMENTS_RERANK_MAX_CONCURRENCY", "rerank_max_concurrency"
+        ),
+    )
+    chat_history_max_tokens: Optional[int] = Field(
+        default=0,
+        validation_alias=AliasChoices(
+            "DEPLOYMENTS_CHAT_HISTORY_MAX_TOKENS", "chat_history_max_tokens"
+        ),
+    )
 
     azure: Optional[AzureSettings] = Field(default=AzureSettings())
     bedrock: Optional[BedrockSettings] = Field(default=BedrockSettings())
@@ -455,17 +566,82 @@ class MetricsSettings(BaseSettings, BaseModel):
     enabled: Optional[bool] = Field(
         default=False, validation_alias=AliasChoices("METRICS_ENABLED", "enabled")
     )
+    flush_interval: Optional[int] = Field(
+        default=10,
+        validation_alias=AliasChoices("METRICS_FLUSH_INTERVAL", "flush_interval"),
+    )
+
+
+class TracingSettings(BaseSettings, BaseModel):
+    model_config = SETTINGS_CONFIG
+    enabled: Optional[bool] = Field(
+        default=False, validation_alias=AliasChoices("TRACING_ENABLED", "enabled")
+    )
+    export_path: Optional[str] = Field(
+        default="./traces/traces.jsonl",
+        validation_alias=AliasChoices("TRACING_EXPORT_PATH", "export_path"),
+    )
+
+
+class FileSettings(BaseSettings, BaseModel):
+    model_config = SETTINGS_CONFIG
+    extraction_workers: Optional[int] = Field(
+        default=4,
+        validation_alias=AliasChoices(
+            "FILE_EXTRACTION_WORKERS", "extraction_workers"
+        ),
+    )
+    extraction_timeout: Optional[int] = Field(
+        default=60,
+        validation_alias=AliasChoices(
+            "FILE_EXTRACTION_TIMEOUT", "extraction_timeout"
+        ),
+    )
+    extraction_concurrency: Optional[int] = Field(
+        default=2,
+        validation_alias=AliasChoices(
+            "FILE_EXTRACTION_CONCURRENCY", "extraction_concurrency"
+        ),
+    )
+
+
+class CachedSettingsMeta(type(BaseSettings)):
+    """
+    Metaclass making `Settings()` return the process-wide settings instead of re-reading
+    the environment and configuration files on every call.
+    """
+
+    def __call__(cls, *args, **kwargs):
+        # Explicit values build a separate, uncached instance
+        if args or kwargs:
+            return super().__call__(*args, **kwargs)
 
+        instance = _cached_settings.get(cls)
+        if instance is None:
+            with _cached_settings_lock:
+                instance = _cached_settings.get(cls)
+                if instance is None:
+                    instance = super().__call__()
+                    _cached_settings[cls] = instance
+        return instance
 
-class Settings(BaseSettings):
+
+_cached_settings: dict[type, "Settings"] = {}
+_cached_settings_lock = threading.Lock()
+
+
+class Settings(BaseSettings, metaclass=CachedSettingsMeta):
     """
     Settings class used to grab environment variables from configuration.yaml
     and secrets.yaml files. Backwards compatible with .env setup.
 
     Uppercase env variables are converted to class parameters.
+
+    Settings are read once per process, `Settings()` returns the same read-only instance
+    until `Settings.reload()` is called.
     """
 
-    model_config = SETTINGS_CONFIG
+    model_config = SettingsConfigDict(**SETTINGS_CONFIG, frozen=True)
     auth: Optional[AuthSettings] = Field(default=AuthSettings())
     feature_flags: Optional[FeatureFlags] = Field(default=FeatureFlags())
     tools: Optional[ToolSettings] = Field(default=ToolSettings())
@@ -475,16 +651,42 @@ class Settings(BaseSettings):
     deployments: Optional[DeploymentSettings] = Field(default=DeploymentSettings())
     logger: Optional[LoggerSettings] = Field(default=LoggerSettings())
     metrics: Optional[MetricsSettings] = Field(default=MetricsSettings())
+    tracing: Optional[TracingSettings] = Field(default=TracingSettings())
+    files: Optional[FileSettings] = Field(default=FileSettings())
+
+    _values: dict[str, Any] = PrivateAttr(default_factory=dict)
 
     def get(self, path: str) -> Any:
+        # Resolved paths are memoized, settings don't change until reloaded. The private
+        # attributes dict is read directly, pydantic's attribute lookup is slower.
+        values = self.__pydantic_private__["_values"]
+        try:
+            return values[path]
+        except KeyError:
+            pass
+
         keys = path.split('.')
         value = self
         for key in keys:
             value = getattr(value, key, None)
             if value is None:
-                return None
+                break
+
+        values[path] = value
         return value
 
+    @classmethod
+    def reload(cls) -> "Settings":
+        """
+        Re-read the settings, e.g. after the environment or configuration files changed.
+
+        Returns:
+            Settings: The new process-wide settings
+        """
+        with _cached_settings_lock:
+            _cached_settings.pop(cls, None)
+        return cls()
+
     @classmethod
     def settings_customise_sources(
         cls,
@@ -1,6 +1,9 @@
 from enum import Enum
+from types import MappingProxyType
+from typing import Mapping
 
 from backend.config.settings import Settings
+from backend.schemas.tool import Tool as ToolSchema
 from backend.schemas.tool import ToolDefinition
 from backend.services.logger.utils import LoggerFactory
 from backend.tools import (
@@ -17,12 +20,15 @@ from backend.tools import (
     SharepointTool,
     SlackTool,
     TavilyWebSearch,
+    VectorSearchFileTool,
     WebScrapeTool,
 )
 from backend.tools.github.tool import GithubTool
 
 logger = LoggerFactory().get_logger()
 
+_tool_registry: tuple[Mapping[str, ToolDefinition], Mapping[str, ToolSchema]] | None = None
+
 """
 Tool Name enum, mapping to the tool's main implementation class.
 """
@@ -30,6 +36,7 @@ class Tool(Enum):
     Wiki_Retriever_LangChain = LangChainWikiRetriever
     Read_File = ReadFileTool
     Search_File = SearchFileTool
+    Vector_Search_File = VectorSearchFileTool
     Python_Interpreter = PythonInterpreter
     Calculator = Calculator
     Google_Drive = GoogleDrive
@@ -44,7 +51,51 @@ class Tool(Enum):
     Sharepoint = SharepointTool
 
 
-def get_available_tools() -> dict[str, ToolDefinition]:
+def get_available_tools() -> Mapping[str, ToolDefinition]:
+    """
+    Get the tool registry, built once and then reused by every request.
+
+    The definitions are shared, copy one before changing it for a request.
+
+    Returns:
+        Mapping[str, ToolDefinition]: Read-only mapping of tool definitions keyed by tool ID
+    """
+    if _tool_registry is None:
+        reload_available_tools()
+    return _tool_registry[0]
+
+
+def get_tool_schemas() -> Mapping[str, ToolSchema]:
+    """
+    Get the schemas of the available tools, as sent to the model.
+
+    Returns:
+        Mapping[str, ToolSchema]: Read-only mapping of tool schemas keyed by tool ID
+    """
+    if _tool_registry is None:
+        reload_available_tools()
+    return _tool_registry[1]
+
+
+def reload_available_tools() -> Mapping[str, ToolDefinition]:
+    """
+    Rebuild the tool registry, e.g. after the configuration changed.
+
+    Returns:
+        Mapping[str, ToolDefinition]: The new tool registry
+    """
+    global _tool_registry
+    tools = build_available_tools()
+    schemas = {
+        tool_id: ToolSchema(**tool.model_dump()) for tool_id, tool in tools.items()
+    }
+
+    # Swap both mappings at once so readers never see a partial registry
+    _tool_registry = (MappingProxyType(tools), MappingProxyType(schemas))
+    return _tool_registry[0]
+
+
+def build_available_tools() -> dict[str, ToolDefinition]:
     # Get list of implementations from Tool Enum
     tool_classes = [tool.value for tool in Tool]
     # Generate dictionary of ToolDefinitions keyed by Tool ID
@@ -0,0 +1,196 @@
+from typing import Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy.sql.expression import false, true
+
+from backend.database_models.agent import Agent
+from backend.database_models.base import apply_global_filters
+from backend.schemas.agent import AgentVisibility, UpdateAgentDB
+from backend.services.transaction import validate_async_transaction
+
+# Relationships are not lazy loaded in async sessions, load everything the
+# agent schemas read up front
+AGENT_LOAD_OPTIONS = (
+    selectinload(Agent.tools_metadata),
+    selectinload(Agent.assigned_deployment),
+    selectinload(Agent.assigned_model),
+)
+
+
+@validate_async_transaction
+async def create_agent(db: AsyncSession, agent: Agent) -> Agent:
+    """
+    Create a new agent.
+
+    Agents are configurable entities that can be specified to use specific tools and have specific preambles for better task completion.
+
+    Args:
+      db (AsyncSession): Database session.
+      agent (Agent): Agent to be created.
+
+    Returns:
+      Agent: Created agent.
+    """
+    db.add(agent)
+    await db.commit()
+    await db.refresh(agent)
+    return agent
+
+
+@validate_async_transaction
+async def get_agent_by_id(
+    db: AsyncSession, agent_id: str, user_id: str = "", override_user_id: bool = False
+) -> Agent:
+    """
+    Get an agent by its ID.
+    Anyone can get a public agent, but only the owner can get a private agent.
+
+    Args:
+      db (AsyncSession): Database session.
+      agent_id (str): Agent ID.
+      user_id (str): User ID.
+      override_user_id (bool): Override user ID check. Should only be used for internal operations.
+
+    Returns:
+      Agent: Agent with the given ID.
+    """
+    statement = (
+        select(Agent).filter(Agent.id == agent_id).options(*AGENT_LOAD_OPTIONS)
+    )
+    statement = apply_global_filters(statement, Agent)
+    agent = (await db.scalars(statement)).first()
+
+    if override_user_id:
+        return agent
+
+    # Cannot GET privates Agents not belonging to you
+    if agent and agent.is_private and agent.user_id != user_id:
+        return None
+
+    return agent
+
+
+@validate_async_transaction
+async def get_agent_by_name(db: AsyncSession, agent_name: str, user_id: str) -> Agent:
+    """
+    Get an agent by its name.
+    Anyone can get a public agent, but only the owner can get a private agent.
+
+    Args:
+      db (AsyncSession): Database session.
+      agent_name (str): Agent name.
+      user_id (str): User ID.
+
+    Returns:
+      Agent: Agent with the given name.
+    """
+    statement = (
+        select(Agent).filter(Agent.name == agent_name).options(*AGENT_LOAD_OPTIONS)
+    )
+    statement = apply_global_filters(statement, Agent)
+    agent = (await db.scalars(statement)).first()
+
+    if agent and agent.is_private and agent.user_id != user_id:
+        return None
+
+    return agent
+
+
+@validate_async_transaction
+async def get_agents(
+    db: AsyncSession,
+    user_id: str = "",
+    offset: int = 0,
+    limit: int = 100,
+    organization_id: Optional[str] = None,
+    visibility: AgentVisibility = AgentVisibility.ALL,
+    override_user_id: bool = False,
+) -> list[Agent]:
+    """
+    Get all agents for a user.
+    Public agents are visible to everyone, private agents are only visible to the owner.
+
+    Args:
+        db (AsyncSession): Database session.
+        user_id (str): User ID.
+        offset (int): Offset of the results.
+        limit (int): Limit of the results.
+        organization_id (str): Organization ID.
+        visibility (AgentVisibility): Visibility of the agents.
+        override_user_id (bool): Override user ID check. Should only be used for internal operations.
+
+    Returns:
+      list[Agent]: List of agents.
+    """
+    statement = apply_global_filters(
+        select(Agent).options(*AGENT_LOAD_OPTIONS), Agent
+    )
+    if override_user_id:
+        return list((await db.scalars(statement)).all())
+
+    # Filter by visibility
+    if visibility == AgentVisibility.PUBLIC:
+        statement = statement.filter(Agent.is_private == false())
+    elif visibility == AgentVisibility.PRIVATE:
+        statement = statement.filter(Agent.is_private == true(), Agent.user_id == user_id)
+    else:
+        statement = statement.filter(
+            (Agent.is_private == false()) | (Agent.user_id == user_id)
+        )
+
+    # Filter by organization and user
+    if organization_id is not None:
+        statement = statement.filter(Agent.organization_id == organization_id)
+
+    statement = statement.offset(offset).limit(limit)
+    return list((await db.scalars(statement)).all())
+
+
+@validate_async_transaction
+async def update_agent(
+    db: AsyncSession, agent: Agent, new_agent: UpdateAgentDB, user_id: str
+) -> Agent:
+    """
+    Update an agent.
+
+    Args:
+      db (AsyncSession): Database session.
+      agent (Agent): Agent to be updated.
+      new_agent (UpdateAgentRequest): New agent.
+      user_id (str): User ID.
+
+    Returns:
+      Agent: Updated agent.
+    """
+    if agent.is_private and agent.user_id != user_id:
+        return None
+
+    new_agent_cleaned = new_agent.model_dump(exclude_unset=True, exclude_none=True)
+
+    for attr, value in new_agent_cleaned.items():
+        setattr(agent, attr, value)
+
+    await db.commit()
+    await db.refresh(agent)
+    return agent
+
+
+@validate_async_transaction
+async def delete_agent(db: AsyncSession, agent_id: str, user_id: str) -> bool:
+    """
+    Delete an Agent by ID if the Agent was created by the user_id given.
+
+    Args:
+        db (AsyncSession): Database session.
+        agent_id (str): Agent ID.
+        user_id (str): User ID.
+
+    Returns:
+      bool: True if the Agent was deleted, False otherwise
+    """
+    statement = delete(Agent).filter(Agent.id == agent_id, Agent.user_id == user_id)
+    result = await db.execute(apply_global_filters(statement, Agent))
+    await db.commit()
+    return result.rowcount > 0
@@ -0,0 +1,241 @@
+from sqlalchemy import delete, desc, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from backend.database_models.base import apply_global_filters
+from backend.database_models.citation import Citation
+from backend.database_models.conversation import (
+    Conversation,
+    ConversationFileAssociation,
+)
+from backend.database_models.message import Message
+from backend.schemas.conversation import (
+    ToggleConversationPinRequest,
+    UpdateConversationRequest,
+)
+from backend.services.transaction import validate_async_transaction
+
+# Relationships are not lazy loaded in async sessions, load everything the
+# conversation schemas read up front
+CONVERSATION_LOAD_OPTIONS = (
+    selectinload(Conversation.text_messages).selectinload(Message.documents),
+    selectinload(Conversation.text_messages)
+    .selectinload(Message.citations)
+    .selectinload(Citation.documents),
+    selectinload(Conversation.text_messages).selectinload(Message.tool_calls),
+    selectinload(Conversation.text_messages).selectinload(
+        Message.message_file_associations
+    ),
+    selectinload(Conversation.conversation_file_associations),
+)
+
+
+@validate_async_transaction
+async def create_conversation(
+    db: AsyncSession, conversation: Conversation
+) -> Conversation:
+    """
+    Create a new conversation.
+
+    Args:
+        db (AsyncSession): Database session.
+        conversation (Conversation): Conversation data to be created.
+
+    Returns:
+        Conversation: Created conversation.
+    """
+    db.add(conversation)
+    await db.commit()
+    await db.refresh(conversation)
+    return conversation
+
+
+@validate_async_transaction
+async def get_conversation(
+    db: AsyncSession, conversation_id: str, user_id: str
+) -> Conversation | None:
+    """
+    Get a conversation by ID.
+
+    Args:
+        db (AsyncSession): Database session.
+        conversation_id (str): Conversation ID.
+        user_id (str): User ID.
+
+    Returns:
+        Conversation: Conversation with the given conversation ID and user ID.
+    """
+    statement = (
+        select(Conversation)
+        .filter(Conversation.id == conversation_id, Conversation.user_id == user_id)
+        .options(*CONVERSATION_LOAD_OPTIONS)
+    )
+    statement = apply_global_filters(statement, Conversation)
+    return (await db.scalars(statement)).first()
+
+
+@validate_async_transaction
+async def get_conversations(
+    db: AsyncSession,
+    user_id: str,
+    offset: int = 0,
+    limit: int = 100,
+    order_by: str | None = None,
+    agent_id: str | None = None,
+    organization_id: str | None = None,
+    with_messages: bool = True,
+) -> list[Conversation]:
+    """
+    List all conversations.
+
+    Args:
+        db (AsyncSession): Database session.
+        user_id (str): User ID.
+        organization_id (str): Organization ID.
+        agent_id (str): Agent ID.
+        offset (int): Offset to start the list.
+        limit (int): Limit of conversations to be listed.
+        order_by (str): A field by which to order the conversations.
+        with_messages (bool): Load the messages of each conversation, else only their file associations.
+
+    Returns:
+        list[Conversation]: List of conversations.
+    """
+    statement = select(Conversation).filter(Conversation.user_id == user_id)
+    if agent_id is not None:
+        statement = statement.filter(Conversation.agent_id == agent_id)
+    if organization_id is not None:
+        statement = statement.filter(Conversation.organization_id == organization_id)
+    if order_by is not None:
+        order_column = getattr(Conversation, order_by)
+        statement = statement.order_by(desc(order_column))
+    load_options = (
+        CONVERSATION_LOAD_OPTIONS
+        if with_messages
+        else (selectinload(Conversation.conversation_file_associations),)
+    )
+    statement = (
+        statement.order_by(Conversation.updated_at.desc())
+        .offset(offset)
+        .limit(limit)
+        .options(*load_options)
+    )
+    statement = apply_global_filters(statement, Conversation)
+
+    return list((await db.scalars(statement)).all())
+
+
+@validate_async_transaction
+async def update_conversation(
+    db: AsyncSession,
+    conversation: Conversation,
+    new_conversation: UpdateConversationRequest,
+) -> Conversation:
+    """
+    Update a conversation by ID.
+
+    Args:
+        db (AsyncSession): Database session.
+        conversation (Conversation): Conversation to be updated.
+        new_conversation (UpdateConversationRequest): New conversation data.
+
+    Returns:
+        Conversation: Updated conversation.
+    """
+    for attr, value in new_conversation.model_dump().items():
+        if value is not None:
+            setattr(conversation, attr, value)
+    await db.commit()
+    await db.refresh(conversation)
+    return conversation
+
+
+@validate_async_transaction
+async def toggle_conversation_pin(
+    db: AsyncSession,
+    conversation: Conversation,
+    new_conversation_pin: ToggleConversationPinRequest,
+) -> Conversation:
+    """
+    Update conversation pin by conversation ID.
+
+    Args:
+        db (AsyncSession): Database session.
+        conversation (Conversation): Conversation to be updated.
+        new_conversation_pin (ToggleConversationPinRequest): New conversation pin data.
+
+    Returns:
+        Conversation: Updated conversation.
+    """
+    statement = (
+        update(Conversation)
+        .filter(Conversation.id == conversation.id)
+        .values(
+            is_pinned=new_conversation_pin.is_pinned,
+            updated_at=conversation.updated_at,
+        )
+    )
+    await db.execute(apply_global_filters(statement, Conversation))
+    await db.commit()
+    await db.refresh(conversation)
+    return conversation
+
+
+@validate_async_transaction
+async def delete_conversation(
+    db: AsyncSession, conversation_id: str, user_id: str
+) -> None:
+    """
+    Delete a conversation by ID.
+
+    Args:
+        db (AsyncSession): Database session.
+        conversation_id (str): Conversation ID.
+        user_id (str): User ID.
+    """
+    statement = delete(Conversation).filter(
+        Conversation.id == conversation_id, Conversation.user_id == user_id
+    )
+    await db.execute(apply_global_filters(statement, Conversation))
+    await db.commit()
+
+
+async def create_conversation_file_association(
+    db: AsyncSession, conversation_file_association: ConversationFileAssociation
+) -> ConversationFileAssociation:
+    """
+    Create a new conversation file association.
+
+    Args:
+        db (AsyncSession): Database session.
+        conversation_file_association (ConversationFileAssociation): Conversation file association data to be created.
+
+    Returns:
+        ConversationFileAssociation: Created conversation file association.
+    """
+    db.add(conversation_file_association)
+    await db.commit()
+    await db.refresh(conversation_file_association)
+    return conversation_file_association
+
+
+async def delete_conversation_file_association(
+    db: AsyncSession, conversation_id: str, file_id: str, user_id: str
+) -> None:
+    """
+    Delete a conversation file association by ID.
+
+    Args:
+        db (AsyncSession): Database session.
+        conversation_id (str): Conversation ID.
+        file_id (str): File ID.
+        user_id (str): User ID.
+    """
+    await db.execute(
+        delete(ConversationFileAssociation).filter(
+            ConversationFileAssociation.conversation_id == conversation_id,
+            ConversationFileAssociation.user_id == user_id,
+            ConversationFileAssociation.file_id == file_id,
+        )
+    )
+    await db.commit()
@@ -0,0 +1,207 @@
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
+
+from backend.database_models.base import apply_global_filters
+from backend.database_models.conversation import ConversationFileAssociation
+from backend.database_models.file import File
+from backend.services.transaction import validate_async_transaction
+
+
+@validate_async_transaction
+async def create_file(db: AsyncSession, file: File) -> File:
+    """
+    Create a new file.
+
+    Args:
+        db (AsyncSession): Database session.
+        file (File): File data to be created.
+
+    Returns:
+        File: Created file.
+    """
+    db.add(file)
+    await db.commit()
+    await db.refresh(file)
+    return file
+
+
+@validate_async_transaction
+async def batch_create_files(db: AsyncSession, files: list[File]) -> list[File]:
+    """
+    Batch create files.
+    """
+    db.add_all(files)
+    await db.commit()
+    for file in files:
+        await db.refresh(file)
+    return files
+
+
+@validate_async_transaction
+async def get_file(
+    db: AsyncSession,
+    file_id: str,
+    user_id: str | None = None,
+    with_content: bool = False,
+) -> File:
+    """
+    Get a file by ID.
+
+    Args:
+        db (AsyncSession): Database session.
+        file_id (str): File ID.
+        user_id (str): User ID.
+        with_content (bool): Load the file content, which is deferred by default.
+
+    Returns:
+        File: File with the given ID.
+    """
+    filters = [File.id == file_id]
+
+    if user_id:
+        filters.append(File.user_id == user_id)
+
+    statement = apply_global_filters(select(File).filter(*filters), File)
+    if with_content:
+        statement = statement.options(undefer(File.file_content))
+    return (await db.scalars(statement)).first()
+
+
+@validate_async_transaction
+async def get_files(db: AsyncSession, user_id: str, offset: int = 0, limit: int = 100):
+    """
+    List all files.
+
+    Args:
+        db (AsyncSession): Database session.
+        user_id (str): User ID.
+        offset (int): Offset to start the list.
+        limit (int): Limit of files to be listed.
+
+    Returns:
+        list[File]: List of files.
+    """
+    statement = select(File).filter(File.user_id == user_id).offset(offset).limit(limit)
+    statement = apply_global_filters(statement, File)
+    return list((await db.scalars(statement)).all())
+
+
+async def get_files_by_ids(
+    db: AsyncSession, file_ids: list[str], user_id: str, with_content: bool = False
+) -> list[File]:
+    """
+    Get files by IDs.
+
+    Args:
+        db (AsyncSession): Database session.
+        file_ids (list[str]): File IDs.
+        user_id (str): User ID.
+        with_content (bool): Load the file content, which is deferred by default.
+
+    Returns:
+        list[File]: List of files with the given IDs.
+    """
+    statement = select(File).filter(File.id.in_(file_ids), File.user_id == user_id)
+    statement = apply_global_filters(statement, File)
+    if with_content:
+        statement = statement.options(undefer(File.file_content))
+    return list((await db.scalars(statement)).all())
+
+
+async def get_files_by_conversation_ids(
+    db: AsyncSession, conversation_ids: list[str], user_id: str
+) -> list[tuple[str, File]]:
+    """
+    Get the files of several conversations in a single query.
+
+    Args:
+        db (AsyncSession): Database session.
+        conversation_ids (list[str]): Conversation IDs.
+        user_id (str): User ID.
+
+    Returns:
+        list[tuple[str, File]]: Pairs of conversation ID and file, in file creation order.
+    """
+    if not conversation_ids:
+        return []
+
+    statement = (
+        select(ConversationFileAssociation.conversation_id, File)
+        .join(File, File.id == ConversationFileAssociation.file_id)
+        .filter(
+            ConversationFileAssociation.conversation_id.in_(conversation_ids),
+            ConversationFileAssociation.user_id == user_id,
+            File.user_id == user_id,
+        )
+        .order_by(File.created_at)
+    )
+    statement = apply_global_filters(statement, File)
+    return [tuple(row) for row in (await db.execute(statement)).all()]
+
+
+@validate_async_transaction
+async def get_files_by_file_names(
+    db: AsyncSession, file_names: list[str], user_id: str
+) -> list[File]:
+    """
+    Get files by file names.
+
+    Args:
+        db (AsyncSession): Database session.
+        file_names (list[str]): File names.
+        user_id (str): User ID.
+
+    Returns:
+        list[File]: List of files with the given file names.
+    """
+    statement = select(File).filter(
+        File.file_name.in_(file_names), File.user_id == user_id
+    )
+    statement = apply_global_filters(statement, File)
+    return list((await db.scalars(statement)).all())
+
+
+@validate_async_transaction
+async def get_files_by_user_id(db: AsyncSession, user_id: str) -> list[File]:
+    """
+    List all files by user ID.
+
+    Args:
+        db (AsyncSession): Database session.
+        user_id (str): User ID.
+
+    Returns:
+        list[File]: List of files by user ID.
+    """
+    statement = apply_global_filters(select(File).filter(File.user_id == user_id), File)
+    return list((await db.scalars(statement)).all())
+
+
+@validate_async_transaction
+async def delete_file(db: AsyncSession, file_id: str, user_id: str) -> None:
+    """
+    Delete a file by ID.
+
+    Args:
+        db (AsyncSession): Database session.
+        file_id (str): File ID.
+        user_id (str): User ID.
+    """
+    statement = delete(File).filter(File.id == file_id, File.user_id == user_id)
+    await db.execute(apply_global_filters(statement, File))
+    await db.commit()
+
+
+async def bulk_delete_files(db: AsyncSession, file_ids: list[str], user_id: str) -> None:
+    """
+    Bulk delete files by IDs.
+
+    Args:
+        db (AsyncSession): Database session.
+        file_ids (list[str]): List of file IDs.
+        user_id (str): User ID.
+    """
+    statement = delete(File).filter(File.id.in_(file_ids), File.user_id == user_id)
+    await db.execute(apply_global_filters(statement, File))
+    await db.commit()
@@ -0,0 +1,258 @@
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from backend.database_models.base import apply_global_filters
+from backend.database_models.citation import Citation
+from backend.database_models.message import Message, MessageFileAssociation
+from backend.schemas.message import UpdateMessage
+from backend.services.transaction import validate_async_transaction
+
+# Relationships are not lazy loaded in async sessions, load everything the
+# message schemas read up front
+MESSAGE_LOAD_OPTIONS = (
+    selectinload(Message.documents),
+    selectinload(Message.citations).selectinload(Citation.documents),
+    selectinload(Message.tool_calls),
+    selectinload(Message.message_file_associations),
+)
+
+
+@validate_async_transaction
+async def create_message(db: AsyncSession, message: Message) -> Message:
+    """
+    Create a new message.
+
+    Args:
+        db (AsyncSession): Database session.
+        message (Message): Message data to be created.
+
+    Returns:
+        Message: Created message.
+    """
+    db.add(message)
+    await db.commit()
+    await db.refresh(message)
+    return message
+
+
+@validate_async_transaction
+async def get_message(db: AsyncSession, message_id: str, user_id: str) -> Message:
+    """
+    Get a message by ID.
+
+    Args:
+        db (AsyncSession): Database session.
+        message_id (str): Message ID.
+        user_id (str): User ID.
+
+    Returns:
+        Message: Message with the given ID.
+    """
+    statement = (
+        select(Message)
+        .filter(Message.id == message_id, Message.user_id == user_id)
+        .options(*MESSAGE_LOAD_OPTIONS)
+    )
+    statement = apply_global_filters(statement, Message)
+    return (await db.scalars(statement)).first()
+
+
+@validate_async_transaction
+async def get_messages(
+    db: AsyncSession, user_id: str, offset: int = 0, limit: int = 100
+) -> list[Message]:
+    """
+    List all messages.
+
+    Args:
+        db (AsyncSession): Database session.
+        offset (int): Offset to start the list.
+        limit (int): Limit of messages to be listed.
+        user_id (str): User ID.
+
+    Returns:
+        list[Message]: List of messages.
+    """
+    statement = (
+        select(Message)
+        .filter(Message.user_id == user_id)
+        .offset(offset)
+        .limit(limit)
+        .options(*MESSAGE_LOAD_OPTIONS)
+    )
+    statement = apply_global_filters(statement, Message)
+    return list((await db.scalars(statement)).all())
+
+
+@validate_async_transaction
+async def get_conversation_message(
+    db: AsyncSession, conversation_id: str, message_id: str, user_id: str
+) -> Message | None:
+    """
+    Get a message based on the conversation ID, message ID, and user ID.
+
+    Args:
+        db (AsyncSession): Database session.
+        conversation_id (str): Conversation ID.
+        message_id (str): Message ID.
+        user_id (str): User ID.
+
+    Returns:
+        Message | None: Message with the given conversation ID, message ID, and user ID or None if not found.
+    """
+    statement = (
+        select(Message)
+        .filter(
+            Message.conversation_id == conversation_id,
+            Message.id == message_id,
+            Message.user_id == user_id,
+        )
+        .options(*MESSAGE_LOAD_OPTIONS)
+    )
+    statement = apply_global_filters(statement, Message)
+    return (await db.scalars(statement)).first()
+
+
+@validate_async_transaction
+async def get_messages_by_conversation_id(
+    db: AsyncSession, conversation_id: str, user_id: str
+) -> list[Message]:
+    """
+    List all messages from a conversation.
+
+    Args:
+        db (AsyncSession): Database session.
+        conversation_id (str): Conversation ID.
+        user_id (str): User ID.
+
+    Returns:
+        list[Message]: List of messages from the conversation.
+    """
+    statement = (
+        select(Message)
+        .filter(Message.conversation_id == conversation_id, Message.user_id == user_id)
+        .options(*MESSAGE_LOAD_OPTIONS)
+    )
+    statement = apply_global_filters(statement, Message)
+    return list((await db.scalars(statement)).all())
+
+
+@validate_async_transaction
+async def update_message(
+    db: AsyncSession, message: Message, new_message: UpdateMessage
+) -> Message:
+    """
+    Update a message by ID.
+
+    Args:
+        db (AsyncSession): Database session.
+        message (Message): Message to be updated.
+        new_message (Message): New message data.
+
+    Returns:
+        Message: Updated message.
+    """
+    for attr, value in new_message.model_dump().items():
+        setattr(message, attr, value)
+    await db.commit()
+    await db.refresh(message)
+    return message
+
+
+@validate_async_transaction
+async def delete_message(db: AsyncSession, message_id: str, user_id: str) -> None:
+    """
+    Delete a message by ID.
+
+    Args:
+        db (AsyncSession): Database session.
+        message_id (str): Message ID.
+        user_id (str): User ID.
+    """
+    statement = delete(Message).filter(
+        Message.id == message_id, Message.user_id == user_id
+    )
+    await db.execute(apply_global_filters(statement, Message))
+    await db.commit()
+
+
+@validate_async_transaction
+async def delete_messages(
+    db: AsyncSession, message_ids: list[str], user_id: str
+) -> None:
+    """
+    Delete messages by IDs.
+
+    Args:
+        db (AsyncSession): Database session.
+        message_ids (list[str]): Message IDs.
+        user_id (str): User ID.
+    """
+    statement = delete(Message).filter(
+        Message.id.in_(message_ids), Message.user_id == user_id
+    )
+    await db.execute(apply_global_filters(statement, Message))
+    await db.commit()
+
+
+async def create_message_file_association(
+    db: AsyncSession, message_file_association: MessageFileAssociation
+) -> MessageFileAssociation:
+    """
+    Create a new message file association.
+
+    Args:
+        db (AsyncSession): Database session.
+        message_file_association (MessageFileAssociation): Message file association data to be created.
+
+    Returns:
+        MessageFileAssociation: Created message file association.
+    """
+    db.add(message_file_association)
+    await db.commit()
+    await db.refresh(message_file_association)
+    return message_file_association
+
+
+async def get_message_file_association_by_file_id(
+    db: AsyncSession, file_id: str, user_id: str
+) -> MessageFileAssociation:
+    """
+    Get a message file association by file ID.
+
+    Args:
+        db (AsyncSession): Database session.
+        file_id (str): File ID.
+        user_id (str): User ID.
+
+    Returns:
+        MessageFileAssociation: Message file association with the given file ID.
+    """
+    statement = select(MessageFileAssociation).filter(
+        MessageFileAssociation.file_id == file_id,
+        MessageFileAssociation.user_id == user_id,
+    )
+    return (await db.scalars(statement)).first()
+
+
+async def delete_message_file_association(
+    db: AsyncSession, message_id: str, file_id: str, user_id: str
+) -> None:
+    """
+    Delete a message file association by ID.
+
+    Args:
+        db (AsyncSession): Database session.
+        message_id (str): Message ID.
+        file_id (str): File ID.
+        user_id (str): User ID.
+    """
+    await db.execute(
+        delete(MessageFileAssociation).filter(
+            MessageFileAssociation.message_id == message_id,
+            MessageFileAssociation.user_id == user_id,
+            MessageFileAssociation.file_id == file_id,
+        )
+    )
+    await db.commit()
@@ -1,5 +1,6 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer
 
+from backend.database_models.conversation import ConversationFileAssociation
 from backend.database_models.file import File
 from backend.services.transaction import validate_transaction
 
@@ -35,7 +36,9 @@ def batch_create_files(db: Session, files: list[File]) -> list[File]:
 
 
 @validate_transaction
-def get_file(db: Session, file_id: str, user_id: str | None = None) -> File:
+def get_file(
+    db: Session, file_id: str, user_id: str | None = None, with_content: bool = False
+) -> File:
     """
     Get a file by ID.
 
@@ -43,6 +46,7 @@ def get_file(db: Session, file_id: str, user_id: str | None = None) -> File:
         db (Session): Database session.
         file_id (str): File ID.
         user_id (str): User ID.
+        with_content (bool): Load the file content, which is deferred by default.
 
     Returns:
         File: File with the given ID.
@@ -52,7 +56,10 @@ def get_file(db: Session, file_id: str, user_id: str | None = None) -> File:
     if user_id:
         filters.append(File.user_id == user_id)
 
-    return db.query(File).filter(*filters).first()
+    query = db.query(File).filter(*filters)
+    if with_content:
+        query = query.options(undefer(File.file_content))
+    return query.first()
 
 
 @validate_transaction
@@ -74,7 +81,9 @@ def get_files(db: Session, user_id: str, offset: int = 0, limit: int = 100):
     )
 
 
-def get_files_by_ids(db: Session, file_ids: list[str], user_id: str) -> list[File]:
+def get_files_by_ids(
+    db: Session, file_ids: list[str], user_id: str, with_content: bool = False
+) -> list[File]:
     """
     Get files by IDs.
 
@@ -82,11 +91,46 @@ def get_files_by_ids(db: Session, file_ids: list[str], user_id: str) -> list[Fil
         db (Session): Database session.
         file_ids (list[str]): File IDs.
         user_id (str): User ID.
+        with_content (bool): Load the file content, which is deferred by default.
 
     Returns:
         list[File]: List of files with the given IDs.
     """
-    return db.query(File).filter(File.id.in_(file_ids), File.user_id == user_id).all()
+    query = db.query(File).filter(File.id.in_(file_ids), File.user_id == user_id)
+    if with_content:
+        query = query.options(undefer(File.file_content))
+    return query.all()
+
+
+@validate_transaction
+def get_files_by_conversation_ids(
+    db: Session, conversation_ids: list[str], user_id: str
+) -> list[tuple[str, File]]:
+    """
+    Get the files of several conversations in a single query.
+
+    Args:
+        db (Session): Database session.
+        conversation_ids (list[str]): Conversation IDs.
+        user_id (str): User ID.
+
+    Returns:
+        list[tuple[str, File]]: Pairs of conversation ID and file, in file creation order.
+    """
+    if not conversation_ids:
+        return []
+
+    return (
+        db.query(ConversationFileAssociation.conversation_id, File)
+        .join(File, File.id == ConversationFileAssociation.file_id)
+        .filter(
+            ConversationFileAssociation.conversation_id.in_(conversation_ids),
+            ConversationFileAssociation.user_id == user_id,
+            File.user_id == user_id,
+        )
+        .order_by(File.created_at)
+        .all()
+    )
 
 
 @validate_transaction
@@ -0,0 +1,206 @@
+from sqlalchemy import String, cast, func
+from sqlalchemy.dialects.postgresql import TSQUERY
+from sqlalchemy.orm import Session
+
+from backend.database_models.file import File
+from backend.database_models.file_chunk import FILE_CHUNK_SEARCH_CONFIG, FileChunk
+from backend.services.transaction import validate_transaction
+
+
+@validate_transaction
+def batch_create_file_chunks(db: Session, file_chunks: list[FileChunk]) -> None:
+    """
+    Batch create file chunks.
+
+    Args:
+        db (Session): Database session.
+        file_chunks (list[FileChunk]): File chunks to be created.
+    """
+    db.add_all(file_chunks)
+    db.commit()
+
+
+@validate_transaction
+def get_chunked_file_ids(db: Session, file_ids: list[str]) -> set[str]:
+    """
+    Get which of the given files have been chunked.
+
+    Args:
+        db (Session): Database session.
+        file_ids (list[str]): File IDs.
+
+    Returns:
+        set[str]: IDs of the files that have chunks.
+    """
+    rows = (
+        db.query(FileChunk.file_id)
+        .filter(FileChunk.file_id.in_(file_ids))
+        .distinct()
+        .all()
+    )
+    return {file_id for file_id, in rows}
+
+
+@validate_transaction
+def search_file_chunks(
+    db: Session, file_ids: list[str], user_id: str, query: str, limit: int = 10
+) -> list[FileChunk]:
+    """
+    Full-text search over the chunks of the given files.
+
+    Any of the query terms can match, chunks are ranked by term density.
+
+    Args:
+        db (Session): Database session.
+        file_ids (list[str]): File IDs to search over.
+        user_id (str): User ID.
+        query (str): Search query.
+        limit (int): Maximum number of chunks to return.
+
+    Returns:
+        list[FileChunk]: Best matching chunks, most relevant first.
+    """
+    # plainto_tsquery ANDs the query terms, OR them so partial matches are ranked too
+    ts_query = cast(
+        func.replace(
+            cast(func.plainto_tsquery(FILE_CHUNK_SEARCH_CONFIG, query), String),
+            "&",
+            "|",
+        ),
+        TSQUERY,
+    )
+    rank = func.ts_rank_cd(FileChunk.search_vector, ts_query)
+
+    return (
+        db.query(FileChunk)
+        .join(File, File.id == FileChunk.file_id)
+        .filter(
+            FileChunk.file_id.in_(file_ids),
+            File.user_id == user_id,
+            FileChunk.search_vector.op("@@")(ts_query),
+        )
+        .order_by(rank.desc(), FileChunk.position)
+        .limit(limit)
+        .all()
+    )
+
+
+@validate_transaction
+def get_leading_file_chunks(
+    db: Session, file_ids: list[str], user_id: str, chunks_per_file: int
+) -> list[FileChunk]:
+    """
+    Get the first non-empty chunks of each of the given files.
+
+    Args:
+        db (Session): Database session.
+        file_ids (list[str]): File IDs.
+        user_id (str): User ID.
+        chunks_per_file (int): Maximum number of chunks to return per file.
+
+    Returns:
+        list[FileChunk]: Leading chunks of each file, in content order.
+    """
+    return (
+        db.query(FileChunk)
+        .join(File, File.id == FileChunk.file_id)
+        .filter(
+            FileChunk.file_id.in_(file_ids),
+            File.user_id == user_id,
+            FileChunk.position < chunks_per_file,
+            FileChunk.text != "",
+        )
+        .order_by(FileChunk.file_id, FileChunk.position)
+        .all()
+    )
+
+
+@validate_transaction
+def get_unembedded_file_chunks(
+    db: Session, file_ids: list[str], embedding_model: str
+) -> list[FileChunk]:
+    """
+    Get the chunks of the given files that are not embedded with a model yet.
+
+    Args:
+        db (Session): Database session.
+        file_ids (list[str]): File IDs.
+        embedding_model (str): Embedding model.
+
+    Returns:
+        list[FileChunk]: Chunks without an embedding from the model.
+    """
+    return (
+        db.query(FileChunk)
+        .filter(
+            FileChunk.file_id.in_(file_ids),
+            FileChunk.embedding_model.is_distinct_from(embedding_model),
+            # Empty files are recorded with a single empty chunk, there is nothing to embed
+            FileChunk.text != "",
+        )
+        .order_by(FileChunk.file_id, FileChunk.position)
+        .all()
+    )
+
+
+@validate_transaction
+def update_file_chunk_embeddings(
+    db: Session,
+    file_chunks: list[FileChunk],
+    embeddings: list[list[float]],
+    embedding_model: str,
+) -> None:
+    """
+    Store the embeddings of file chunks.
+
+    Args:
+        db (Session): Database session.
+        file_chunks (list[FileChunk]): File chunks that were embedded.
+        embeddings (list[list[float]]): Embedding of each chunk.
+        embedding_model (str): Model the embeddings were computed with.
+    """
+    for file_chunk, embedding in zip(file_chunks, embeddings):
+        file_chunk.embedding = embedding
+        file_chunk.embedding_model = embedding_model
+    db.commit()
+
+
+@validate_transaction
+def get_file_chunk_embeddings(
+    db: Session, file_id: str, embedding_model: str
+) -> list[tuple[str, list[float]]]:
+    """
+    Get the embeddings of a file's chunks.
+
+    Args:
+        db (Session): Database session.
+        file_id (str): File ID.
+        embedding_model (str): Embedding model.
+
+    Returns:
+        list[tuple[str, list[float]]]: Pairs of chunk ID and embedding, in content order.
+    """
+    return (
+        db.query(FileChunk.id, FileChunk.embedding)
+        .filter(
+            FileChunk.file_id == file_id,
+            FileChunk.embedding_model == embedding_model,
+        )
+        .order_by(FileChunk.position)
+        .all()
+    )
+
+
+@validate_transaction
+def get_file_chunks_by_ids(db: Session, file_chunk_ids: list[str]) -> list[FileChunk]:
+    """
+    Get file chunks by IDs.
+
+    Args:
+        db (Session): Database session.
+        file_chunk_ids (list[str]): File chunk IDs.
+
+    Returns:
+        list[FileChunk]: File chunks with the given IDs.
+    """
+    return db.query(FileChunk).filter(FileChunk.id.in_(file_chunk_ids)).all()
@@ -1,4 +1,5 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.orm import Session, load_only
 
 from backend.database_models.message import Message, MessageFileAssociation
 from backend.schemas.message import UpdateMessage
@@ -43,6 +44,72 @@ def get_message(db: Session, message_id: str, user_id: str) -> Message:
     )
 
 
+@validate_transaction
+def get_last_message_position(
+    db: Session, conversation_id: str, user_id: str
+) -> int | None:
+    """
+    Get the position of the last active message of a conversation.
+
+    Args:
+        db (Session): Database session.
+        conversation_id (str): Conversation ID.
+        user_id (str): User ID.
+
+    Returns:
+        int | None: Position of the last active message, None if there are none.
+    """
+    return (
+        db.query(func.max(Message.position))
+        .filter(
+            Message.conversation_id == conversation_id,
+            Message.user_id == user_id,
+            Message.is_active,
+        )
+        .scalar()
+    )
+
+
+@validate_transaction
+def get_chat_history_messages(
+    db: Session,
+    conversation_id: str,
+    user_id: str,
+    before_position: int,
+    limit: int = 0,
+) -> list[Message]:
+    """
+    Get the latest messages with text of a conversation, before a position.
+
+    Args:
+        db (Session): Database session.
+        conversation_id (str): Conversation ID.
+        user_id (str): User ID.
+        before_position (int): Only messages at an earlier position are listed.
+        limit (int): Maximum number of messages, 0 lists them all.
+
+    Returns:
+        list[Message]: The messages, oldest first, with their text, agent and position loaded.
+    """
+    query = (
+        db.query(Message)
+        .options(
+            load_only(Message.text, Message.agent, Message.position, Message.created_at)
+        )
+        .filter(
+            Message.conversation_id == conversation_id,
+            Message.user_id == user_id,
+            Message.position < before_position,
+            Message.text != "",
+        )
+        .order_by(Message.position.desc(), Message.created_at.desc())
+    )
+    if limit:
+        query = query.limit(limit)
+
+    return query.all()[::-1]
+
+
 @validate_transaction
 def get_messages(
     db: Session, user_id: str, offset: int = 0, limit: int = 100
@@ -1,7 +1,8 @@
 from enum import StrEnum
+from typing import Any
 from uuid import uuid4
 
-from sqlalchemy import DateTime, String, func
+from sqlalchemy import DateTime, Delete, Select, String, Update, func
 from sqlalchemy.orm import DeclarativeBase, Query, mapped_column
 
 
@@ -42,6 +43,35 @@ class CustomFilterQuery(Query):
         return object.__new__(cls)
 
 
+def apply_global_filters(
+    statement: Select | Update | Delete, entity: Any
+) -> Select | Update | Delete:
+    """
+    Apply the request global filters to a 2.0-style statement.
+
+    Async sessions do not go through CustomFilterQuery, so statements built with
+    select() must be filtered explicitly.
+
+    Args:
+        statement (Select | Update | Delete): Statement targeting the entity.
+        entity (Any): Mapped class targeted by the statement.
+
+    Returns:
+        Select | Update | Delete: Filtered statement.
+    """
+    from backend.services.context import GLOBAL_REQUEST_CONTEXT
+
+    request_ctx = GLOBAL_REQUEST_CONTEXT.get()
+    if not request_ctx or not request_ctx.use_global_filtering:
+        return statement
+
+    for field in CustomFilterQuery.ALLOWED_FILTER_FIELDS:
+        value = getattr(request_ctx, field, None)
+        if value and hasattr(entity, field):
+            statement = statement.filter_by(**{field: value})
+    return statement
+
+
 class MinimalBase(DeclarativeBase):
     pass
 
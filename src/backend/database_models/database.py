@@ -1,8 +1,15 @@
-from typing import Annotated, Any, Generator
+from typing import Annotated, Any, AsyncGenerator, Generator
 
 from dotenv import load_dotenv
 from fastapi import Depends
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session
 
 from backend.config.settings import Settings
@@ -11,14 +18,87 @@ from backend.database_models.base import CustomFilterQuery
 load_dotenv()
 
 SQLALCHEMY_DATABASE_URL = Settings().get('database.url')
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, pool_size=5, max_overflow=10, pool_timeout=30
-)
+POOL_OPTIONS = {
+    "pool_size": Settings().get('database.pool_size'),
+    "max_overflow": Settings().get('database.max_overflow'),
+    "pool_timeout": Settings().get('database.pool_timeout'),
+    "pool_recycle": Settings().get('database.pool_recycle'),
+    "pool_pre_ping": True,
+}
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **POOL_OPTIONS)
+
+_async_engine: AsyncEngine | None = None
+_async_session_factory: async_sessionmaker[AsyncSession] | None = None
+
+
+def get_async_database_url(url: str | None = None) -> str:
+    """
+    Get the URL used by the async engine.
+
+    Args:
+        url (str | None): Sync database URL, defaults to the configured one.
+
+    Returns:
+        str: database.async_url if set, else the sync URL using the asyncpg driver.
+    """
+    if url is None and Settings().get('database.async_url'):
+        return Settings().get('database.async_url')
+
+    return make_url(url or SQLALCHEMY_DATABASE_URL).set(
+        drivername="postgresql+asyncpg"
+    ).render_as_string(hide_password=False)
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Get the async engine, creating it on first use so the asyncpg driver is only
+    required when async sessions are used.
+
+    Returns:
+        AsyncEngine: Process-wide async engine.
+    """
+    global _async_engine, _async_session_factory
+
+    if _async_engine is None:
+        _async_engine = create_async_engine(get_async_database_url(), **POOL_OPTIONS)
+        _async_session_factory = async_sessionmaker(
+            _async_engine, expire_on_commit=False
+        )
+    return _async_engine
+
+
+async def dispose_async_engine() -> None:
+    """
+    Close the async engine's pooled connections, if it was created.
+    """
+    global _async_engine, _async_session_factory
+
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_factory = None
+
+
+def create_session() -> Session:
+    """
+    Create a session outside of a request, e.g. in a background task.
+
+    Returns:
+        Session: New session, closed by the caller.
+    """
+    return Session(engine, query_cls=CustomFilterQuery)
 
 
 def get_session() -> Generator[Session, Any, None]:
-    with Session(engine, query_cls=CustomFilterQuery) as session:
+    with create_session() as session:
+        yield session
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    get_async_engine()
+    async with _async_session_factory() as session:
         yield session
 
 
 DBSessionDep = Annotated[Session, Depends(get_session)]
+AsyncDBSessionDep = Annotated[AsyncSession, Depends(get_async_session)]
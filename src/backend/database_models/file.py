@@ -1,5 +1,5 @@
 from sqlalchemy import String
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from backend.database_models.base import Base
 
@@ -10,6 +10,12 @@ class File(Base):
     user_id: Mapped[str] = mapped_column(String, nullable=True)
     file_name: Mapped[str]
     file_size: Mapped[int] = mapped_column(default=0)
-    file_content: Mapped[str] = mapped_column(default="")
+    # The extracted text can be megabytes, only load it when the content is read
+    file_content: Mapped[str] = mapped_column(default="", deferred=True)
+    preview: Mapped[str] = mapped_column(default="", server_default="")
+    word_count: Mapped[int] = mapped_column(default=0, server_default="0")
+    chunks: Mapped[list["FileChunk"]] = relationship(  # noqa: F821
+        "FileChunk", passive_deletes=True
+    )
 
     __table_args__ = ()
@@ -0,0 +1,36 @@
+from typing import Optional
+
+from sqlalchemy import REAL, Computed, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.database_models.base import Base
+
+FILE_CHUNK_SEARCH_CONFIG = "english"
+
+
+class FileChunk(Base):
+    """
+    Chunk of a file's content, indexed for full-text search and, once embedded,
+    for vector search.
+    """
+
+    __tablename__ = "file_chunks"
+
+    file_id: Mapped[str] = mapped_column(ForeignKey("files.id", ondelete="CASCADE"))
+    position: Mapped[int]
+    text: Mapped[str]
+    search_vector = mapped_column(
+        TSVECTOR,
+        Computed(f"to_tsvector('{FILE_CHUNK_SEARCH_CONFIG}', text)", persisted=True),
+        deferred=True,
+    )
+    embedding: Mapped[Optional[list[float]]] = mapped_column(
+        ARRAY(REAL), nullable=True, deferred=True
+    )
+    embedding_model: Mapped[Optional[str]] = mapped_column(nullable=True)
+
+    __table_args__ = (
+        Index("file_chunk_file_id", file_id),
+        Index("file_chunk_search_vector", search_vector, postgresql_using="gin"),
+    )
@@ -84,6 +84,7 @@ class Message(Base):
         ),
         Index("message_conversation_id_user_id", conversation_id, user_id),
         Index("message_conversation_id", conversation_id),
+        Index("message_conversation_id_position", "conversation_id", "position"),
         Index("message_is_active", is_active),
         Index("message_user_id", user_id),
     )
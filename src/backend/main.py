@@ -7,7 +7,7 @@ from alembic.config import Config
 from dotenv import load_dotenv
 from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from starlette.middleware.sessions import SessionMiddleware
 
 from backend.config.auth import (
@@ -17,8 +17,10 @@ from backend.config.auth import (
 )
 from backend.config.routers import ROUTER_DEPENDENCIES, DependencyType, RouterName
 from backend.config.settings import Settings
+from backend.config.tools import reload_available_tools
+from backend.database_models.database import dispose_async_engine
 from backend.exceptions import DeploymentNotFoundError
-from backend.metrics import RequestMetricsMiddleware
+from backend.metrics import PROMETHEUS_CONTENT_TYPE, RequestMetricsMiddleware, registry
 from backend.routers.agent import router as agent_router
 from backend.routers.auth import router as auth_router
 from backend.routers.chat import router as chat_router
@@ -33,6 +35,7 @@ from backend.routers.snapshot import router as snapshot_router
 from backend.routers.tool import router as tool_router
 from backend.routers.user import router as user_router
 from backend.services.context import ContextMiddleware, get_context
+from backend.services.file import shutdown_extraction_pool, start_extraction_pool
 from backend.services.logger.middleware import LoggingMiddleware
 from backend.services.logger.utils import LoggerFactory
 
@@ -55,8 +58,21 @@ async def lifespan(app: FastAPI):
     # Retrieves all the Auth provider endpoints if authentication is enabled.
     if is_authentication_enabled():
         await get_auth_strategy_endpoints()
+    # Build the tool registry before serving requests
+    reload_available_tools()
+    # Start the file extraction workers before the first upload needs them
+    start_extraction_pool()
     yield
     # Shutdown logic
+    shutdown_extraction_pool()
+    await dispose_async_engine()
+
+
+async def metrics():
+    """
+    Metrics in the Prometheus text exposition format
+    """
+    return Response(content=registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
 
 
 def create_app() -> FastAPI:
@@ -112,6 +128,7 @@ def create_app() -> FastAPI:
         logger = LoggerFactory().get_logger()
         logger.info(event="Metrics enabled")
         app.add_middleware(RequestMetricsMiddleware)
+        app.add_api_route("/metrics", metrics, methods=["GET"], include_in_schema=False)
     app.add_middleware(ContextMiddleware)  # This should be the first middleware
     app.add_exception_handler(SCIMException, scim_exception_handler)  # pyright: ignore
 
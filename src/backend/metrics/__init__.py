@@ -3,11 +3,27 @@ from backend.metrics.middleware import (
     RequestMetricsMiddleware,
     collector,
 )
+from backend.metrics.registry import (
+    PROMETHEUS_CONTENT_TYPE,
+    inter_token_latency,
+    registry,
+    request_latency,
+    time_to_first_token,
+    tool_call_latency,
+    tool_result_cache_lookups,
+)
 from backend.metrics.tool_call_decorator import track_tool_call_time
 
 __all__ = [
     "RequestMetricsMiddleware",
     "collector",
     "MONITORED_PATHS",
+    "PROMETHEUS_CONTENT_TYPE",
+    "inter_token_latency",
+    "registry",
+    "request_latency",
+    "time_to_first_token",
+    "tool_call_latency",
+    "tool_result_cache_lookups",
     "track_tool_call_time",
 ]
@@ -1,30 +1,83 @@
+import atexit
 import csv
 import os
+import threading
 import time
+from collections import deque
 from typing import Any, Dict, List
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.config.settings import Settings
+from backend.metrics.registry import request_latency
+from backend.services.logger.utils import LoggerFactory
 
 MONITORED_PATHS = ["/v1/conversations", "/v1/chat-stream"]
+METRICS_CSV_PATH = "./metrics/metrics.csv"
+METRICS_FLUSH_INTERVAL = Settings().get("metrics.flush_interval") or 10
+# Rows are flushed early once this many are buffered
+METRICS_FLUSH_BATCH_SIZE = 1000
+
+logger = LoggerFactory().get_logger()
+
+
+class RequestMetricsMiddleware:
+    """
+    Records the latency of every request, until its whole response is sent, in the
+    request latency histogram, and the monitored paths in the metrics CSV.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500
 
-class RequestMetricsMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        if any(request.url.path.startswith(prefix) for prefix in MONITORED_PATHS):
-            start_time = time.time()
-            response = await call_next(request)
-            latency = time.time() - start_time
-            collector.add_metric("request", request.url.path, latency)
-        else:
-            response = await call_next(request)
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
 
-        return response
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            latency = time.perf_counter() - start_time
+            # The route template, not the path, so IDs don't make a label set per request
+            route = scope.get("route")
+            ctx = scope.get("context")
+            request_latency.observe(
+                latency,
+                method=scope["method"],
+                route=route.path if route else "unmatched",
+                status_code=str(status_code),
+                deployment=(ctx.deployment_name if ctx else None) or "",
+                model=(ctx.model if ctx else None) or "",
+            )
 
+            path = scope["path"]
+            if any(path.startswith(prefix) for prefix in MONITORED_PATHS):
+                collector.add_metric("request", path, latency)
 
 
 class MetricsCollector:
-    def __init__(self):
-        self.metrics: List[Dict[str, Any]] = []
+    """
+    Buffers metric rows in memory, a background thread appends them to the metrics CSV
+    in batches so recording a metric never writes to disk.
+    """
+
+    def __init__(self, filename: str = METRICS_CSV_PATH, flush_interval: float = METRICS_FLUSH_INTERVAL):
+        self.filename = filename
+        self.flush_interval = flush_interval
+        self.metrics: deque[Dict[str, Any]] = deque()
+        self._flush_requested = threading.Event()
+        self._flusher: threading.Thread | None = None
+        self._lock = threading.Lock()
 
     def add_metric(
             self,
@@ -33,8 +86,8 @@ class MetricsCollector:
             latency: float,
             class_name: str = "",
             method_name: str = "",
-            method_params: Dict[str, Any] = {},
-            timestamp: float = time.time()
+            method_params: Dict[str, Any] | None = None,
+            timestamp: float | None = None,
     ):
         self.metrics.append({
             "timestamp": timestamp or time.time(),
@@ -42,22 +95,56 @@ class MetricsCollector:
             "name": name,
             "class_name": class_name,
             "method_name": method_name,
-            "method_params": method_params,
+            "method_params": method_params or {},
             "latency": latency
         })
-        self.save_to_csv()
+        self._start_flusher()
+
+        if len(self.metrics) >= METRICS_FLUSH_BATCH_SIZE:
+            self._flush_requested.set()
 
-    def save_to_csv(self, filename: str = "./metrics/metrics.csv"):
-        if not self.metrics:
+    def save_to_csv(self, filename: str | None = None):
+        """
+        Append the buffered rows to the metrics CSV.
+        """
+        filename = filename or self.filename
+        rows: List[Dict[str, Any]] = []
+        while self.metrics:
+            rows.append(self.metrics.popleft())
+        if not rows:
             return
-        keys = self.metrics[0].keys()
-        file_exists = os.path.isfile(filename)
-        with open(filename, mode='a' if file_exists else 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=keys)
-            if not file_exists:
-                writer.writeheader()
-            writer.writerows(self.metrics)
-        self.metrics.clear()  # Clear after saving
+
+        with self._lock:
+            os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+            file_exists = os.path.isfile(filename)
+            with open(filename, mode='a' if file_exists else 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=rows[0].keys())
+                if not file_exists:
+                    writer.writeheader()
+                writer.writerows(rows)
+
+    def _start_flusher(self):
+        if self._flusher is not None:
+            return
+
+        with self._lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._flush_periodically, name="metrics-flusher", daemon=True
+                )
+                self._flusher.start()
+                # Write what is left in the buffer on shutdown
+                atexit.register(self.save_to_csv)
+
+    def _flush_periodically(self):
+        while True:
+            self._flush_requested.wait(self.flush_interval)
+            self._flush_requested.clear()
+            try:
+                self.save_to_csv()
+            except Exception as e:
+                # Never let a failed write stop the flusher, the batch is dropped
+                logger.warning(event="[Metrics] Error writing metrics CSV", error=str(e))
 
 
 # Singleton instance
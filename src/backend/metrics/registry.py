@@ -0,0 +1,189 @@
+"""
+In-memory metric aggregation, exported in the Prometheus text format on `/metrics`.
+
+Metrics are aggregated per label set as they are observed, so exporting them costs the
+same however many requests were served. Only counters and histograms are supported.
+"""
+
+import bisect
+import math
+import threading
+from typing import Iterable
+
+# Latency buckets, in seconds, from fast DB reads to long chat streams
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+# Gaps between streamed tokens, in seconds
+TOKEN_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Metric:
+    TYPE: str
+
+    def __init__(self, name: str, description: str, label_names: Iterable[str] = ()):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels.get(label_name, "")) for label_name in self.label_names)
+
+    def _format_labels(self, label_values: tuple[str, ...], **extra: str) -> str:
+        pairs = [*zip(self.label_names, label_values), *extra.items()]
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+    def render(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} {self.TYPE}",
+            *self._render_samples(),
+        ]
+
+    def _render_samples(self) -> list[str]: ...
+
+
+class Counter(Metric):
+    TYPE = "counter"
+
+    def __init__(self, name: str, description: str, label_names: Iterable[str] = ()):
+        super().__init__(name, description, label_names)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._label_values(labels), 0)
+
+    def _render_samples(self) -> list[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return [
+            f"{self.name}_total{self._format_labels(key)} {_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class Histogram(Metric):
+    TYPE = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, description, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: count per bucket (the last one is +Inf), sum of observations
+        self._values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._label_values(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            if key not in self._values:
+                self._values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            counts, total = self._values[key]
+            counts[index] += 1
+            total[0] += value
+
+    def get_count(self, **labels: str) -> int:
+        with self._lock:
+            values = self._values.get(self._label_values(labels))
+            return sum(values[0]) if values else 0
+
+    def _render_samples(self) -> list[str]:
+        with self._lock:
+            values = [(key, list(counts), total[0]) for key, (counts, total) in self._values.items()]
+
+        samples = []
+        for key, counts, total in values:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                le = "+Inf" if bound == math.inf else _format_value(bound)
+                samples.append(f"{self.name}_bucket{self._format_labels(key, le=le)} {cumulative}")
+            samples.append(f"{self.name}_sum{self._format_labels(key)} {_format_value(total)}")
+            samples.append(f"{self.name}_count{self._format_labels(key)} {cumulative}")
+        return samples
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, description: str, label_names: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, description, label_names))
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        label_names: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, description, label_names, buckets))
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(line for metric in metrics for line in metric.render()) + "\n"
+
+    def _register(self, metric: Metric) -> Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered.")
+            self._metrics[metric.name] = metric
+        return metric
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+# Singleton instance and the toolkit's metrics
+registry = MetricsRegistry()
+
+request_latency = registry.histogram(
+    "toolkit_request_duration_seconds",
+    "Latency of HTTP requests, until the whole response is sent.",
+    ("method", "route", "status_code", "deployment", "model"),
+)
+tool_call_latency = registry.histogram(
+    "toolkit_tool_call_duration_seconds",
+    "Latency of tool calls.",
+    ("tool",),
+)
+tool_result_cache_lookups = registry.counter(
+    "toolkit_tool_result_cache_lookups",
+    "Tool result cache lookups, by result (hit or miss).",
+    ("tool", "result"),
+)
+time_to_first_token = registry.histogram(
+    "toolkit_chat_time_to_first_token_seconds",
+    "Time from the start of a chat request to its first generated text token.",
+    ("deployment", "model"),
+)
+inter_token_latency = registry.histogram(
+    "toolkit_chat_inter_token_latency_seconds",
+    "Time between consecutive generated text tokens of a chat stream.",
+    ("deployment", "model"),
+    buckets=TOKEN_BUCKETS,
+)
@@ -1,7 +1,8 @@
 import time
 from typing import Any, Callable
 
-from backend.metrics import collector
+from backend.metrics.middleware import collector
+from backend.metrics.registry import tool_call_latency
 
 
 def track_tool_call_time() -> Callable:
@@ -17,6 +18,7 @@ def track_tool_call_time() -> Callable:
             result = await func(self, *args, **kwargs)
             end_time = time.time()
             time_taken = end_time - start_time
+            tool_call_latency.observe(time_taken, tool=self.__class__.ID or class_name)
             collector.add_metric('call', 'tool_call', class_name=class_name, method_name='call', method_params=passed_method_params,
                                  latency=time_taken)
             return result
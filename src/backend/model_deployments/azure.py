@@ -3,8 +3,10 @@ from typing import Any, AsyncGenerator
 import cohere
 
 from backend.chat.collate import to_dict
+from backend.chat.step_state import ChatStepState
 from backend.config.settings import Settings
 from backend.model_deployments.base import BaseDeployment
+from backend.model_deployments.client_registry import get_client
 from backend.model_deployments.utils import get_deployment_config_var
 from backend.schemas.cohere_chat import CohereChatRequest
 from backend.schemas.context import Context
@@ -39,8 +41,12 @@ class AzureDeployment(BaseDeployment):
 
         if not self.chat_endpoint_url.endswith("/v1"):
             self.chat_endpoint_url = self.chat_endpoint_url + "/v1"
-        self.client = cohere.Client(
-            base_url=self.chat_endpoint_url, api_key=self.api_key
+        self.client = get_client(
+            self.__class__.__name__,
+            {"api_key": self.api_key, "base_url": self.chat_endpoint_url},
+            lambda: cohere.AsyncClient(
+                base_url=self.chat_endpoint_url, api_key=self.api_key
+            ),
         )
 
     @staticmethod
@@ -70,7 +76,7 @@ class AzureDeployment(BaseDeployment):
         )
 
     async def invoke_chat(self, chat_request: CohereChatRequest, **kwargs) -> Any:
-        response = self.client.chat(
+        response = await self.client.chat(
             **chat_request.model_dump(exclude={"stream", "file_ids", "agent_id"}),
         )
         yield to_dict(response)
@@ -78,11 +84,12 @@ class AzureDeployment(BaseDeployment):
     async def invoke_chat_stream(
         self, chat_request: CohereChatRequest, ctx: Context, **kwargs
     ) -> AsyncGenerator[Any, Any]:
+        step_state = kwargs.get("step_state") or ChatStepState()
         stream = self.client.chat_stream(
-            **chat_request.model_dump(exclude={"stream", "file_ids", "agent_id"}),
+            **step_state.dump(chat_request, exclude={"stream", "file_ids", "agent_id"}),
         )
 
-        for event in stream:
+        async for event in stream:
             yield to_dict(event)
 
     async def invoke_rerank(
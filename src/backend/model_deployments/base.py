@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Callable
 
 from backend.config.settings import Settings
+from backend.model_deployments.utils import approximate_token_count
 from backend.schemas.cohere_chat import CohereChatRequest
 from backend.schemas.context import Context
 from backend.schemas.deployment import DeploymentDefinition
@@ -13,6 +14,10 @@ class BaseDeployment(ABC):
     rerank_enabled: bool: Whether the deployment supports reranking.
     invoke_chat_stream: Generator[StreamedChatResponse, None, None]: Invoke the chat stream.
     invoke_rerank: Any: Invoke the rerank.
+    rerank_model: str | None: Model used by invoke_rerank, None if it is not known.
+    embed_model: str | None: Model used by invoke_embed, None if the deployment cannot embed.
+    invoke_embed: list[list[float]]: Invoke the embed.
+    get_token_counter: Callable[[str], int]: Count the tokens of a text for a model.
     list_models: List[str]: List all models.
     is_available: bool: Check if the deployment is available.
     """
@@ -49,6 +54,14 @@ class BaseDeployment(ABC):
     def is_community(cls) -> bool:
         return False
 
+    @staticmethod
+    def rerank_model() -> str | None:
+        return None
+
+    @staticmethod
+    def embed_model() -> str | None:
+        return None
+
     @classmethod
     def config(cls) -> dict[str, Any]:
         config = Settings().get(f"deployments.{cls.id()}")
@@ -87,3 +100,14 @@ class BaseDeployment(ABC):
     async def invoke_rerank(
         self, query: str, documents: list[str], ctx: Context, **kwargs: Any
     ) -> Any: ...
+
+    async def invoke_embed(
+        self, texts: list[str], input_type: str, ctx: Context, **kwargs: Any
+    ) -> list[list[float]]:
+        raise NotImplementedError(f"{self.name()} does not support embeddings")
+
+    async def get_token_counter(
+        self, model: str | None, ctx: Context
+    ) -> Callable[[str], int]:
+        # Deployments with a tokenizer override this, the approximation is used otherwise
+        return approximate_token_count
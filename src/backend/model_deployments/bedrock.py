@@ -5,7 +5,12 @@ import cohere
 from backend.chat.collate import to_dict
 from backend.config.settings import Settings
 from backend.model_deployments.base import BaseDeployment
-from backend.model_deployments.utils import get_deployment_config_var
+from backend.model_deployments.client_registry import get_client
+from backend.model_deployments.utils import (
+    get_deployment_config_var,
+    run_sync_client,
+    stream_sync_client,
+)
 from backend.schemas.cohere_chat import CohereChatRequest
 from backend.schemas.context import Context
 
@@ -23,23 +28,30 @@ class BedrockDeployment(BaseDeployment):
     access_key = bedrock_config.access_key
     secret_access_key = bedrock_config.secret_key
     session_token = bedrock_config.session_token
+    # The Bedrock SDK is synchronous only, optionally run its calls in a worker thread
+    offload_sync_client = Settings().get('deployments.offload_sync_clients')
 
     def __init__(self, **kwargs: Any):
-        self.client = cohere.BedrockClient(
-            aws_access_key=get_deployment_config_var(
+        client_config = {
+            "aws_access_key": get_deployment_config_var(
                 BEDROCK_ACCESS_KEY_ENV_VAR, BedrockDeployment.access_key, **kwargs
             ),
-            aws_secret_key=get_deployment_config_var(
+            "aws_secret_key": get_deployment_config_var(
                 BEDROCK_SECRET_KEY_ENV_VAR,
                 BedrockDeployment.secret_access_key,
                 **kwargs,
             ),
-            aws_session_token=get_deployment_config_var(
+            "aws_session_token": get_deployment_config_var(
                 BEDROCK_SESSION_TOKEN_ENV_VAR, BedrockDeployment.session_token, **kwargs
             ),
-            aws_region=get_deployment_config_var(
+            "aws_region": get_deployment_config_var(
                 BEDROCK_REGION_NAME_ENV_VAR, BedrockDeployment.region_name, **kwargs
             ),
+        }
+        self.client = get_client(
+            self.__class__.__name__,
+            client_config,
+            lambda: cohere.BedrockClient(**client_config),
         )
 
     @staticmethod
@@ -81,7 +93,9 @@ class BedrockDeployment(BaseDeployment):
             exclude={"tools", "conversation_id", "model", "stream"}, exclude_none=True
         )
 
-        response = self.client.chat(
+        response = await run_sync_client(
+            self.client.chat,
+            offload=self.offload_sync_client,
             **bedrock_chat_req,
         )
         yield to_dict(response)
@@ -94,10 +108,12 @@ class BedrockDeployment(BaseDeployment):
             exclude={"tools", "conversation_id", "model", "stream"}, exclude_none=True
         )
 
-        stream = self.client.chat_stream(
+        stream = stream_sync_client(
+            self.client.chat_stream,
+            offload=self.offload_sync_client,
             **bedrock_chat_req,
         )
-        for event in stream:
+        async for event in stream:
             yield to_dict(event)
 
     async def invoke_rerank(
@@ -0,0 +1,92 @@
+"""
+Process-wide registry of model deployment SDK clients.
+
+Deployment instances are created for every chat, title generation and search request,
+but the SDK clients they wrap (cohere, boto3) hold HTTP connection pools that are
+expensive to build. Clients are pooled here, keyed by the deployment class and a hash
+of the effective config used to build them, so requests with the same config reuse a
+long-lived client and its keep-alive connections.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable
+
+MAX_POOLED_CLIENTS = 64
+
+_clients: "OrderedDict[tuple[str, str], Any]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_config_hash(config: dict[str, Any]) -> str:
+    """
+    Hash a deployment config so secrets are never used directly as registry keys.
+
+    Args:
+        config (dict[str, Any]): Effective deployment config
+
+    Returns:
+        str: Stable hash of the config
+    """
+    serialized = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+def get_client(
+    deployment_class_name: str,
+    config: dict[str, Any],
+    factory: Callable[[], Any],
+) -> Any:
+    """
+    Get a pooled client for a deployment, creating it if needed.
+
+    Args:
+        deployment_class_name (str): Name of the deployment class owning the client
+        config (dict[str, Any]): Effective config the client is built with
+        factory (Callable[[], Any]): Builds a new client for the given config
+
+    Returns:
+        Any: The pooled client
+    """
+    key = (deployment_class_name, get_config_hash(config))
+
+    with _lock:
+        client = _clients.get(key)
+        if client is not None:
+            _clients.move_to_end(key)
+            return client
+
+    # Build outside the lock, SDK client construction can be slow
+    client = factory()
+
+    with _lock:
+        # Another request may have built the same client in the meantime
+        existing = _clients.get(key)
+        if existing is not None:
+            _clients.move_to_end(key)
+            return existing
+
+        _clients[key] = client
+        while len(_clients) > MAX_POOLED_CLIENTS:
+            _clients.popitem(last=False)
+
+    return client
+
+
+def invalidate_clients(deployment_class_name: str | None = None) -> None:
+    """
+    Drop pooled clients so they are rebuilt with the latest config.
+
+    Args:
+        deployment_class_name (str | None): Only drop clients of this deployment class,
+            drops every client if not set
+    """
+    with _lock:
+        if deployment_class_name is None:
+            _clients.clear()
+            return
+
+        for key in [key for key in _clients if key[0] == deployment_class_name]:
+            del _clients[key]
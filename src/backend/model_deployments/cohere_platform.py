@@ -1,18 +1,27 @@
-from typing import Any
+import logging
+from typing import Any, Callable
 
 import cohere
 import requests
+from cohere.manually_maintained.tokenizers import async_get_hf_tokenizer
 
 from backend.chat.collate import to_dict
+from backend.chat.step_state import ChatStepState
 from backend.config.settings import Settings
 from backend.model_deployments.base import BaseDeployment
-from backend.model_deployments.utils import get_deployment_config_var
+from backend.model_deployments.client_registry import get_client
+from backend.model_deployments.utils import (
+    approximate_token_count,
+    get_deployment_config_var,
+)
 from backend.schemas.cohere_chat import CohereChatRequest
 from backend.schemas.context import Context
 from backend.services.logger.utils import LoggerFactory
 
 COHERE_API_KEY_ENV_VAR = "COHERE_API_KEY"
 DEFAULT_RERANK_MODEL = "rerank-english-v2.0"
+DEFAULT_EMBED_MODEL = "embed-english-v3.0"
+EMBED_BATCH_SIZE = 96
 
 
 class CohereDeployment(BaseDeployment):
@@ -27,7 +36,11 @@ class CohereDeployment(BaseDeployment):
         api_key = get_deployment_config_var(
             COHERE_API_KEY_ENV_VAR, CohereDeployment.api_key, **kwargs
         )
-        self.client = cohere.Client(api_key, client_name=self.client_name)
+        self.client = get_client(
+            self.__class__.__name__,
+            {"api_key": api_key},
+            lambda: cohere.AsyncClient(api_key, client_name=self.client_name),
+        )
 
     @staticmethod
     def name() -> str:
@@ -41,6 +54,14 @@ class CohereDeployment(BaseDeployment):
     def rerank_enabled() -> bool:
         return True
 
+    @staticmethod
+    def rerank_model() -> str | None:
+        return DEFAULT_RERANK_MODEL
+
+    @staticmethod
+    def embed_model() -> str | None:
+        return DEFAULT_EMBED_MODEL
+
     @classmethod
     def list_models(cls) -> list[str]:
         logger = LoggerFactory().get_logger()
@@ -71,7 +92,7 @@ class CohereDeployment(BaseDeployment):
     async def invoke_chat(
         self, chat_request: CohereChatRequest, **kwargs: Any
     ) -> Any:
-        response = self.client.chat(
+        response = await self.client.chat(
             **chat_request.model_dump(exclude={"stream", "file_ids", "agent_id"}),
         )
         yield to_dict(response)
@@ -80,28 +101,65 @@ class CohereDeployment(BaseDeployment):
         self, chat_request: CohereChatRequest, ctx: Context, **kwargs: Any
     ) -> Any:
         logger = ctx.get_logger()
+        step_state = kwargs.get("step_state") or ChatStepState()
 
         stream = self.client.chat_stream(
-            **chat_request.model_dump(exclude={"stream", "file_ids", "agent_id"}),
+            **step_state.dump(chat_request, exclude={"stream", "file_ids", "agent_id"}),
         )
 
-        for event in stream:
+        # Checked once per stream, events are only copied for the log when it is emitted
+        log_events = logger.is_enabled_for(logging.DEBUG)
+
+        async for event in stream:
             event_dict = to_dict(event)
 
-            event_dict_log = event_dict.copy()
-            event_dict_log.pop("conversation_id", None)
-            logger.debug(
-                event="Chat event",
-                **event_dict_log,
-                conversation_id=ctx.get_conversation_id(),
-            )
+            if log_events:
+                event_dict_log = event_dict.copy()
+                event_dict_log.pop("conversation_id", None)
+                logger.debug(
+                    event="Chat event",
+                    **event_dict_log,
+                    conversation_id=ctx.get_conversation_id(),
+                )
 
             yield event_dict
 
     async def invoke_rerank(
         self, query: str, documents: list[str], ctx: Context, **kwargs: Any
     ) -> Any:
-        response = self.client.rerank(
+        response = await self.client.rerank(
             query=query, documents=documents, model=DEFAULT_RERANK_MODEL
         )
         return to_dict(response)
+
+    async def invoke_embed(
+        self, texts: list[str], input_type: str, ctx: Context, **kwargs: Any
+    ) -> list[list[float]]:
+        embeddings = []
+        for start in range(0, len(texts), EMBED_BATCH_SIZE):
+            response = await self.client.embed(
+                texts=texts[start : start + EMBED_BATCH_SIZE],
+                model=DEFAULT_EMBED_MODEL,
+                input_type=input_type,
+            )
+            embeddings.extend(response.embeddings)
+        return embeddings
+
+    async def get_token_counter(
+        self, model: str | None, ctx: Context
+    ) -> Callable[[str], int]:
+        if not model:
+            return approximate_token_count
+
+        try:
+            # Downloaded once, then cached by the client shared across requests
+            tokenizer = await async_get_hf_tokenizer(self.client, model)
+        except Exception as e:
+            ctx.get_logger().warning(
+                event="[Cohere Deployment] Error loading tokenizer, approximating token counts",
+                model=model,
+                error=str(e),
+            )
+            return approximate_token_count
+
+        return lambda text: len(tokenizer.encode(text, add_special_tokens=False).ids)
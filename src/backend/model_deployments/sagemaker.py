@@ -6,7 +6,12 @@ import boto3
 
 from backend.config.settings import Settings
 from backend.model_deployments.base import BaseDeployment
-from backend.model_deployments.utils import get_deployment_config_var
+from backend.model_deployments.client_registry import get_client
+from backend.model_deployments.utils import (
+    get_deployment_config_var,
+    run_sync_client,
+    stream_sync_client,
+)
 from backend.schemas.cohere_chat import CohereChatRequest
 from backend.schemas.context import Context
 
@@ -32,31 +37,37 @@ class SageMakerDeployment(BaseDeployment):
     aws_access_key_id = sagemaker_config.access_key
     aws_secret_access_key = sagemaker_config.secret_key
     aws_session_token = sagemaker_config.session_token
+    # boto3 is synchronous only, optionally run its calls in a worker thread
+    offload_sync_client = Settings().get('deployments.offload_sync_clients')
 
     def __init__(self, **kwargs: Any):
         # Create the AWS client for the Bedrock runtime with boto3
-        self.client = boto3.client(
-            "sagemaker-runtime",
-            region_name=get_deployment_config_var(
+        client_config = {
+            "region_name": get_deployment_config_var(
                 SAGE_MAKER_REGION_NAME_ENV_VAR,
                 SageMakerDeployment.region_name,
                 **kwargs,
             ),
-            aws_access_key_id=get_deployment_config_var(
+            "aws_access_key_id": get_deployment_config_var(
                 SAGE_MAKER_ACCESS_KEY_ENV_VAR,
                 SageMakerDeployment.aws_access_key_id,
                 **kwargs,
             ),
-            aws_secret_access_key=get_deployment_config_var(
+            "aws_secret_access_key": get_deployment_config_var(
                 SAGE_MAKER_SECRET_KEY_ENV_VAR,
                 SageMakerDeployment.aws_secret_access_key,
                 **kwargs,
             ),
-            aws_session_token=get_deployment_config_var(
+            "aws_session_token": get_deployment_config_var(
                 SAGE_MAKER_SESSION_TOKEN_ENV_VAR,
                 SageMakerDeployment.aws_session_token,
                 **kwargs,
             ),
+        }
+        self.client = get_client(
+            self.__class__.__name__,
+            client_config,
+            lambda: boto3.client("sagemaker-runtime", **client_config),
         )
         self.params = {
             "EndpointName": get_deployment_config_var(
@@ -113,11 +124,22 @@ class SageMakerDeployment(BaseDeployment):
         self.params["Body"] = json.dumps(json_params)
 
         # Invoke the model and print the response
-        result = self.client.invoke_endpoint_with_response_stream(**self.params)
+        result = await run_sync_client(
+            self.client.invoke_endpoint_with_response_stream,
+            offload=self.offload_sync_client,
+            **self.params,
+        )
         event_stream = result["Body"]
-        for index, line in enumerate(SageMakerDeployment.LineIterator(event_stream)):
+        lines = stream_sync_client(
+            SageMakerDeployment.LineIterator,
+            event_stream,
+            offload=self.offload_sync_client,
+        )
+        index = 0
+        async for line in lines:
             stream_event = json.loads(line.decode())
             stream_event["index"] = index
+            index += 1
             yield stream_event
 
     async def invoke_rerank(
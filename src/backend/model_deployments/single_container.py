@@ -3,8 +3,10 @@ from typing import Any, AsyncGenerator
 import cohere
 
 from backend.chat.collate import to_dict
+from backend.chat.step_state import ChatStepState
 from backend.config.settings import Settings
 from backend.model_deployments.base import BaseDeployment
+from backend.model_deployments.client_registry import get_client
 from backend.model_deployments.utils import get_deployment_config_var
 from backend.schemas.cohere_chat import CohereChatRequest
 from backend.schemas.context import Context
@@ -29,8 +31,12 @@ class SingleContainerDeployment(BaseDeployment):
         self.model = get_deployment_config_var(
             SC_MODEL_ENV_VAR, SingleContainerDeployment.default_model, **kwargs
         )
-        self.client = cohere.Client(
-            base_url=self.url, client_name=self.client_name, api_key="none"
+        self.client = get_client(
+            self.__class__.__name__,
+            {"base_url": self.url},
+            lambda: cohere.AsyncClient(
+                base_url=self.url, client_name=self.client_name, api_key="none"
+            ),
         )
 
     @staticmethod
@@ -60,7 +66,7 @@ class SingleContainerDeployment(BaseDeployment):
         )
 
     async def invoke_chat(self, chat_request: CohereChatRequest, **kwargs) -> Any:
-        response = self.client.chat(
+        response = await self.client.chat(
             **chat_request.model_dump(
                 exclude={"stream", "file_ids", "model", "agent_id"}
             ),
@@ -70,18 +76,19 @@ class SingleContainerDeployment(BaseDeployment):
     async def invoke_chat_stream(
         self, chat_request: CohereChatRequest, ctx: Context, **kwargs: Any
     ) -> AsyncGenerator[Any, Any]:
+        step_state = kwargs.get("step_state") or ChatStepState()
         stream = self.client.chat_stream(
-            **chat_request.model_dump(
-                exclude={"stream", "file_ids", "model", "agent_id"}
+            **step_state.dump(
+                chat_request, exclude={"stream", "file_ids", "model", "agent_id"}
             ),
         )
 
-        for event in stream:
+        async for event in stream:
             yield to_dict(event)
 
     async def invoke_rerank(
         self, query: str, documents: list[str], ctx: Context, **kwargs
     ) -> Any:
-        return self.client.rerank(
+        return await self.client.rerank(
             query=query, documents=documents, model=DEFAULT_RERANK_MODEL
         )
@@ -1,4 +1,6 @@
-from typing import Any
+import asyncio
+import math
+from typing import Any, AsyncGenerator, Callable
 
 from backend.database_models import (
     COMMUNITY_MODEL_DEPLOYMENTS_MODULE,
@@ -76,3 +78,75 @@ def add_rerank_model_to_request_state(
     if not request:
         return
     request.state.rerank_model = model
+
+
+# Average number of characters per token of English text for the models' tokenizers
+CHARACTERS_PER_TOKEN = 4
+
+
+def approximate_token_count(text: str) -> int:
+    """
+    Estimate the number of tokens of a text without a tokenizer.
+
+    Args:
+        text (str): Text to count the tokens of
+
+    Returns:
+        int: Approximate number of tokens
+    """
+    return math.ceil(len(text) / CHARACTERS_PER_TOKEN)
+
+
+_STREAM_EXHAUSTED = object()
+
+
+async def run_sync_client(
+    fn: Callable[..., Any], *args: Any, offload: bool = False, **kwargs: Any
+) -> Any:
+    """
+    Call a blocking SDK method from an async deployment.
+
+    Deployments whose SDKs only expose synchronous clients (e.g. boto3) can opt in to
+    running the call in a worker thread so it does not block the event loop.
+
+    Args:
+        fn (Callable[..., Any]): Blocking SDK method
+        offload (bool): Whether to run the call in a worker thread
+
+    Returns:
+        Any: The SDK method's return value
+    """
+    if offload:
+        return await asyncio.to_thread(fn, *args, **kwargs)
+
+    return fn(*args, **kwargs)
+
+
+async def stream_sync_client(
+    fn: Callable[..., Any], *args: Any, offload: bool = False, **kwargs: Any
+) -> AsyncGenerator[Any, None]:
+    """
+    Iterate a blocking SDK stream from an async deployment.
+
+    When offloading, both the call that opens the stream and every read from it
+    run in a worker thread, so a slow generation does not stall other requests.
+
+    Args:
+        fn (Callable[..., Any]): Blocking SDK method returning an iterable stream
+        offload (bool): Whether to read the stream from a worker thread
+
+    Yields:
+        Any: Stream events
+    """
+    if not offload:
+        for event in fn(*args, **kwargs):
+            yield event
+        return
+
+    stream = await asyncio.to_thread(fn, *args, **kwargs)
+    iterator = iter(stream)
+    while True:
+        event = await asyncio.to_thread(next, iterator, _STREAM_EXHAUSTED)
+        if event is _STREAM_EXHAUSTED:
+            break
+        yield event
@@ -1,6 +1,6 @@
 import asyncio
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from fastapi import File as RequestFile
 from fastapi import UploadFile as FastAPIUploadFile
 
@@ -59,6 +59,7 @@ from backend.services.file import (
     get_file_service,
     validate_file,
 )
+from backend.services.file_index import index_uploaded_files
 from backend.services.request_validators import (
     validate_create_agent_request,
     validate_update_agent_request,
@@ -530,6 +531,7 @@ async def delete_agent_tool_metadata(
 @router.post("/batch_upload_file", response_model=list[UploadAgentFileResponse])
 async def batch_upload_file(
     *,
+    background_tasks: BackgroundTasks,
     files: list[FastAPIUploadFile] = RequestFile(...),
     session: DBSessionDep,
     ctx: Context = Depends(get_context),
@@ -547,11 +549,19 @@ async def batch_upload_file(
             user_id,
             ctx,
         )
+    except HTTPException:
+        # Too large or unreadable files
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error while uploading agent file(s): {e}."
         )
 
+    # Embedding the files can take a while, don't hold the response for it
+    background_tasks.add_task(
+        index_uploaded_files, [file.id for file in uploaded_files], ctx
+    )
+
     return uploaded_files
 
 
@@ -576,7 +586,7 @@ async def get_agent_file(
             detail=f"File with ID: {file_id} does not belong to the agent with ID: {agent_id}."
         )
 
-    file = file_crud.get_file(session, file_id)
+    file = file_crud.get_file(session, file_id, with_content=True)
 
     if not file:
         raise HTTPException(
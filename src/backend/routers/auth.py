@@ -24,7 +24,7 @@ from backend.services.auth.utils import (
     get_or_create_user,
     is_enabled_authentication_strategy,
 )
-from backend.services.cache import cache_get_dict
+from backend.services.cache import async_cache_get_dict
 from backend.services.context import get_context
 
 router = APIRouter(
@@ -246,7 +246,7 @@ async def tool_auth(
     try:
         state = json.loads(request.query_params.get("state"))
         cache_key = state["key"]
-        tool_auth_cache = cache_get_dict(cache_key)
+        tool_auth_cache = await async_cache_get_dict(cache_key)
 
         # Get optional frontend redirect
         if "frontend_redirect" in state:
@@ -1,3 +1,4 @@
+import time
 from typing import Any, Generator
 
 from fastapi import APIRouter, Depends
@@ -20,6 +21,7 @@ from backend.services.chat import (
 )
 from backend.services.context import get_context
 from backend.services.request_validators import validate_deployment_header
+from backend.services.tracing import start_span
 
 router = APIRouter(
     prefix="/v1",
@@ -37,19 +39,21 @@ async def chat_stream(
     """
     Stream chat endpoint to handle user messages and return chatbot responses.
     """
+    ctx.with_stream_start_ms(time.time() * 1000)
     ctx.with_model(chat_request.model)
     agent_id = chat_request.agent_id
     ctx.with_agent_id(agent_id)
 
-    (
-        session,
-        chat_request,
-        response_message,
-        should_store,
-        managed_tools,
-        next_message_position,
-        ctx,
-    ) = process_chat(session, chat_request, ctx)
+    with start_span(ctx, "chat.process_chat"):
+        (
+            session,
+            chat_request,
+            response_message,
+            should_store,
+            managed_tools,
+            next_message_position,
+            ctx,
+        ) = process_chat(session, chat_request, ctx)
 
     return EventSourceResponse(
         generate_chat_stream(
@@ -82,6 +86,7 @@ async def regenerate_chat_stream(
     """
     Endpoint to regenerate stream chat response for the last user message.
     """
+    ctx.with_stream_start_ms(time.time() * 1000)
     ctx.with_model(chat_request.model)
 
     agent_id = chat_request.agent_id
@@ -101,14 +106,15 @@ async def regenerate_chat_stream(
         ]
         ctx.with_agent_tool_metadata(agent_tool_metadata_schema)
 
-    (
-        session,
-        chat_request,
-        new_response_message,
-        previous_response_message_ids,
-        managed_tools,
-        ctx,
-    ) = process_message_regeneration(session, chat_request, ctx)
+    with start_span(ctx, "chat.process_message_regeneration"):
+        (
+            session,
+            chat_request,
+            new_response_message,
+            previous_response_message_ids,
+            managed_tools,
+            ctx,
+        ) = process_message_regeneration(session, chat_request, ctx)
 
     return EventSourceResponse(
         generate_chat_stream(
@@ -141,6 +147,7 @@ async def chat(
     """
     Chat endpoint to handle user messages and return chatbot responses.
     """
+    ctx.with_stream_start_ms(time.time() * 1000)
     ctx.with_model(chat_request.model)
     agent_id = chat_request.agent_id
     ctx.with_agent_id(agent_id)
@@ -160,15 +167,16 @@ async def chat(
         ]
         ctx.with_agent_tool_metadata(agent_tool_metadata_schema)
 
-    (
-        session,
-        chat_request,
-        response_message,
-        should_store,
-        managed_tools,
-        next_message_position,
-        ctx,
-    ) = process_chat(session, chat_request, ctx)
+    with start_span(ctx, "chat.process_chat"):
+        (
+            session,
+            chat_request,
+            response_message,
+            should_store,
+            managed_tools,
+            next_message_position,
+            ctx,
+        ) = process_chat(session, chat_request, ctx)
 
     response = await generate_chat_response(
         session,
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, Form, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, Form, HTTPException
 from fastapi import File as RequestFile
 from fastapi import UploadFile as FastAPIUploadFile
 from starlette.responses import Response
@@ -8,8 +8,9 @@ from backend.config.routers import RouterName
 from backend.crud import agent as agent_crud
 from backend.crud import conversation as conversation_crud
 from backend.crud import message as message_crud
+from backend.crud.aio import conversation as aio_conversation_crud
 from backend.database_models import Conversation as ConversationModel
-from backend.database_models.database import DBSessionDep
+from backend.database_models.database import AsyncDBSessionDep, DBSessionDep
 from backend.schemas.agent import Agent
 from backend.schemas.context import Context
 from backend.schemas.conversation import (
@@ -39,13 +40,16 @@ from backend.services.conversation import (
     generate_conversation_title,
     get_documents_to_rerank,
     get_messages_with_files,
+    get_messages_with_files_async,
     validate_conversation,
+    validate_conversation_async,
 )
 from backend.services.file import (
     attach_conversation_id_to_files,
     get_file_service,
     validate_file,
 )
+from backend.services.file_index import index_uploaded_files
 from backend.services.synthesizer import synthesize
 
 router = APIRouter(
@@ -59,7 +63,7 @@ router.name = RouterName.CONVERSATION
 @router.get("/{conversation_id}", response_model=ConversationPublic)
 async def get_conversation(
     conversation_id: ConversationIdPathParam,
-    session: DBSessionDep,
+    session: AsyncDBSessionDep,
     ctx: Context = Depends(get_context),
 ) -> ConversationPublic:
     """
@@ -69,25 +73,17 @@ async def get_conversation(
         HTTPException: If the conversation with the given ID is not found.
     """
     user_id = ctx.get_user_id()
-    conversation = conversation_crud.get_conversation(
-        session, conversation_id, user_id)
+    conversation = await validate_conversation_async(session, conversation_id, user_id)
 
-    if not conversation:
-        raise HTTPException(
-            status_code=404,
-            detail=f"Conversation with ID: {conversation_id} not found.",
-        )
-
-    files = get_file_service().get_files_by_conversation_id(
-        session, user_id, conversation.id, ctx
+    files_by_conversation_id = await get_file_service().get_files_by_conversation_ids_async(
+        session, user_id, [conversation.id], ctx
     )
     files_with_conversation_id = attach_conversation_id_to_files(
-        conversation.id, files)
-    messages = get_messages_with_files(
+        conversation.id, files_by_conversation_id[conversation.id])
+    messages = await get_messages_with_files_async(
         session, user_id, conversation.messages, ctx)
-    _ = validate_conversation(session, conversation_id, user_id)
 
-    conversation = ConversationPublic(
+    return ConversationPublic(
         id=conversation.id,
         user_id=user_id,
         created_at=conversation.created_at,
@@ -101,9 +97,6 @@ async def get_conversation(
         is_pinned=conversation.is_pinned,
     )
 
-    _ = validate_conversation(session, conversation_id, user_id)
-    return conversation
-
 
 @router.get("", response_model=list[ConversationWithoutMessages])
 async def list_conversations(
@@ -111,7 +104,7 @@ async def list_conversations(
     page_params: PaginationQueryParams,
     order_by: OrderByQueryParam = None,
     agent_id: AgentIdQueryParam = None,
-    session: DBSessionDep,
+    session: AsyncDBSessionDep,
     ctx: Context = Depends(get_context),
 ) -> list[ConversationWithoutMessages]:
     """
@@ -119,17 +112,18 @@ async def list_conversations(
     """
     user_id = ctx.get_user_id()
 
-    conversations = conversation_crud.get_conversations(
-        session, offset=page_params.offset, limit=page_params.limit, order_by=order_by, user_id=user_id, agent_id=agent_id
+    conversations = await aio_conversation_crud.get_conversations(
+        session, offset=page_params.offset, limit=page_params.limit, order_by=order_by, user_id=user_id, agent_id=agent_id, with_messages=False
+    )
+
+    files_by_conversation_id = await get_file_service().get_files_by_conversation_ids_async(
+        session, user_id, [conversation.id for conversation in conversations], ctx
     )
 
     results = []
     for conversation in conversations:
-        files = get_file_service().get_files_by_conversation_id(
-            session, user_id, conversation.id, ctx
-        )
         files_with_conversation_id = attach_conversation_id_to_files(
-            conversation.id, files
+            conversation.id, files_by_conversation_id[conversation.id]
         )
         results.append(
             ConversationWithoutMessages(
@@ -291,13 +285,14 @@ async def search_conversations(
         ctx,
     )
 
+    files_by_conversation_id = get_file_service().get_files_by_conversation_ids(
+        session, user_id, [conversation.id for conversation in filtered_documents], ctx
+    )
+
     results = []
     for conversation in filtered_documents:
-        files = get_file_service().get_files_by_conversation_id(
-            session, user_id, conversation.id, ctx
-        )
         files_with_conversation_id = attach_conversation_id_to_files(
-            conversation.id, files
+            conversation.id, files_by_conversation_id[conversation.id]
         )
         results.append(
             ConversationWithoutMessages(
@@ -321,6 +316,7 @@ async def search_conversations(
 @router.post("/batch_upload_file", response_model=list[UploadConversationFileResponse])
 async def batch_upload_file(
     *,
+    background_tasks: BackgroundTasks,
     conversation_id: str = Form(None),
     files: list[FastAPIUploadFile] = RequestFile(...),
     session: DBSessionDep,
@@ -373,11 +369,19 @@ async def batch_upload_file(
             conversation.id,
             ctx,
         )
+    except HTTPException:
+        # Too large or unreadable files
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error while uploading file(s): {e}."
         )
 
+    # Embedding the files can take a while, don't hold the response for it
+    background_tasks.add_task(
+        index_uploaded_files, [file.id for file in uploaded_files], ctx
+    )
+
     files_with_conversation_id = attach_conversation_id_to_files(
         conversation.id, uploaded_files
     )
@@ -387,7 +391,7 @@ async def batch_upload_file(
 @router.get("/{conversation_id}/files", response_model=list[ListConversationFile])
 async def list_files(
     conversation_id: ConversationIdPathParam,
-    session: DBSessionDep, ctx:
+    session: AsyncDBSessionDep, ctx:
     Context = Depends(get_context),
 ) -> list[ListConversationFile]:
     """
@@ -397,13 +401,13 @@ async def list_files(
         HTTPException: If the conversation with the given ID is not found.
     """
     user_id = ctx.get_user_id()
-    _ = validate_conversation(session, conversation_id, user_id)
+    _ = await validate_conversation_async(session, conversation_id, user_id)
 
-    files = get_file_service().get_files_by_conversation_id(
-        session, user_id, conversation_id, ctx
+    files_by_conversation_id = await get_file_service().get_files_by_conversation_ids_async(
+        session, user_id, [conversation_id], ctx
     )
     files_with_conversation_id = attach_conversation_id_to_files(
-        conversation_id, files)
+        conversation_id, files_by_conversation_id[conversation_id])
     return files_with_conversation_id
 
 
@@ -430,7 +434,7 @@ async def get_file(
             detail=f"File with ID: {file_id} does not belong to the conversation with ID: {conversation.id}."
         )
 
-    file = validate_file(session, file_id, user_id)
+    file = validate_file(session, file_id, user_id, with_content=True)
 
     return FileMetadata(
         id=file.id,
@@ -4,6 +4,7 @@ from backend.config.routers import RouterName
 from backend.crud import deployment as deployment_crud
 from backend.database_models.database import DBSessionDep
 from backend.exceptions import DeploymentNotFoundError
+from backend.model_deployments.client_registry import invalidate_clients
 from backend.schemas.context import Context
 from backend.schemas.deployment import (
     DeleteDeployment,
@@ -51,6 +52,7 @@ def create_deployment(
         )
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    deployment_service.invalidate_deployment_definitions()
 
     return mask_deployment_secrets(created)
 
@@ -71,9 +73,13 @@ def update_deployment(
     if not deployment:
         raise DeploymentNotFoundError(deployment_id=deployment_id)
 
-    return mask_deployment_secrets(DeploymentDefinition.from_db_deployment(
+    updated = DeploymentDefinition.from_db_deployment(
         deployment_crud.update_deployment(session, deployment, new_deployment)
-    ))
+    )
+    invalidate_clients(updated.class_name)
+    deployment_service.invalidate_deployment_definitions()
+
+    return mask_deployment_secrets(updated)
 
 
 @router.get("/{deployment_id}", response_model=DeploymentDefinition)
@@ -138,7 +144,9 @@ async def delete_deployment(
     if not deployment:
         raise DeploymentNotFoundError(deployment_id=deployment_id)
 
+    invalidate_clients(deployment.deployment_class_name)
     deployment_crud.delete_deployment(session, deployment_id)
+    deployment_service.invalidate_deployment_definitions()
 
     return DeleteDeployment()
 
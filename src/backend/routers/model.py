@@ -8,6 +8,7 @@ from backend.schemas.model import DeleteModel, ModelCreate, ModelUpdate
 from backend.schemas.model import Model as ModelSchema
 from backend.schemas.params.model import ModelIdPathParam
 from backend.schemas.params.shared import PaginationQueryParams
+from backend.services import deployment as deployment_service
 from backend.services.request_validators import validate_create_update_model_request
 
 router = APIRouter(
@@ -32,7 +33,10 @@ def create_model(
     """
     Create a new model.
     """
-    return model_crud.create_model(session, model)
+    created = model_crud.create_model(session, model)
+    deployment_service.invalidate_deployment_definitions()
+
+    return created
 
 
 @router.put(
@@ -57,7 +61,10 @@ def update_model(
     if not model:
         raise HTTPException(status_code=404, detail="Model not found")
 
-    return model_crud.update_model(session, model, new_model)
+    updated = model_crud.update_model(session, model, new_model)
+    deployment_service.invalidate_deployment_definitions()
+
+    return updated
 
 
 @router.get("/{model_id}", response_model=ModelSchema)
@@ -104,5 +111,6 @@ async def delete_model(
         )
 
     model_crud.delete_model(session, model_id)
+    deployment_service.invalidate_deployment_definitions()
 
     return DeleteModel()
@@ -40,6 +40,9 @@ def list_tools(
             agent_tools.append(available_tools[tool])
         all_tools = agent_tools
 
+    # Registry definitions are shared, copy them before setting the user's auth state
+    all_tools = [tool.model_copy() for tool in all_tools]
+
     for tool in all_tools:
         # Tools with auth implementation can be enabled and visible but not accessible (e.g., if secrets are not set).
         # Therefore, we need to set is_auth_required for these types of tools as well for the frontend.
@@ -34,6 +34,7 @@ class Context(BaseModel):
     organization_id: Optional[str] = None
     organization: Optional[Organization] = None
     use_global_filtering: Optional[bool] = False
+    span: Optional[Any] = None
 
     def __init__(self):
         super().__init__()
@@ -52,9 +53,7 @@ class Context(BaseModel):
         if self.logger is not None:
             return self
 
-        logger = LoggerFactory().get_logger()
-        logger.bind(trace_id=self.trace_id, user_id=self.user_id)
-        self.logger = logger
+        self.logger = LoggerFactory().get_logger()
         return self
 
     def with_trace_id(self, trace_id: str):
@@ -108,6 +107,11 @@ class Context(BaseModel):
 
     def with_stream_start_ms(self, now_ms: float) -> Self:
         self.stream_start_ms = now_ms
+        return self
+
+    def with_span(self, span: Any) -> Self:
+        self.span = span
+        return self
 
     def with_agent_id(self, agent_id: str) -> Self:
         if not agent_id:
@@ -155,6 +159,9 @@ class Context(BaseModel):
     def get_stream_start_ms(self):
         return self.stream_start_ms
 
+    def get_span(self) -> Any:
+        return self.span
+
     def get_request(self):
         return self.request
 
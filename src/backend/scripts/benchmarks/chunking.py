@@ -0,0 +1,95 @@
+"""
+Benchmark chunking a 20MB document with `chunk`, against the previous implementation that
+built each chunk by string concatenation.
+
+Usage: make benchmark-chunking
+"""
+import random
+import time
+
+# Import here the deployments that collate imports, to avoid circular imports
+import backend.model_deployments  # noqa: F401
+from backend.chat.collate import chunk, chunk_spans
+
+DOCUMENT_SIZE = 20 * 1024 * 1024
+WORDS = [
+    "the", "toolkit", "reranks", "documents", "returned", "by", "search", "tools",
+    "before", "they", "are", "sent", "to", "model", "with", "citations", "end.",
+]
+
+
+def concatenating_chunk(
+    content: str,
+    compact_mode: bool = False,
+    soft_word_cut_off: int = 100,
+    hard_word_cut_off: int = 300,
+) -> list[str]:
+    # The implementation `chunk` replaced, kept as the baseline
+    if compact_mode:
+        content = content.replace("\n", " ")
+
+    chunks = []
+    current_chunk = ""
+    words = content.split()
+    word_count = 0
+
+    for word in words:
+        if word_count + len(word.split()) > hard_word_cut_off:
+            chunks.append(current_chunk)
+            current_chunk = ""
+            word_count = 0
+
+        if word_count + len(word.split()) > soft_word_cut_off and word.endswith("."):
+            current_chunk += " " + word
+            chunks.append(current_chunk.strip())
+            current_chunk = ""
+            word_count = 0
+        else:
+            if current_chunk == "":
+                current_chunk = word
+            else:
+                current_chunk += " " + word
+            word_count += len(word.split())
+
+    if current_chunk != "":
+        chunks.append(current_chunk.strip())
+
+    return chunks
+
+
+def generate_document(size: int) -> str:
+    rng = random.Random(0)
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+def best_time(func, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def benchmark_chunking() -> None:
+    document = generate_document(DOCUMENT_SIZE)
+    assert chunk(document) == concatenating_chunk(document)
+
+    baseline = best_time(lambda: concatenating_chunk(document))
+    chunks = best_time(lambda: chunk(document))
+    spans = best_time(lambda: chunk_spans(document))
+
+    print(f"Document: {len(document) / 1024 / 1024:.0f}MB, {len(chunk(document))} chunks")
+    print(f"Concatenating chunk: {baseline:8.2f} s")
+    print(f"chunk:               {chunks:8.2f} s ({baseline / chunks:.1f}x)")
+    print(f"chunk_spans:         {spans:8.2f} s ({baseline / spans:.1f}x)")
+
+
+if __name__ == "__main__":
+    benchmark_chunking()
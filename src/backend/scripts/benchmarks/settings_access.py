@@ -0,0 +1,31 @@
+"""
+Benchmark reading settings with `Settings().get(...)`, against re-reading them from the
+environment and configuration files as every `Settings()` call did before it was cached.
+
+Usage: make benchmark-settings
+"""
+import timeit
+
+from backend.config.settings import Settings
+
+SETTING_PATH = "tools.use_tools_preamble"
+UNCACHED_ITERATIONS = 100
+CACHED_ITERATIONS = 1_000_000
+
+
+def time_per_call(statement, iterations: int) -> float:
+    # Best of 5 runs, in seconds per call
+    return min(timeit.repeat(statement, number=iterations, repeat=5)) / iterations
+
+
+def benchmark_settings_access() -> None:
+    uncached = time_per_call(lambda: Settings.reload().get(SETTING_PATH), UNCACHED_ITERATIONS)
+    cached = time_per_call(lambda: Settings().get(SETTING_PATH), CACHED_ITERATIONS)
+
+    print(f"Settings.reload().get('{SETTING_PATH}'): {uncached * 1e6:10.1f} us/call")
+    print(f"Settings().get('{SETTING_PATH}'):        {cached * 1e6:10.3f} us/call")
+    print(f"Speedup: {uncached / cached:,.0f}x")
+
+
+if __name__ == "__main__":
+    benchmark_settings_access()
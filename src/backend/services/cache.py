@@ -1,14 +1,34 @@
+"""
+Key-value cache used for short-lived state, such as tool OAuth flows.
+
+The Redis backend shares one connection pool per process (one sync and one asyncio pool),
+so cache operations reuse connections instead of opening one each. The in-memory backend
+keeps the cache in the backend process, for tests and single-process deployments.
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
 from typing import Any
 
 from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
 
 from backend.config.settings import Settings
 from backend.services.logger.utils import LoggerFactory
 
+REDIS_CACHE_BACKEND = "redis"
+MEMORY_CACHE_BACKEND = "memory"
+
 logger = LoggerFactory().get_logger()
 
+_client: Redis | None = None
+_async_client: AsyncRedis | None = None
+_cache_backend: "CacheBackend | None" = None
+_lock = threading.Lock()
 
-def get_client() -> Redis:
+
+def get_redis_url() -> str:
     redis_url = Settings().get('redis.url')
 
     if not redis_url:
@@ -16,33 +36,291 @@ def get_client() -> Redis:
         logger.error(event=error)
         raise ValueError(error)
 
-    client = Redis.from_url(redis_url, decode_responses=True)
+    return redis_url
 
-    return client
 
+def get_client() -> Redis:
+    """
+    Get the process-wide Redis client, backed by a connection pool.
 
-def cache_put(key: str, value: Any) -> None:
-    client = get_client()
+    Returns:
+        Redis: The pooled client
+    """
+    global _client
+    with _lock:
+        if _client is None:
+            _client = Redis.from_url(
+                get_redis_url(),
+                decode_responses=True,
+                max_connections=Settings().get('redis.max_connections'),
+            )
+        return _client
 
-    if isinstance(value, dict):
-        client.hset(key, mapping=value)
-    else:
-        client.set(key, value)
+
+def get_async_client() -> AsyncRedis:
+    """
+    Get the process-wide asyncio Redis client, backed by a connection pool.
+
+    Returns:
+        AsyncRedis: The pooled client
+    """
+    global _async_client
+    with _lock:
+        if _async_client is None:
+            _async_client = AsyncRedis.from_url(
+                get_redis_url(),
+                decode_responses=True,
+                max_connections=Settings().get('redis.max_connections'),
+            )
+        return _async_client
+
+
+def reset_clients() -> None:
+    """
+    Drop the pooled clients and the cache backend, they are rebuilt on next use.
+    """
+    global _client, _async_client, _cache_backend
+    with _lock:
+        client, _client = _client, None
+        _async_client = None
+        _cache_backend = None
+
+    if client is not None:
+        client.connection_pool.disconnect()
+
+
+class CacheBackend(ABC):
+    """
+    Storage of the cache service. Values are stored as strings, and dicts as hashes of
+    strings, `ttl` is in seconds and entries without one never expire.
+    """
+
+    @abstractmethod
+    def put(self, key: str, value: Any, ttl: int | None = None) -> None: ...
+
+    @abstractmethod
+    def put_many(self, items: dict[str, Any], ttl: int | None = None) -> None: ...
+
+    @abstractmethod
+    def get(self, key: str) -> Any: ...
+
+    @abstractmethod
+    def mget(self, keys: list[str]) -> list[Any]: ...
+
+    @abstractmethod
+    def get_dict(self, key: str) -> dict: ...
+
+    @abstractmethod
+    def get_dicts(self, keys: list[str]) -> list[dict]: ...
+
+    @abstractmethod
+    def delete(self, *keys: str) -> None: ...
+
+    @abstractmethod
+    async def async_put(self, key: str, value: Any, ttl: int | None = None) -> None: ...
+
+    @abstractmethod
+    async def async_get(self, key: str) -> Any: ...
+
+    @abstractmethod
+    async def async_get_dict(self, key: str) -> dict: ...
+
+    @abstractmethod
+    async def async_delete(self, *keys: str) -> None: ...
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache backend storing entries in Redis, batch operations use a single pipeline.
+    """
+
+    def put(self, key: str, value: Any, ttl: int | None = None) -> None:
+        self.put_many({key: value}, ttl)
+
+    def put_many(self, items: dict[str, Any], ttl: int | None = None) -> None:
+        pipeline = get_client().pipeline()
+        for key, value in items.items():
+            _queue_put(pipeline, key, value, ttl)
+        pipeline.execute()
+
+    def get(self, key: str) -> Any:
+        return get_client().get(key)
+
+    def mget(self, keys: list[str]) -> list[Any]:
+        if not keys:
+            return []
+        return get_client().mget(keys)
+
+    def get_dict(self, key: str) -> dict:
+        return get_client().hgetall(key)
+
+    def get_dicts(self, keys: list[str]) -> list[dict]:
+        pipeline = get_client().pipeline(transaction=False)
+        for key in keys:
+            pipeline.hgetall(key)
+        return pipeline.execute()
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            get_client().delete(*keys)
+
+    async def async_put(self, key: str, value: Any, ttl: int | None = None) -> None:
+        pipeline = get_async_client().pipeline()
+        _queue_put(pipeline, key, value, ttl)
+        await pipeline.execute()
+
+    async def async_get(self, key: str) -> Any:
+        return await get_async_client().get(key)
+
+    async def async_get_dict(self, key: str) -> dict:
+        return await get_async_client().hgetall(key)
+
+    async def async_delete(self, *keys: str) -> None:
+        if keys:
+            await get_async_client().delete(*keys)
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """
+    Cache backend storing entries in a dict of the current process.
+    """
+
+    def __init__(self):
+        self._entries: dict[str, tuple[Any, float | None]] = {}
+        self._lock = threading.Lock()
+
+    def put(self, key: str, value: Any, ttl: int | None = None) -> None:
+        self.put_many({key: value}, ttl)
+
+    def put_many(self, items: dict[str, Any], ttl: int | None = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            for key, value in items.items():
+                if isinstance(value, dict):
+                    # Redis hashes are merged into the existing hash
+                    existing = self._get(key)
+                    value = {
+                        **(existing if isinstance(existing, dict) else {}),
+                        **{str(field): str(item) for field, item in value.items()},
+                    }
+                else:
+                    value = str(value)
+                self._entries[key] = (value, expires_at)
+
+    def get(self, key: str) -> Any:
+        return self.mget([key])[0]
+
+    def mget(self, keys: list[str]) -> list[Any]:
+        with self._lock:
+            values = [self._get(key) for key in keys]
+        return [value if isinstance(value, str) else None for value in values]
+
+    def get_dict(self, key: str) -> dict:
+        return self.get_dicts([key])[0]
+
+    def get_dicts(self, keys: list[str]) -> list[dict]:
+        with self._lock:
+            values = [self._get(key) for key in keys]
+        return [dict(value) if isinstance(value, dict) else {} for value in values]
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    async def async_put(self, key: str, value: Any, ttl: int | None = None) -> None:
+        self.put(key, value, ttl)
+
+    async def async_get(self, key: str) -> Any:
+        return self.get(key)
+
+    async def async_get_dict(self, key: str) -> dict:
+        return self.get_dict(key)
+
+    async def async_delete(self, *keys: str) -> None:
+        self.delete(*keys)
+
+    def _get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        return value
+
+
+def get_cache_backend() -> CacheBackend:
+    """
+    Get the cache backend set by redis.cache_backend in configuration.yaml.
+
+    Returns:
+        CacheBackend: The process-wide cache backend
+    """
+    global _cache_backend
+    with _lock:
+        if _cache_backend is None:
+            backend = Settings().get('redis.cache_backend') or REDIS_CACHE_BACKEND
+            if backend == MEMORY_CACHE_BACKEND:
+                _cache_backend = InMemoryCacheBackend()
+            elif backend == REDIS_CACHE_BACKEND:
+                _cache_backend = RedisCacheBackend()
+            else:
+                raise ValueError(f"Cache backend {backend} is not supported.")
+        return _cache_backend
+
+
+def cache_put(key: str, value: Any, ttl: int | None = None) -> None:
+    get_cache_backend().put(key, value, ttl)
+
+
+def cache_put_many(items: dict[str, Any], ttl: int | None = None) -> None:
+    get_cache_backend().put_many(items, ttl)
 
 
 def cache_get(key: str) -> Any:
-    client = get_client()
+    return get_cache_backend().get(key)
+
 
-    return client.get(key)
+def cache_mget(keys: list[str]) -> list[Any]:
+    return get_cache_backend().mget(keys)
 
 
 def cache_get_dict(key: str) -> dict:
-    client = get_client()
+    return get_cache_backend().get_dict(key)
+
+
+def cache_get_dicts(keys: list[str]) -> list[dict]:
+    return get_cache_backend().get_dicts(keys)
+
 
-    return client.hgetall(key)
+def cache_del(*keys: str) -> None:
+    get_cache_backend().delete(*keys)
 
 
-def cache_del(key: str) -> None:
-    client = get_client()
+async def async_cache_put(key: str, value: Any, ttl: int | None = None) -> None:
+    await get_cache_backend().async_put(key, value, ttl)
 
-    client.delete(key)
+
+async def async_cache_get(key: str) -> Any:
+    return await get_cache_backend().async_get(key)
+
+
+async def async_cache_get_dict(key: str) -> dict:
+    return await get_cache_backend().async_get_dict(key)
+
+
+async def async_cache_del(*keys: str) -> None:
+    await get_cache_backend().async_delete(*keys)
+
+
+def _queue_put(pipeline: Any, key: str, value: Any, ttl: int | None) -> None:
+    if isinstance(value, dict):
+        pipeline.hset(key, mapping=value)
+        if ttl:
+            pipeline.expire(key, ttl)
+    else:
+        pipeline.set(key, value, ex=ttl or None)
@@ -1,4 +1,5 @@
 import json
+import time
 from typing import Any, AsyncGenerator, Dict, Generator, List, Union
 from uuid import uuid4
 
@@ -9,6 +10,7 @@ from fastapi.encoders import jsonable_encoder
 
 from backend.chat.collate import to_dict
 from backend.chat.enums import StreamEvent
+from backend.config.settings import Settings
 from backend.config.tools import get_available_tools
 from backend.crud import agent_tool_metadata as agent_tool_metadata_crud
 from backend.crud import conversation as conversation_crud
@@ -24,6 +26,7 @@ from backend.database_models.message import (
     MessageFileAssociation,
 )
 from backend.database_models.tool_call import ToolCall as ToolCallModel
+from backend.metrics import inter_token_latency, time_to_first_token
 from backend.schemas import CohereChatRequest
 from backend.schemas.agent import Agent, AgentToolMetadata
 from backend.schemas.chat import (
@@ -48,9 +51,15 @@ from backend.schemas.conversation import UpdateConversationRequest
 from backend.schemas.search_query import SearchQuery
 from backend.schemas.tool import Tool, ToolCall, ToolCallDelta
 from backend.services.agent import validate_agent_exists
+from backend.services.chat_persistence import ChatPersistenceBuffer
+from backend.services.tracing import Span, start_span
 
 LOOKBACKS = [3, 5, 7]
 DEATHLOOP_SIMILARITY_THRESHOLDS = [0.5, 0.7, 0.9]
+# Number of buffered messages after which stream persistence is flushed, 0 flushes at stream end
+CHAT_PERSISTENCE_CHECKPOINT = Settings().get("database.chat_persistence_checkpoint") or 0
+# Number of latest conversation messages sent as chat history, 0 sends them all
+CHAT_HISTORY_MAX_MESSAGES = Settings().get("database.chat_history_max_messages") or 0
 
 
 def generate_tools_preamble(chat_request: CohereChatRequest) -> str:
@@ -136,7 +145,7 @@ def process_chat(
     ctx.with_conversation_id(conversation.id)
 
     # Get position to put next message in
-    next_message_position = get_next_message_position(conversation)
+    next_message_position = get_next_message_position(session, conversation)
     user_message = create_message(
         session,
         chat_request,
@@ -169,7 +178,7 @@ def process_chat(
         )
 
     chat_history = create_chat_history(
-        conversation, next_message_position, chat_request
+        session, conversation, next_message_position, chat_request
     )
 
     # co.chat expects either chat_history or conversation_id, not both
@@ -273,7 +282,7 @@ def process_message_regeneration(
     chat_request.message = last_user_message.text
     chat_request.conversation_id = ""
     chat_request.chat_history = create_chat_history(
-        conversation, last_user_message.position, chat_request
+        session, conversation, last_user_message.position, chat_request
     )
 
     managed_tools = (
@@ -382,27 +391,29 @@ def get_or_create_conversation(
     return conversation
 
 
-def get_next_message_position(conversation: Conversation) -> int:
+def get_next_message_position(session: DBSessionDep, conversation: Conversation) -> int:
     """
     Gets message position to create next messages.
 
     Args:
+        session (DBSessionDep): Database session.
         conversation (Conversation): current Conversation.
 
     Returns:
         int: Position to save new messages with
     """
-
-    # Message starts the conversation
-    if len(conversation.messages) == 0:
+    if not conversation.id:
         return 0
 
-    # Get current max position from existing Messages
-    current_active_position = max(
-        [message.position for message in conversation.messages if message.is_active]
+    last_position = message_crud.get_last_message_position(
+        session, conversation.id, conversation.user_id
     )
 
-    return current_active_position + 1
+    # Message starts the conversation
+    if last_position is None:
+        return 0
+
+    return last_position + 1
 
 
 def create_message(
@@ -490,6 +501,7 @@ def attach_files_to_messages(
 
 
 def create_chat_history(
+    session: DBSessionDep,
     conversation: Conversation,
     user_message_position: int,
     chat_request: BaseChatRequest,
@@ -498,7 +510,11 @@ def create_chat_history(
     Create chat history from conversation messages or request, this chat history
     is sent to the chat SDK call for added context.
 
+    Only the latest messages are loaded, so the cost of a request does not grow with the
+    length of the conversation.
+
     Args:
+        session (DBSessionDep): Database session.
         conversation (Conversation): Conversation object.
         user_message_position (int): User message position.
         chat_request (BaseChatRequest): Chat request data.
@@ -509,17 +525,18 @@ def create_chat_history(
     if chat_request.chat_history is not None:
         return chat_request.chat_history
 
-    if conversation.messages is None:
+    if not conversation.id:
         return []
 
     # Filter out user message that was just sent
     # And any empty messages
-    text_messages = [
-        message
-        for message in conversation.messages
-        if message.position < user_message_position
-        and message.text
-    ]
+    text_messages = message_crud.get_chat_history_messages(
+        session,
+        conversation.id,
+        conversation.user_id,
+        user_message_position,
+        CHAT_HISTORY_MAX_MESSAGES,
+    )
     return [
         ChatMessage(
             role=ChatRole(message.agent.value.upper()),
@@ -673,6 +690,10 @@ async def generate_chat_stream(
     """
     Generate chat stream from model deployment stream.
 
+    Events are yielded as soon as they are handled, the messages, documents, citations and
+    tool calls they produce are buffered and persisted in a single transaction at the end
+    of the stream.
+
     Args:
         session (DBSessionDep): Database session.
         model_deployment_stream (AsyncGenerator[Any, Any]): Model deployment stream.
@@ -705,44 +726,102 @@ async def generate_chat_stream(
     # Map the user facing document_ids field returned from model to storage ID for document model
     document_ids_to_document = {}
 
+    persistence = (
+        ChatPersistenceBuffer(session, CHAT_PERSISTENCE_CHECKPOINT) if should_store else None
+    )
+
+    stream_span = start_span(ctx, "chat.stream")
+    latency_labels = {
+        "deployment": ctx.get_deployment_name() or "",
+        "model": ctx.get_model() or "",
+    }
+    last_token_time = None
+
     stream_event = None
-    async for event in model_deployment_stream:
-        (
-            stream_event,
-            stream_end_data,
-            response_message,
-            document_ids_to_document,
-        ) = handle_stream_event(
-            event,
-            conversation_id,
-            stream_end_data,
-            response_message,
-            ctx,
-            document_ids_to_document,
-            session=session,
-            should_store=should_store,
-            user_id=user_id,
-            next_message_position=kwargs.get("next_message_position", 0),
-        )
+    try:
+        async for event in model_deployment_stream:
+            (
+                stream_event,
+                stream_end_data,
+                response_message,
+                document_ids_to_document,
+            ) = handle_stream_event(
+                event,
+                conversation_id,
+                stream_end_data,
+                response_message,
+                ctx,
+                document_ids_to_document,
+                session=session,
+                should_store=should_store,
+                user_id=user_id,
+                next_message_position=kwargs.get("next_message_position", 0),
+                persistence=persistence,
+            )
 
-        yield json.dumps(
-            jsonable_encoder(
-                ChatResponseEvent(
-                    event=stream_event.event_type.value,
-                    data=stream_event,
+            if stream_event.event_type == StreamEvent.TEXT_GENERATION:
+                last_token_time = record_token_latency(
+                    ctx, stream_span, last_token_time, latency_labels
+                )
+
+            yield json.dumps(
+                jsonable_encoder(
+                    ChatResponseEvent(
+                        event=stream_event.event_type.value,
+                        data=stream_event,
+                    )
                 )
             )
-        )
 
-    if should_store:
-        update_conversation_after_turn(
-            session,
-            response_message,
-            conversation_id,
-            stream_end_data["text"],
-            user_id,
-            kwargs.get("previous_response_message_ids")
-        )
+        if persistence:
+            persistence.set_turn_result(
+                response_message,
+                conversation_id,
+                stream_end_data["text"],
+                user_id,
+                kwargs.get("previous_response_message_ids"),
+            )
+    except Exception as e:
+        stream_span.record_exception(e)
+        raise
+    finally:
+        # Also persists the tool calls of an interrupted stream
+        if persistence:
+            with start_span(ctx, "chat.persistence"):
+                persistence.flush()
+        stream_span.end()
+
+
+def record_token_latency(
+    ctx: Context,
+    span: Span,
+    last_token_time: float | None,
+    labels: dict[str, str],
+) -> float:
+    """
+    Record the time to first token of a chat stream, or the latency since its previous token.
+
+    Args:
+        ctx (Context): Context object, its stream start is the reference of the time to first token.
+        span (Span): Span of the chat stream.
+        last_token_time (float | None): `time.perf_counter()` of the previous token, None for the first one.
+        labels (dict[str, str]): Metric labels.
+
+    Returns:
+        float: `time.perf_counter()` of this token.
+    """
+    now = time.perf_counter()
+    if last_token_time is not None:
+        inter_token_latency.observe(now - last_token_time, **labels)
+        return now
+
+    span.add_event("first_token")
+    stream_start_ms = ctx.get_stream_start_ms()
+    if stream_start_ms is not None:
+        ttft = max(time.time() - stream_start_ms / 1000, 0)
+        time_to_first_token.observe(ttft, **labels)
+        span.set_attribute("chat.time_to_first_token_ms", ttft * 1000)
+    return now
 
 
 def handle_stream_event(
@@ -756,6 +835,7 @@ def handle_stream_event(
     should_store: bool = True,
     user_id: str = "",
     next_message_position: int = 0,
+    persistence: ChatPersistenceBuffer | None = None,
 ) -> tuple[StreamEventType, dict[str, Any], Message, dict[str, Document]]:
     logger = ctx.get_logger()
 
@@ -787,6 +867,7 @@ def handle_stream_event(
         should_store=should_store,
         user_id=user_id,
         next_message_position=next_message_position,
+        persistence=persistence,
     )
 
 
@@ -897,6 +978,7 @@ def handle_stream_tool_calls_generation(
     should_store: bool,
     user_id: str,
     next_message_position: int,
+    persistence: ChatPersistenceBuffer | None = None,
 ) -> tuple[StreamToolCallsGeneration, dict[str, Any], Message, dict[str, Document]]:
     tool_calls = []
     tool_calls_event = event.get("tool_calls", [])
@@ -910,7 +992,15 @@ def handle_stream_tool_calls_generation(
     stream_event = StreamToolCallsGeneration(**event | {"tool_calls": tool_calls})
     stream_end_data["tool_calls"].extend(tool_calls)
 
-    if should_store:
+    if should_store and persistence:
+        persistence.add_tool_calls_message(
+            tool_calls,
+            event.get("text", ""),
+            user_id,
+            next_message_position,
+            conversation_id,
+        )
+    elif should_store:
         save_tool_calls_message(
             session,
             tool_calls,
@@ -0,0 +1,205 @@
+from typing import List
+
+from sqlalchemy import func
+
+from backend.chat.collate import to_dict
+from backend.crud import conversation as conversation_crud
+from backend.crud import message as message_crud
+from backend.crud import tool_call as tool_call_crud
+from backend.database_models.conversation import Conversation
+from backend.database_models.database import DBSessionDep
+from backend.database_models.message import Message, MessageAgent
+from backend.database_models.tool_call import ToolCall as ToolCallModel
+from backend.schemas.conversation import UpdateConversationRequest
+from backend.schemas.tool import ToolCall
+from backend.services.logger.utils import LoggerFactory
+
+logger = LoggerFactory().get_logger()
+
+
+class ChatPersistenceBuffer:
+    """
+    Write-behind persistence for the messages produced by a chat turn.
+
+    Stream events are sent to the client as soon as they are handled, while the tool call
+    messages, the response message (with its documents and citations) and the conversation
+    update are buffered and flushed in a single transaction at the end of the stream, or
+    every `checkpoint_size` buffered messages if set.
+
+    If the batched flush fails, it falls back to committing each write on its own so one
+    bad row does not lose the whole turn.
+    """
+
+    def __init__(self, session: DBSessionDep, checkpoint_size: int = 0):
+        self.session = session
+        self.checkpoint_size = checkpoint_size
+        self.messages: list[Message] = []
+        self.response_message: Message | None = None
+        self.conversation_update: tuple[str, str, str] | None = None
+        self.previous_response_message_ids: list[str] = []
+
+    def add_tool_calls_message(
+        self,
+        tool_calls: List[ToolCall],
+        text: str,
+        user_id: str,
+        position: int,
+        conversation_id: str,
+    ) -> Message:
+        """
+        Buffer a tool calls message and its tool calls.
+
+        Args:
+            tool_calls (List[ToolCall]): List of ToolCall objects.
+            text (str): Message text.
+            user_id (str): User ID.
+            position (int): Message position.
+            conversation_id (str): Conversation ID.
+
+        Returns:
+            Message: The buffered message.
+        """
+        message = Message(
+            user_id=user_id,
+            conversation_id=conversation_id,
+            text=text,
+            position=position,
+            is_active=True,
+            agent=MessageAgent.CHATBOT,
+            tool_plan=text,
+            tool_calls=[
+                ToolCallModel(
+                    name=tool_call.name,
+                    parameters=to_dict(tool_call.parameters),
+                )
+                for tool_call in tool_calls
+            ],
+        )
+        self._add_message(message)
+
+        if self.checkpoint_size and len(self.messages) >= self.checkpoint_size:
+            self.flush()
+
+        return message
+
+    def set_turn_result(
+        self,
+        response_message: Message,
+        conversation_id: str,
+        final_message_text: str,
+        user_id: str,
+        previous_response_message_ids: list[str] | None = None,
+    ) -> None:
+        """
+        Buffer the response message and the conversation description update.
+
+        Args:
+            response_message (Message): Response message, with its documents and citations.
+            conversation_id (str): Conversation ID.
+            final_message_text (str): Final message text.
+            user_id (str): User ID.
+            previous_response_message_ids (list[str]): Previous response message IDs to delete.
+        """
+        self._add_message(response_message)
+        self.response_message = response_message
+        self.conversation_update = (conversation_id, user_id, final_message_text)
+        self.previous_response_message_ids = previous_response_message_ids or []
+
+    def flush(self) -> None:
+        """
+        Write every buffered change in a single transaction.
+        """
+        if not self.messages and not self.conversation_update:
+            return
+
+        messages, conversation_update, previous_ids = self._take_pending()
+
+        try:
+            if previous_ids:
+                user_id, message_ids = previous_ids
+                self.session.query(Message).filter(
+                    Message.id.in_(message_ids), Message.user_id == user_id
+                ).delete(synchronize_session=False)
+
+            self.session.add_all(messages)
+
+            if conversation_update:
+                conversation_id, user_id, text = conversation_update
+                self.session.query(Conversation).filter(
+                    Conversation.id == conversation_id,
+                    Conversation.user_id == user_id,
+                ).update({"description": text}, synchronize_session=False)
+
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            logger.warning(
+                event="[Chat] Batched persistence failed, falling back to individual writes",
+                error=str(e),
+            )
+            self._flush_individually(messages, conversation_update, previous_ids)
+
+    def _add_message(self, message: Message) -> None:
+        # Buffered messages are inserted in one transaction, where now() is the same
+        # for every row. Use the insert time so messages keep their chronological order.
+        message.created_at = func.clock_timestamp()
+        message.updated_at = func.clock_timestamp()
+        self.messages.append(message)
+
+    def _take_pending(
+        self,
+    ) -> tuple[list[Message], tuple[str, str, str] | None, tuple[str, list[str]] | None]:
+        messages = self.messages
+        conversation_update = self.conversation_update
+        previous_ids = None
+        if self.previous_response_message_ids and conversation_update:
+            previous_ids = (conversation_update[1], self.previous_response_message_ids)
+
+        self.messages = []
+        self.conversation_update = None
+        self.previous_response_message_ids = []
+
+        return messages, conversation_update, previous_ids
+
+    def _flush_individually(
+        self,
+        messages: list[Message],
+        conversation_update: tuple[str, str, str] | None,
+        previous_ids: tuple[str, list[str]] | None,
+    ) -> None:
+        if previous_ids:
+            user_id, message_ids = previous_ids
+            self._try_write(message_crud.delete_messages, self.session, message_ids, user_id)
+
+        for message in messages:
+            tool_calls = list(message.tool_calls)
+            message.tool_calls = []
+            saved = self._try_write(message_crud.create_message, self.session, message)
+            if not saved:
+                continue
+
+            for tool_call in tool_calls:
+                tool_call.message_id = saved.id
+                self._try_write(tool_call_crud.create_tool_call, self.session, tool_call)
+
+        if conversation_update:
+            conversation_id, user_id, text = conversation_update
+            conversation = conversation_crud.get_conversation(self.session, conversation_id, user_id)
+            if conversation:
+                self._try_write(
+                    conversation_crud.update_conversation,
+                    self.session,
+                    conversation,
+                    UpdateConversationRequest(description=text, user_id=user_id),
+                )
+
+    def _try_write(self, write, *args):
+        try:
+            return write(*args)
+        except Exception as e:
+            self.session.rollback()
+            logger.error(
+                event=f"[Chat] Error persisting chat turn with {write.__name__}",
+                error=str(e),
+            )
+            return None
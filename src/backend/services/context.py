@@ -2,9 +2,10 @@ import contextvars
 import uuid
 
 from fastapi import Request
-from starlette.types import ASGIApp, Receive, Scope, Send
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from backend.schemas.context import Context
+from backend.services.tracing import NOOP_SPAN, SPAN_KIND_SERVER, Span, start_span
 
 GLOBAL_REQUEST_CONTEXT = contextvars.ContextVar("GLOBAL_REQUEST_CONTEXT", default=None)
 
@@ -52,18 +53,55 @@ class ContextMiddleware:
             context.with_global_filtering()
 
         context.with_logger()
+        # Bind the request's IDs once, to every record logged while handling it
+        logger = context.get_logger()
+        logger.clear_context()
+        logger.bind(trace_id=trace_id, user_id=user_id)
+
+        # The request span is the parent of the spans started while handling it
+        span = start_span(
+            context,
+            f"{scope['method']} {scope['path']}",
+            kind=SPAN_KIND_SERVER,
+            **{"http.request.method": scope["method"], "url.path": scope["path"]},
+        )
+        context.with_span(span)
 
         # Set the context on the scope
         scope["context"] = context
         GLOBAL_REQUEST_CONTEXT.set(context)
 
-        await self.app(scope, receive, send)
+        if span is not NOOP_SPAN:
+            await self._call_traced(scope, receive, send, span)
+        else:
+            await self.app(scope, receive, send)
+
+        logger.clear_context()
 
         # Clear the organization ID from the global context
         GLOBAL_REQUEST_CONTEXT.set(None)
         # Clear the context after the request is complete
         del scope["context"]
 
+    async def _call_traced(self, scope: Scope, receive: Receive, send: Send, span: Span):
+        async def send_with_status(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                span.set_attribute("http.response.status_code", message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception as e:
+            span.record_exception(e)
+            raise
+        finally:
+            # The route template, not the path, names the span once the route is matched
+            route = scope.get("route")
+            if route:
+                span.name = f"{scope['method']} {route.path}"
+                span.set_attribute("http.route", route.path)
+            span.end()
+
 
 def get_context_from_scope(scope: Scope) -> Context:
     return scope.get("context") or Context()
@@ -5,9 +5,11 @@ from fastapi import HTTPException
 
 from backend.chat.custom.custom import CustomChat
 from backend.crud import conversation as conversation_crud
+from backend.crud.aio import conversation as aio_conversation_crud
+from backend.crud.aio import file as aio_file_crud
 from backend.database_models import Message as MessageModel
 from backend.database_models.conversation import Conversation as ConversationModel
-from backend.database_models.database import DBSessionDep
+from backend.database_models.database import AsyncDBSessionDep, DBSessionDep
 from backend.database_models.message import MessageAgent
 from backend.model_deployments.base import BaseDeployment
 from backend.schemas.chat import ChatRole
@@ -17,6 +19,7 @@ from backend.schemas.conversation import Conversation
 from backend.schemas.message import Message
 from backend.services.chat import create_message, generate_chat_response
 from backend.services.file import attach_conversation_id_to_files, get_file_service
+from backend.services.rerank import invoke_rerank
 
 DEFAULT_TITLE = "New Conversation"
 GENERATE_TITLE_PROMPT = """# TASK
@@ -31,6 +34,33 @@ Given the following conversation history, write a short title that summarizes th
 SEARCH_RELEVANCE_THRESHOLD = 0.3
 
 
+async def validate_conversation_async(
+    session: AsyncDBSessionDep, conversation_id: str, user_id: str
+) -> Conversation:
+    """Validates if a conversation exists and belongs to the user, using the async session
+
+    Args:
+        session (AsyncDBSessionDep): Async database session
+        conversation_id (str): Conversation ID
+        user_id (str): User ID
+
+    Returns:
+        ConversationModel: Conversation object, with its messages and file associations loaded
+
+    Raises:
+        HTTPException: If the conversation is not found
+    """
+    conversation = await aio_conversation_crud.get_conversation(
+        session, conversation_id, user_id
+    )
+    if not conversation:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Conversation with ID: {conversation_id} not found.",
+        )
+    return conversation
+
+
 def validate_conversation(
     session: DBSessionDep, conversation_id: str, user_id: str
 ) -> Conversation:
@@ -118,30 +148,62 @@ def get_messages_with_files(
         files = get_file_service().get_files_by_message_id(
             session, message.id, user_id, ctx
         )
-        files_with_conversation_id = attach_conversation_id_to_files(
-            message.conversation_id, files
-        )
-        messages_with_file.append(
-            Message(
-                id=message.id,
-                text=message.text,
-                created_at=message.created_at,
-                updated_at=message.updated_at,
-                generation_id=message.generation_id,
-                position=message.position,
-                is_active=message.is_active,
-                files=files_with_conversation_id,
-                documents=message.documents,
-                citations=message.citations,
-                tool_calls=message.tool_calls,
-                tool_plan=message.tool_plan,
-                agent=message.agent,
-            )
-        )
+        messages_with_file.append(_message_with_files(message, files))
 
     return messages_with_file
 
 
+async def get_messages_with_files_async(
+    session: AsyncDBSessionDep, user_id: str, messages: list[MessageModel], ctx: Context
+) -> list[Message]:
+    """
+    Get messages with the files associated with each message, loading the files of
+    all messages in a single query
+
+    Args:
+        session (AsyncDBSessionDep): The async database session
+        user_id (str): The user ID
+        messages (list[MessageModel]): The messages to get files for, with their file associations loaded
+
+    Returns:
+        list[Message]: The messages with files
+    """
+    file_ids = list({file_id for message in messages for file_id in message.file_ids})
+    files_by_id = {}
+    if file_ids:
+        files = await aio_file_crud.get_files_by_ids(session, file_ids, user_id)
+        files_by_id = {file.id: file for file in files}
+
+    return [
+        _message_with_files(
+            message,
+            [files_by_id[file_id] for file_id in message.file_ids if file_id in files_by_id],
+        )
+        for message in messages
+    ]
+
+
+def _message_with_files(message: MessageModel, files: list) -> Message:
+    files_with_conversation_id = attach_conversation_id_to_files(
+        message.conversation_id, files
+    )
+    return Message(
+        id=message.id,
+        text=message.text,
+        created_at=message.created_at,
+        updated_at=message.updated_at,
+        generation_id=message.generation_id,
+        position=message.position,
+        is_active=message.is_active,
+        files=files_with_conversation_id,
+        documents=message.documents,
+        citations=message.citations,
+        tool_calls=message.tool_calls,
+        tool_plan=message.tool_plan,
+        agent=message.agent,
+    )
+
+
 def get_documents_to_rerank(conversations: list[Conversation]) -> list[str]:
     """Get documents (strings) to rerank from a list of conversations
 
@@ -194,7 +256,8 @@ async def filter_conversations(
         return filtered_conversations
 
     # Rerank documents
-    res = await model_deployment.invoke_rerank(
+    res = await invoke_rerank(
+        model_deployment,
         query=query,
         documents=rerank_documents,
         ctx=ctx,
@@ -11,8 +11,20 @@ service abstracts these methods, ensuring higher layers remain unaffected by con
 
 Each deployment is assumed to use either configuration files or the database, with database
 configurations taking precedence.
+
+Installed deployment definitions are cached in-process for deployments.definitions_cache_ttl
+seconds, since building them may call the provider's models endpoint. Expired definitions are
+refreshed in the background while the stale ones keep being served, and the cache is
+invalidated explicitly whenever deployments or models are changed through the API. DB
+definitions are always read from the database, so config changes made through any worker
+are seen by all of them.
 """
 
+import threading
+import time
+
+from sqlalchemy.exc import IntegrityError
+
 from backend.config.deployments import AVAILABLE_MODEL_DEPLOYMENTS
 from backend.config.settings import Settings
 from backend.crud import deployment as deployment_crud
@@ -20,12 +32,105 @@ from backend.crud import model as model_crud
 from backend.database_models.database import DBSessionDep
 from backend.exceptions import DeploymentNotFoundError, NoAvailableDeploymentsError
 from backend.model_deployments.base import BaseDeployment
+from backend.model_deployments.client_registry import invalidate_clients
 from backend.schemas.deployment import DeploymentDefinition, DeploymentUpdate
 from backend.services.env import update_env_file
 from backend.services.logger.utils import LoggerFactory
 
 logger = LoggerFactory().get_logger()
 
+DEFINITIONS_CACHE_TTL = Settings().get("deployments.definitions_cache_ttl") or 0
+
+
+class DeploymentDefinitionsCache:
+    """
+    Cache of installed deployment definitions (built from configuration), keyed by
+    deployment name.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.installed: dict[str, DeploymentDefinition] | None = None
+        self.installed_expires_at = 0.0
+        self.refreshing = False
+
+    def invalidate(self) -> None:
+        with self.lock:
+            self.generation += 1
+            self.installed = None
+            self.refreshing = False
+
+    def get_installed(self) -> dict[str, DeploymentDefinition]:
+        if not self.ttl:
+            return _build_installed_definitions()
+
+        with self.lock:
+            installed = self.installed
+            generation = self.generation
+            refresh = (
+                installed is not None
+                and time.monotonic() >= self.installed_expires_at
+                and not self.refreshing
+            )
+            if refresh:
+                self.refreshing = True
+
+        if installed is None:
+            installed = _build_installed_definitions()
+            self._set_installed(installed, generation)
+        elif refresh:
+            threading.Thread(
+                target=self._refresh_installed, args=(generation,), daemon=True
+            ).start()
+
+        return installed
+
+    def _refresh_installed(self, generation: int) -> None:
+        try:
+            self._set_installed(_build_installed_definitions(), generation)
+        except Exception as e:
+            logger.warning(event="[Deployment] Error refreshing deployment definitions", ex=e)
+        finally:
+            with self.lock:
+                if generation == self.generation:
+                    self.refreshing = False
+
+    def _set_installed(self, installed: dict[str, DeploymentDefinition], generation: int) -> None:
+        with self.lock:
+            # Drop results computed before an invalidation
+            if generation != self.generation:
+                return
+            self.installed = installed
+            self.installed_expires_at = time.monotonic() + self.ttl
+
+
+definitions_cache = DeploymentDefinitionsCache(DEFINITIONS_CACHE_TTL)
+
+
+def invalidate_deployment_definitions() -> None:
+    """
+    Invalidate cached deployment definitions, should be called whenever deployments,
+    their models or their config change.
+    """
+    definitions_cache.invalidate()
+
+
+def _build_installed_definitions() -> dict[str, DeploymentDefinition]:
+    definitions = [
+        deployment.to_deployment_definition()
+        for deployment in AVAILABLE_MODEL_DEPLOYMENTS.values()
+    ]
+    return {definition.name: definition for definition in definitions}
+
+
+def _build_db_definitions(session: DBSessionDep) -> dict[str, DeploymentDefinition]:
+    return {
+        db_deployment.name: DeploymentDefinition.from_db_deployment(db_deployment)
+        for db_deployment in deployment_crud.get_deployments(session)
+    }
+
 
 def create_db_deployment(session: DBSessionDep, deployment: DeploymentDefinition) -> DeploymentDefinition:
     logger.debug(event="create_db_deployment", deployment=deployment.model_dump())
@@ -87,31 +192,39 @@ def get_deployment_definition(session: DBSessionDep, deployment_id: str) -> Depl
     return deployment.to_deployment_definition()
 
 def get_deployment_definition_by_name(session: DBSessionDep, deployment_name: str) -> DeploymentDefinition:
-    definitions = get_deployment_definitions(session)
+    db_deployment = deployment_crud.get_deployment_by_name(session, deployment_name)
+    if db_deployment:
+        return DeploymentDefinition.from_db_deployment(db_deployment)
+
+    # Only this deployment's definition is built, building them all would call the
+    # models endpoint of every other provider
     try:
-        definition = next(definition for definition in definitions if definition.name == deployment_name)
+        deployment = next(d for d in AVAILABLE_MODEL_DEPLOYMENTS.values() if d.name() == deployment_name)
     except StopIteration:
         raise DeploymentNotFoundError(deployment_id=deployment_name)
+    definition = deployment.to_deployment_definition()
 
     # Creates deployment in DB if it doesn't exist
-    if definition.name not in [d.name for d in deployment_crud.get_deployments(session)]:
-        definition = create_db_deployment(session, definition)
-
-    return definition
+    try:
+        return create_db_deployment(session, definition)
+    except IntegrityError:
+        # Created concurrently, e.g. by another worker
+        db_deployment = deployment_crud.get_deployment_by_name(session, deployment_name)
+        if not db_deployment:
+            raise
+        return DeploymentDefinition.from_db_deployment(db_deployment)
 
 def get_deployment_definitions(session: DBSessionDep) -> list[DeploymentDefinition]:
-    db_deployments = {
-        db_deployment.name: DeploymentDefinition.from_db_deployment(db_deployment)
-        for db_deployment in deployment_crud.get_deployments(session)
-    }
+    db_deployments = _build_db_definitions(session)
 
     installed_deployments = [
-        deployment.to_deployment_definition()
-        for deployment in AVAILABLE_MODEL_DEPLOYMENTS.values()
-        if deployment.name() not in db_deployments
+        definition
+        for name, definition in definitions_cache.get_installed().items()
+        if name not in db_deployments
     ]
 
-    return [*db_deployments.values(), *installed_deployments]
+    # Definitions are cached, return copies so callers can't mutate the cache
+    return [definition.model_copy() for definition in [*db_deployments.values(), *installed_deployments]]
 
 def update_config(session: DBSessionDep, deployment_id: str, env_vars: dict[str, str]) -> DeploymentDefinition:
     logger.debug(event="update_config", deployment_id=deployment_id, env_vars=env_vars)
@@ -127,4 +240,8 @@ def update_config(session: DBSessionDep, deployment_id: str, env_vars: dict[str,
         update_env_file(env_vars)
         updated_deployment = get_deployment_definition(session, deployment_id)
 
+    # Pooled clients and definitions built with the previous config are stale now
+    invalidate_clients(updated_deployment.class_name)
+    invalidate_deployment_definitions()
+
     return updated_deployment
@@ -1,5 +1,7 @@
 from dotenv import find_dotenv, load_dotenv, set_key
 
+from backend.config.settings import Settings
+
 
 def update_env_file(env_vars: dict[str, str]):
     dotenv_path = find_dotenv()
@@ -12,3 +14,4 @@ def update_env_file(env_vars: dict[str, str]):
         set_key(dotenv_path, key, str(env_vars[key]))
 
     load_dotenv(dotenv_path)
+    Settings.reload()
@@ -1,44 +1,45 @@
-import io
+import asyncio
+import multiprocessing
+import os
+import threading
+import weakref
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 
-import pandas as pd
-from docx import Document
 from fastapi import Depends, HTTPException
 from fastapi import UploadFile as FastAPIUploadFile
-from python_calamine.pandas import pandas_monkeypatch
 
 import backend.crud.conversation as conversation_crud
 import backend.crud.file as file_crud
+from backend.config.settings import Settings
 from backend.crud import message as message_crud
+from backend.crud.aio import file as aio_file_crud
 from backend.database_models.conversation import ConversationFileAssociation
-from backend.database_models.database import DBSessionDep
+from backend.database_models.database import AsyncDBSessionDep, DBSessionDep
 from backend.database_models.file import File as FileModel
+from backend.database_models.file_chunk import FileChunk
 from backend.schemas.context import Context
 from backend.schemas.file import ConversationFilePublic, File
-from backend.services import utils
 from backend.services.agent import validate_agent_exists
 from backend.services.context import get_context
+from backend.services.file_extraction import FileExtractionError, extract_file_content
 from backend.services.logger.utils import LoggerFactory
 
 MAX_FILE_SIZE = 20_000_000  # 20MB
 MAX_TOTAL_FILE_SIZE = 1_000_000_000  # 1GB
-
-PDF_EXTENSION = "pdf"
-TEXT_EXTENSION = "txt"
-MARKDOWN_EXTENSION = "md"
-CSV_EXTENSION = "csv"
-TSV_EXTENSION = "tsv"
-EXCEL_EXTENSION = "xlsx"
-EXCEL_OLD_EXTENSION = "xls"
-JSON_EXTENSION = "json"
-DOCX_EXTENSION = "docx"
-PARQUET_EXTENSION = "parquet"
-CALENDAR_EXTENSION = "ics"
-
-# Monkey patch Pandas to use Calamine for Excel reading because Calamine is faster than Pandas
-pandas_monkeypatch()
+FILE_PREVIEW_WORD_COUNT = 25
+# Words repeated from the end of a file chunk at the start of the next one, so a passage
+# split between two chunks is still found whole in one of them
+FILE_CHUNK_OVERLAP_WORD_COUNT = 20
+EXTRACTION_WORKERS = Settings().get("files.extraction_workers") or 0
+EXTRACTION_TIMEOUT = Settings().get("files.extraction_timeout") or None
+EXTRACTION_CONCURRENCY = Settings().get("files.extraction_concurrency") or 1
 
 file_service = None
 
+_extraction_pool: "ExtractionPool | None" = None
+_extraction_pool_lock = threading.Lock()
+
 logger = LoggerFactory().get_logger()
 
 
@@ -116,7 +117,6 @@ class FileService:
             list[File]: The files that were created
         """
         uploaded_files = await insert_files_in_db(session, files, user_id)
-
         return uploaded_files
 
     def get_file_ids_by_agent_id(
@@ -148,6 +148,7 @@ class FileService:
                 for tool_metadata in agent.tools_metadata
                 if tool_metadata.tool_name == Tool.Read_File.value.ID
                 or tool_metadata.tool_name == Tool.Search_File.value.ID
+                or tool_metadata.tool_name == Tool.Vector_Search_File.value.ID
             ),
             [],  # Default value if the generator is empty
         )
@@ -210,6 +211,62 @@ class FileService:
 
         return files
 
+    def get_files_by_conversation_ids(
+        self,
+        session: DBSessionDep,
+        user_id: str,
+        conversation_ids: list[str],
+        ctx: Context,
+    ) -> dict[str, list[FileModel]]:
+        """
+        Get the files of several conversations, in a single query
+
+        Args:
+            session (DBSessionDep): The database session
+            user_id (str): The user ID
+            conversation_ids (list[str]): The conversation IDs
+
+        Returns:
+            dict[str, list[File]]: The files of each conversation, without their content
+        """
+        files_by_conversation_id = {
+            conversation_id: [] for conversation_id in conversation_ids
+        }
+        for conversation_id, file in file_crud.get_files_by_conversation_ids(
+            session, conversation_ids, user_id
+        ):
+            files_by_conversation_id[conversation_id].append(file)
+
+        return files_by_conversation_id
+
+    async def get_files_by_conversation_ids_async(
+        self,
+        session: AsyncDBSessionDep,
+        user_id: str,
+        conversation_ids: list[str],
+        ctx: Context,
+    ) -> dict[str, list[FileModel]]:
+        """
+        Get the files of several conversations in a single query, using the async session
+
+        Args:
+            session (AsyncDBSessionDep): The async database session
+            user_id (str): The user ID
+            conversation_ids (list[str]): The conversation IDs
+
+        Returns:
+            dict[str, list[File]]: The files of each conversation, without their content
+        """
+        files_by_conversation_id = {
+            conversation_id: [] for conversation_id in conversation_ids
+        }
+        for conversation_id, file in await aio_file_crud.get_files_by_conversation_ids(
+            session, conversation_ids, user_id
+        ):
+            files_by_conversation_id[conversation_id].append(file)
+
+        return files_by_conversation_id
+
     def delete_conversation_file_by_id(
         self,
         session: DBSessionDep,
@@ -305,7 +362,7 @@ class FileService:
 
 # Misc
 def validate_file(
-    session: DBSessionDep, file_id: str, user_id: str
+    session: DBSessionDep, file_id: str, user_id: str, with_content: bool = False
 ) -> File:
     """
     Validates if a file exists and belongs to the user
@@ -314,6 +371,7 @@ def validate_file(
         session (DBSessionDep): Database session
         file_id (str): File ID
         user_id (str): User ID
+        with_content (bool): Load the file content, which is deferred by default
 
     Returns:
         File: File object
@@ -321,7 +379,7 @@ def validate_file(
     Raises:
         HTTPException: If the file is not found
     """
-    file = file_crud.get_file(session, file_id, user_id)
+    file = file_crud.get_file(session, file_id, user_id, with_content=with_content)
 
     if not file:
         raise HTTPException(
@@ -348,17 +406,32 @@ async def insert_files_in_db(
     Returns:
         list[File]: The files that were created
     """
+    validate_file_sizes(files)
+
+    # Text is extracted off the event loop, a few files at a time so a large upload
+    # doesn't take every extraction worker
+    semaphore = asyncio.Semaphore(max(EXTRACTION_CONCURRENCY, 1))
+
+    async def get_limited_file_content(file: FastAPIUploadFile) -> str:
+        async with semaphore:
+            return await get_file_content(file)
+
+    contents = await asyncio.gather(*(get_limited_file_content(file) for file in files))
+
     files_to_upload = []
-    for file in files:
-        content = await get_file_content(file)
+    for file, content in zip(files, contents):
         cleaned_content = content.replace("\x00", "")
         filename = file.filename.encode("ascii", "ignore").decode("utf-8")
+        words = cleaned_content.split()
 
         files_to_upload.append(
             FileModel(
                 file_name=filename,
                 file_size=file.size,
                 file_content=cleaned_content,
+                preview=" ".join(words[:FILE_PREVIEW_WORD_COUNT]),
+                word_count=len(words),
+                chunks=get_file_chunks(cleaned_content),
                 user_id=user_id,
             )
         )
@@ -367,6 +440,58 @@ async def insert_files_in_db(
     return uploaded_files
 
 
+def validate_file_sizes(files: list[FastAPIUploadFile]) -> None:
+    """
+    Validates the size of each file and of the whole upload before reading them
+
+    Args:
+        files (list[FastAPIUploadFile]): The files to upload
+
+    Raises:
+        HTTPException: If a file or the whole upload is too large (413)
+    """
+    total_size = 0
+    for file in files:
+        size = file.size or 0
+        if size > MAX_FILE_SIZE:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File {file.filename} is larger than the maximum file size of {MAX_FILE_SIZE} bytes",
+            )
+        total_size += size
+
+    if total_size > MAX_TOTAL_FILE_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Files are larger than the maximum total size of {MAX_TOTAL_FILE_SIZE} bytes",
+        )
+
+
+def get_file_chunks(content: str) -> list[FileChunk]:
+    """
+    Split a file's content into the chunks indexed for file search
+
+    Args:
+        content (str): The file content
+
+    Returns:
+        list[FileChunk]: The chunks, in content order. A file without content gets a
+            single empty chunk, so it is not chunked again on every search
+    """
+    # Import here to avoid circular imports
+    from backend.chat.collate import chunk
+
+    # Sizes are in words: the chunks are stored once and searched with any deployment,
+    # there is no single tokenizer to count them with
+    file_chunks = [
+        FileChunk(position=position, text=text)
+        for position, text in enumerate(
+            chunk(content or "", overlap=FILE_CHUNK_OVERLAP_WORD_COUNT)
+        )
+    ]
+    return file_chunks or [FileChunk(position=0, text="")]
+
+
 def attach_conversation_id_to_files(
     conversation_id: str, files: list[FileModel]
 ) -> list[ConversationFilePublic]:
@@ -387,94 +512,209 @@ def attach_conversation_id_to_files(
 
 
 
-def read_excel(file_contents: bytes) -> str:
-    """Reads the text from an Excel file using Pandas
+async def get_file_content(file: FastAPIUploadFile) -> str:
+    """Reads the file contents based on the file extension
+
+    The text is extracted in the extraction process pool, or in a thread if it is disabled,
+    so parsing large documents does not block the event loop.
 
     Args:
-        file_contents (bytes): The file contents
+        file (UploadFile): The file to read
 
     Returns:
-        str: The text extracted from the Excel
+        str: The file contents
+
+    Raises:
+        HTTPException: If the file is too large (413), its text can't be extracted (422),
+            an extraction worker died (503) or extracting it times out (504)
     """
-    excel = pd.read_excel(io.BytesIO(file_contents), engine="calamine")
-    return excel.to_string()
+    file_contents = await file.read()
+    if len(file_contents) > MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File {file.filename} is larger than the maximum file size of {MAX_FILE_SIZE} bytes",
+        )
 
+    pool = get_extraction_pool()
+    try:
+        if pool is None:
+            return await asyncio.wait_for(
+                asyncio.to_thread(extract_file_content, file.filename, file_contents),
+                timeout=EXTRACTION_TIMEOUT,
+            )
+        return await extract_in_pool(pool, file.filename, file_contents)
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=504,
+            detail=f"Extracting the text of file {file.filename} timed out after {EXTRACTION_TIMEOUT} seconds",
+        )
+    except BrokenProcessPool:
+        # A worker died (e.g. out of memory), the next upload gets a new pool
+        shutdown_extraction_pool()
+        raise HTTPException(
+            status_code=503,
+            detail=f"Extracting the text of file {file.filename} failed",
+        )
+    except FileExtractionError as e:
+        raise HTTPException(status_code=422, detail=str(e))
 
-def read_docx(file_contents: bytes) -> str:
-    """Reads the text from a DOCX file
+
+async def extract_in_pool(
+    pool: "ExtractionPool", file_name: str, file_contents: bytes
+) -> str:
+    """
+    Extract the text of a file in the extraction process pool. The extraction timeout
+    starts once a worker is free to run it.
 
     Args:
+        pool (ExtractionPool): The extraction process pool
+        file_name (str): The file name
         file_contents (bytes): The file contents
 
     Returns:
-        str: The text extracted from the DOCX file, with each paragraph separated by a newline
-    """
-    document = Document(io.BytesIO(file_contents))
-    text = ""
+        str: The file text
 
-    for paragraph in document.paragraphs:
-        text += paragraph.text + "\n"
+    Raises:
+        asyncio.TimeoutError: If the extraction times out
+    """
+    # Jobs are only submitted to a free worker, so the timeout counts the extraction
+    # and not the time spent waiting behind other files or for the workers to start
+    async with pool.slots():
+        await pool.started()
+        job = pool.submit(extract_file_content, file_name, file_contents)
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(job), timeout=EXTRACTION_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            # A job still waiting for a worker is cancelled. A running one can't be
+            # interrupted, its worker is replaced so it doesn't stay busy
+            if not job.cancel():
+                recycle_extraction_pool(pool, job)
+            raise
 
-    return text
 
+class ExtractionPool(ProcessPoolExecutor):
+    """
+    Process pool file text is extracted in, which can retire a worker stuck on a job.
+    """
 
-def read_parquet(file_contents: bytes) -> str:
-    """Reads the text from a Parquet file using Pandas
+    def __init__(self, max_workers: int):
+        # Spawn workers, forking a process running threads and an event loop is unsafe
+        super().__init__(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        self.jobs: set[Future] = set()
+        self.jobs_lock = threading.Lock()
+        # Semaphores are bound to the event loop they are used in
+        self._slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._warm_up_jobs: list[Future] = []
 
-    Args:
-        file_contents (bytes): The file contents
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        job = super().submit(fn, *args, **kwargs)
+        with self.jobs_lock:
+            self.jobs.add(job)
+        job.add_done_callback(self._job_done)
+        return job
 
-    Returns:
-        str: The text extracted from the Parquet
-    """
-    parquet = pd.read_parquet(io.BytesIO(file_contents), engine="pyarrow")
-    return parquet.to_string()
+    def _job_done(self, job: Future) -> None:
+        with self.jobs_lock:
+            self.jobs.discard(job)
 
+    def slots(self) -> asyncio.Semaphore:
+        """
+        Semaphore with a slot per worker, held by the running event loop's jobs from
+        their submission until they are done
+        """
+        loop = asyncio.get_running_loop()
+        with self.jobs_lock:
+            if loop not in self._slots:
+                self._slots[loop] = asyncio.Semaphore(self._max_workers)
+            return self._slots[loop]
 
+    def warm_up(self) -> None:
+        """
+        Start every worker now rather than on the first uploads, a new worker imports
+        the extraction module before running its first job
+        """
+        self._warm_up_jobs = [self.submit(os.getpid) for _ in range(self._max_workers)]
 
-def get_file_extension(file_name: str) -> str:
-    """Returns the file extension
+    async def started(self) -> None:
+        """
+        Wait for the workers started by `warm_up`
+        """
+        pending = [job for job in self._warm_up_jobs if not job.done()]
+        if pending:
+            await asyncio.wait([asyncio.wrap_future(job) for job in pending])
 
-    Args:
-        file_name (str): The file name
+    def retire(self, stuck_job: Future) -> None:
+        """
+        Stop taking jobs, let the other jobs finish, then kill the workers, including
+        the one still running `stuck_job`. Blocks until the other jobs are done.
+        """
+        # shutdown() drops the executor's process table, keep a handle on the workers.
+        # ProcessPoolExecutor has no public way to stop a running job
+        processes = list((self._processes or {}).values())
+        self.shutdown(wait=False)
+        with self.jobs_lock:
+            other_jobs = self.jobs - {stuck_job}
+        wait(other_jobs)
+        for process in processes:
+            process.kill()
+
+
+def get_extraction_pool() -> ExtractionPool | None:
+    """
+    Get the process pool file text is extracted in, creating it on first use
 
     Returns:
-        str: The file extension
+        ExtractionPool | None: The pool, or None if extraction workers are disabled
     """
-    return file_name.split(".")[-1].lower()
+    global _extraction_pool
+    if EXTRACTION_WORKERS <= 0:
+        return None
 
+    with _extraction_pool_lock:
+        if _extraction_pool is None:
+            _extraction_pool = ExtractionPool(EXTRACTION_WORKERS)
+            _extraction_pool.warm_up()
+        return _extraction_pool
 
-async def get_file_content(file: FastAPIUploadFile) -> str:
-    """Reads the file contents based on the file extension
+
+def start_extraction_pool() -> None:
+    """
+    Create the extraction process pool and start its workers, so the first uploads
+    don't wait for them
+    """
+    get_extraction_pool()
+
+
+def recycle_extraction_pool(pool: ExtractionPool, stuck_job: Future) -> None:
+    """
+    Replace the extraction process pool after one of its jobs timed out. The next
+    upload gets a new pool, the old one is retired in the background.
 
     Args:
-        file (UploadFile): The file to read
+        pool (ExtractionPool): The pool the job was submitted to
+        stuck_job (Future): The timed out job
+    """
+    global _extraction_pool
+    with _extraction_pool_lock:
+        if _extraction_pool is pool:
+            _extraction_pool = None
 
-    Returns:
-        str: The file contents
+    threading.Thread(target=pool.retire, args=(stuck_job,), daemon=True).start()
 
-    Raises:
-        ValueError: If the file extension is not supported
+
+def shutdown_extraction_pool() -> None:
     """
-    file_contents = await file.read()
-    file_extension = get_file_extension(file.filename)
-
-    if file_extension == PDF_EXTENSION:
-        return utils.read_pdf(file_contents)
-    elif file_extension == DOCX_EXTENSION:
-        return read_docx(file_contents)
-    elif file_extension == PARQUET_EXTENSION:
-        return read_parquet(file_contents)
-    elif file_extension in [
-        TEXT_EXTENSION,
-        MARKDOWN_EXTENSION,
-        CSV_EXTENSION,
-        TSV_EXTENSION,
-        JSON_EXTENSION,
-        CALENDAR_EXTENSION
-    ]:
-        return file_contents.decode("utf-8")
-    elif file_extension in [EXCEL_EXTENSION, EXCEL_OLD_EXTENSION]:
-        return read_excel(file_contents)
-
-    raise ValueError(f"File extension {file_extension} is not supported")
+    Shut down the extraction process pool, it is recreated on the next upload
+    """
+    global _extraction_pool
+    with _extraction_pool_lock:
+        pool, _extraction_pool = _extraction_pool, None
+
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,161 @@
+"""
+Text extraction for uploaded files.
+
+The extraction process pool's workers import this module to run `extract_file_content`,
+so it must not import the app, its settings or the database. Parser libraries are imported
+when first used, a worker only pays for the formats it extracts.
+"""
+
+import io
+
+PDF_EXTENSION = "pdf"
+TEXT_EXTENSION = "txt"
+MARKDOWN_EXTENSION = "md"
+CSV_EXTENSION = "csv"
+TSV_EXTENSION = "tsv"
+EXCEL_EXTENSION = "xlsx"
+EXCEL_OLD_EXTENSION = "xls"
+JSON_EXTENSION = "json"
+DOCX_EXTENSION = "docx"
+PARQUET_EXTENSION = "parquet"
+CALENDAR_EXTENSION = "ics"
+
+
+class FileExtractionError(Exception):
+    """
+    The text of a file can't be extracted: its extension is not supported, or the file is
+    not valid for its extension.
+    """
+
+
+def read_pdf(file_contents: bytes) -> str:
+    """Reads the text from a PDF file using PyPDF2
+
+    Args:
+        file_contents (bytes): The file contents
+
+    Returns:
+        str: The text extracted from the PDF
+    """
+    from pypdf import PdfReader
+
+    pdf_reader = PdfReader(io.BytesIO(file_contents))
+    text = ""
+
+    # Extract text from each page
+    for page in pdf_reader.pages:
+        page_text = page.extract_text()
+        text += page_text
+
+    return text
+
+
+def read_excel(file_contents: bytes) -> str:
+    """Reads the text from an Excel file using Pandas
+
+    Args:
+        file_contents (bytes): The file contents
+
+    Returns:
+        str: The text extracted from the Excel
+    """
+    import pandas as pd
+    from python_calamine.pandas import pandas_monkeypatch
+
+    # Monkey patch Pandas to use Calamine for Excel reading because Calamine is faster than Pandas
+    pandas_monkeypatch()
+
+    excel = pd.read_excel(io.BytesIO(file_contents), engine="calamine")
+    return excel.to_string()
+
+
+def read_docx(file_contents: bytes) -> str:
+    """Reads the text from a DOCX file
+
+    Args:
+        file_contents (bytes): The file contents
+
+    Returns:
+        str: The text extracted from the DOCX file, with each paragraph separated by a newline
+    """
+    from docx import Document
+
+    document = Document(io.BytesIO(file_contents))
+    text = ""
+
+    for paragraph in document.paragraphs:
+        text += paragraph.text + "\n"
+
+    return text
+
+
+def read_parquet(file_contents: bytes) -> str:
+    """Reads the text from a Parquet file using Pandas
+
+    Args:
+        file_contents (bytes): The file contents
+
+    Returns:
+        str: The text extracted from the Parquet
+    """
+    import pandas as pd
+
+    parquet = pd.read_parquet(io.BytesIO(file_contents), engine="pyarrow")
+    return parquet.to_string()
+
+
+def get_file_extension(file_name: str) -> str:
+    """Returns the file extension
+
+    Args:
+        file_name (str): The file name
+
+    Returns:
+        str: The file extension
+    """
+    return file_name.split(".")[-1].lower()
+
+
+def extract_file_content(file_name: str, file_contents: bytes) -> str:
+    """Extracts the text of a file based on its extension
+
+    Runs in the extraction worker processes, so it only takes picklable arguments.
+
+    Args:
+        file_name (str): The file name
+        file_contents (bytes): The file contents
+
+    Returns:
+        str: The file text
+
+    Raises:
+        FileExtractionError: If the file extension is not supported, or the file can't be read
+    """
+    file_extension = get_file_extension(file_name)
+
+    try:
+        if file_extension == PDF_EXTENSION:
+            return read_pdf(file_contents)
+        elif file_extension == DOCX_EXTENSION:
+            return read_docx(file_contents)
+        elif file_extension == PARQUET_EXTENSION:
+            return read_parquet(file_contents)
+        elif file_extension in [
+            TEXT_EXTENSION,
+            MARKDOWN_EXTENSION,
+            CSV_EXTENSION,
+            TSV_EXTENSION,
+            JSON_EXTENSION,
+            CALENDAR_EXTENSION
+        ]:
+            return file_contents.decode("utf-8")
+        elif file_extension in [EXCEL_EXTENSION, EXCEL_OLD_EXTENSION]:
+            return read_excel(file_contents)
+    except Exception as e:
+        # Each parser raises its own errors for invalid files (PdfReadError, BadZipFile,
+        # CalamineError, UnicodeDecodeError, ...)
+        raise FileExtractionError(
+            f"File {file_name} could not be read as a {file_extension} file: {e}"
+        ) from e
+
+    raise FileExtractionError(f"File extension {file_extension} is not supported")
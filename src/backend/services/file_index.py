@@ -0,0 +1,235 @@
+"""
+Vector index over the chunks of uploaded files.
+
+Chunks are embedded once, with the deployment's embed endpoint, and their vectors are
+stored with them in the file_chunks table. Uploaded files are embedded in the background,
+after the upload response is sent. Searching only embeds the query and runs a
+cosine top-k over the vectors of the requested files. Uploaded files never change, so
+each file's normalized matrix is also cached in-process.
+"""
+
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+import numpy as np
+
+import backend.crud.file_chunk as file_chunk_crud
+from backend.database_models.database import DBSessionDep, create_session
+from backend.database_models.file_chunk import FileChunk
+from backend.model_deployments.base import BaseDeployment
+from backend.schemas.context import Context
+from backend.services.logger.utils import LoggerFactory
+
+EMBED_BATCH_SIZE = 96
+MAX_CACHED_FILES = 256
+
+logger = LoggerFactory().get_logger()
+
+_file_vectors: "OrderedDict[tuple[str, str], tuple[list[str], np.ndarray]]" = OrderedDict()
+_lock = threading.Lock()
+
+
+class Embedder(ABC):
+    """
+    Embeds texts for the file index, `model` identifies the vector space.
+    """
+
+    model: str
+
+    @abstractmethod
+    async def embed(self, texts: list[str], input_type: str) -> list[list[float]]: ...
+
+
+class DeploymentEmbedder(Embedder):
+    """
+    Embeds texts with the embed endpoint of a model deployment.
+    """
+
+    def __init__(self, deployment: BaseDeployment, ctx: Context):
+        self.deployment = deployment
+        self.ctx = ctx
+        self.model = deployment.embed_model()
+
+    async def embed(self, texts: list[str], input_type: str) -> list[list[float]]:
+        return await self.deployment.invoke_embed(texts, input_type, self.ctx)
+
+
+def get_embedder(deployment: BaseDeployment | None, ctx: Context) -> Embedder | None:
+    """
+    Get the embedder for a deployment.
+
+    Args:
+        deployment (BaseDeployment | None): Model deployment of the request
+        ctx (Context): Context object
+
+    Returns:
+        Embedder | None: The deployment's embedder, or None if it cannot embed
+    """
+    if deployment is not None and deployment.embed_model():
+        return DeploymentEmbedder(deployment, ctx)
+    return None
+
+
+async def index_files(
+    session: DBSessionDep, file_ids: list[str], embedder: Embedder
+) -> int:
+    """
+    Embed the chunks of the given files that are not embedded with the embedder's model yet.
+
+    Args:
+        session (DBSessionDep): The database session
+        file_ids (list[str]): The file IDs
+        embedder (Embedder): The embedder
+
+    Returns:
+        int: Number of chunks embedded
+    """
+    file_chunks = file_chunk_crud.get_unembedded_file_chunks(
+        session, file_ids, embedder.model
+    )
+
+    for start in range(0, len(file_chunks), EMBED_BATCH_SIZE):
+        batch = file_chunks[start : start + EMBED_BATCH_SIZE]
+        embeddings = await embedder.embed(
+            [file_chunk.text for file_chunk in batch], "search_document"
+        )
+        file_chunk_crud.update_file_chunk_embeddings(
+            session, batch, embeddings, embedder.model
+        )
+
+    return len(file_chunks)
+
+
+async def index_uploaded_files(file_ids: list[str], ctx: Context) -> None:
+    """
+    Embed newly uploaded files with the request's deployment, if it can embed.
+
+    Runs as a background task once the upload response is sent, with its own session.
+    Failures are only logged, files not indexed on upload are indexed on their first search.
+
+    Args:
+        file_ids (list[str]): The uploaded file IDs
+        ctx (Context): Context object
+    """
+    # Import here to avoid circular imports
+    from backend.chat.custom.utils import get_deployment
+
+    try:
+        with create_session() as session:
+            deployment = get_deployment(ctx.get_deployment_name(), session, ctx)
+            if not deployment.embed_model():
+                return
+
+            await index_files(session, file_ids, DeploymentEmbedder(deployment, ctx))
+    except Exception as e:
+        logger.warning(
+            event="[File Index] Error indexing uploaded files",
+            file_ids=file_ids,
+            error=str(e),
+        )
+
+
+async def search_files(
+    session: DBSessionDep,
+    file_ids: list[str],
+    query: str,
+    embedder: Embedder,
+    top_k: int = 10,
+) -> list[tuple[FileChunk, float]]:
+    """
+    Get the chunks of the given files most similar to a query.
+
+    Args:
+        session (DBSessionDep): The database session
+        file_ids (list[str]): The file IDs to search over, already checked to belong to the user
+        query (str): The search query
+        embedder (Embedder): The embedder
+        top_k (int): Maximum number of chunks to return
+
+    Returns:
+        list[tuple[FileChunk, float]]: Chunks and their cosine similarity, most similar first
+    """
+    await index_files(session, file_ids, embedder)
+
+    chunk_ids = []
+    matrices = []
+    for file_id in file_ids:
+        file_chunk_ids, matrix = get_file_vectors(session, file_id, embedder.model)
+        if file_chunk_ids:
+            chunk_ids.extend(file_chunk_ids)
+            matrices.append(matrix)
+
+    if not chunk_ids:
+        return []
+
+    query_vector = _normalize(
+        np.asarray((await embedder.embed([query], "search_query"))[0], dtype=np.float32)
+    )
+    scores = np.concatenate(matrices) @ query_vector
+
+    top_k = min(top_k, len(chunk_ids))
+    top_indices = np.argpartition(-scores, top_k - 1)[:top_k]
+    top_indices = top_indices[np.argsort(-scores[top_indices])]
+
+    file_chunks = {
+        file_chunk.id: file_chunk
+        for file_chunk in file_chunk_crud.get_file_chunks_by_ids(
+            session, [chunk_ids[index] for index in top_indices]
+        )
+    }
+    return [
+        (file_chunks[chunk_ids[index]], float(scores[index]))
+        for index in top_indices
+        if chunk_ids[index] in file_chunks
+    ]
+
+
+def get_file_vectors(
+    session: DBSessionDep, file_id: str, embedding_model: str
+) -> tuple[list[str], np.ndarray]:
+    """
+    Get the chunk IDs and normalized embedding matrix of a file, cached per file and model.
+
+    Args:
+        session (DBSessionDep): The database session
+        file_id (str): The file ID
+        embedding_model (str): The embedding model
+
+    Returns:
+        tuple[list[str], np.ndarray]: Chunk IDs and their embeddings, one row per chunk
+    """
+    key = (file_id, embedding_model)
+    with _lock:
+        vectors = _file_vectors.get(key)
+        if vectors is not None:
+            _file_vectors.move_to_end(key)
+            return vectors
+
+    rows = file_chunk_crud.get_file_chunk_embeddings(session, file_id, embedding_model)
+    if not rows:
+        return [], np.zeros((0, 0), dtype=np.float32)
+
+    vectors = (
+        [chunk_id for chunk_id, _ in rows],
+        _normalize(np.asarray([embedding for _, embedding in rows], dtype=np.float32)),
+    )
+    with _lock:
+        _file_vectors[key] = vectors
+        while len(_file_vectors) > MAX_CACHED_FILES:
+            _file_vectors.popitem(last=False)
+
+    return vectors
+
+
+def clear_file_vectors() -> None:
+    """
+    Drop the cached file vectors.
+    """
+    with _lock:
+        _file_vectors.clear()
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
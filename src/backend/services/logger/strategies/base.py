@@ -8,6 +8,9 @@ class BaseLogger:
     @abstractmethod
     def setup(self, ctx: Any, **kwargs: Any) -> Any: ...
 
+    @abstractmethod
+    def is_enabled_for(self, level: int) -> bool: ...
+
     @abstractmethod
     def info(self, **kwargs: Any) -> Any: ...
 
@@ -28,3 +31,12 @@ class BaseLogger:
 
     @abstractmethod
     def exception(self, **kwargs: Any) -> Any: ...
+
+    @abstractmethod
+    def bind(self, **kwargs: Any) -> Any: ...
+
+    @abstractmethod
+    def unbind(self, *args: Any) -> Any: ...
+
+    @abstractmethod
+    def clear_context(self) -> Any: ...
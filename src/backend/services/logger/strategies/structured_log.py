@@ -1,3 +1,4 @@
+import functools
 import logging
 from typing import Any, Dict
 
@@ -6,28 +7,35 @@ from fastapi import HTTPException, status
 
 from backend.services.logger.strategies.base import BaseLogger
 
+CONTEXT_LOG_EXCLUDED_KEYS = {"request", "response", "receive", "logger", "span"}
 
-def log_context(func):
-    def wrapper(self, **kwargs):
-        ctx = kwargs.get("ctx")
-        if ctx:
-            kwargs["ctx"] = get_context_log(ctx)
-        return func(self, **kwargs)
 
-    return wrapper
+def log_context(level: int):
+    """
+    Skip log calls below the configured level before doing any work, and serialize the
+    `ctx` argument only for records that are actually emitted.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, **kwargs):
+            if level < self.level:
+                return None
+
+            ctx = kwargs.get("ctx")
+            if ctx:
+                kwargs["ctx"] = get_context_log(ctx)
+            return func(self, **kwargs)
+
+        return wrapper
+
+    return decorator
 
 
 def get_context_log(ctx: Any) -> dict:
     """
     Remove private attributes from context and return a dictionary.
     """
-    ctx_dict = ctx.model_dump()
-
-    keys_to_remove = ["request", "response", "receive", "logger"]
-    for key in keys_to_remove:
-        ctx_dict.pop(key, None)
-
-    return ctx_dict
+    return ctx.model_dump(exclude=CONTEXT_LOG_EXCLUDED_KEYS)
 
 
 def add_module(
@@ -46,11 +54,13 @@ class StructuredLogging(BaseLogger):
         self.logger = structlog.get_logger()
 
     def setup(self, level: str = "info", renderer: str = "json"):
-        level = getattr(logging, level.upper(), None)
+        self.level = getattr(logging, level.upper(), logging.INFO)
 
         structlog.contextvars.clear_contextvars()
 
         shared_processors = [
+            # Adds the request's context bound with `bind`
+            structlog.contextvars.merge_contextvars,
             structlog.processors.add_log_level,
             add_module,
             structlog.processors.TimeStamper(fmt="iso"),
@@ -73,45 +83,52 @@ class StructuredLogging(BaseLogger):
 
         structlog.configure(
             processors=processors,
-            wrapper_class=structlog.make_filtering_bound_logger(level),
+            wrapper_class=structlog.make_filtering_bound_logger(self.level),
             cache_logger_on_first_use=True,  # Remove this line to make changes to the logger
         )
 
-    @log_context
+    def is_enabled_for(self, level: int) -> bool:
+        return level >= self.level
+
+    @log_context(logging.INFO)
     def info(self, **kwargs):
         self.logger.info(**kwargs)
 
-    @log_context
+    @log_context(logging.ERROR)
     def error(self, **kwargs):
         self.logger.error(**kwargs)
 
-    @log_context
     def error_and_raise_http_exception(self, **kwargs):
-        self.logger.error(**kwargs)
+        self.error(**kwargs)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"{kwargs}",
         )
 
-    @log_context
+    @log_context(logging.WARNING)
     def warning(self, **kwargs):
         self.logger.warning(**kwargs)
 
-    @log_context
+    @log_context(logging.DEBUG)
     def debug(self, **kwargs):
         self.logger.debug(**kwargs)
 
-    @log_context
+    @log_context(logging.CRITICAL)
     def critical(self, **kwargs):
         self.logger.critical(**kwargs)
 
-    @log_context
+    @log_context(logging.ERROR)
     def exception(self, **kwargs):
         self.logger.exception(**kwargs)
 
-    @log_context
     def bind(self, **kwargs):
-        self.logger = self.logger.bind(**kwargs)
+        """
+        Bind values to every record logged in the current context, e.g. the current request.
+        """
+        structlog.contextvars.bind_contextvars(**kwargs)
 
     def unbind(self, *args):
-        self.logger = self.logger.unbind(*args)
+        structlog.contextvars.unbind_contextvars(*args)
+
+    def clear_context(self):
+        structlog.contextvars.clear_contextvars()
@@ -2,21 +2,29 @@ from backend.config.settings import Settings
 from backend.services.logger.strategies.base import BaseLogger
 from backend.services.logger.strategies.structured_log import StructuredLogging
 
+_logger: BaseLogger | None = None
 
-class LoggerFactory:
-    def __init__(self):
-        self.logger = None
 
+class LoggerFactory:
     def get_logger(self) -> BaseLogger:
-        if self.logger is not None:
-            return self.logger
+        """
+        Get the process-wide logger, configured on first use.
+
+        Returns:
+            BaseLogger: The logger
+        """
+        global _logger
+        if _logger is not None:
+            return _logger
 
         strategy = Settings().get('logger.strategy')
         level = Settings().get('logger.level')
         renderer = Settings().get('logger.renderer')
 
         if strategy == "structlog":
-            return StructuredLogging(level, renderer)
+            _logger = StructuredLogging(level, renderer)
         else:
             # Default to StructuredLogging
-            return StructuredLogging(level, renderer)
+            _logger = StructuredLogging(level, renderer)
+
+        return _logger
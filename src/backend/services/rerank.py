@@ -0,0 +1,182 @@
+"""
+Cached and coalesced reranking.
+
+Relevance scores are cached per deployment, query and document content, so a document set
+reranked again (across the steps of an agent, or by several callers) only sends the
+documents that were not scored yet to the deployment. Concurrent reranks of the same query
+and uncached documents share a single deployment call. The token counters documents are
+chunked with are fetched once per deployment.
+"""
+
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable
+
+from backend.config.settings import Settings
+from backend.model_deployments.base import BaseDeployment
+from backend.schemas.context import Context
+
+RERANK_CACHE_MAX_ENTRIES = Settings().get("deployments.rerank_cache_max_entries") or 0
+
+_scores: "OrderedDict[tuple[str, str, str], float]" = OrderedDict()
+_in_flight: dict[tuple[str, str, tuple[str, ...]], asyncio.Future] = {}
+_lock = threading.Lock()
+# Fetching a counter can call the deployment's API, the approximation a deployment falls
+# back to is kept too
+_token_counters: dict[tuple[str, str | None], Callable[[str], int]] = {}
+
+
+async def invoke_rerank(
+    model: BaseDeployment, query: str, documents: list[str], ctx: Context
+) -> Any:
+    """
+    Rerank documents with a deployment, reusing the cached relevance scores.
+
+    Args:
+        model (BaseDeployment): The deployment to rerank with
+        query (str): The query
+        documents (list[str]): The documents to rerank
+        ctx (Context): Context object
+
+    Returns:
+        Any: The rerank response, with `results` holding the index and relevance score of
+            the scored documents, by decreasing relevance. The deployment's response if it
+            returned none.
+    """
+    if RERANK_CACHE_MAX_ENTRIES <= 0:
+        return await model.invoke_rerank(query=query, documents=documents, ctx=ctx)
+
+    deployment_id = model.id()
+    document_hashes = [_hash(document) for document in documents]
+    scores = _get_scores(deployment_id, query, document_hashes)
+
+    # Each distinct uncached document is only sent once
+    missing = {}
+    for index, (document_hash, score) in enumerate(zip(document_hashes, scores)):
+        if score is None and document_hash not in missing:
+            missing[document_hash] = index
+
+    if missing:
+        response, new_scores = await _rerank_coalesced(
+            model,
+            query,
+            [documents[index] for index in missing.values()],
+            tuple(missing),
+            ctx,
+        )
+        if not response:
+            return response
+
+        scores = [
+            new_scores.get(document_hash) if score is None else score
+            for document_hash, score in zip(document_hashes, scores)
+        ]
+
+    results = [
+        {"index": index, "relevance_score": score}
+        for index, score in enumerate(scores)
+        if score is not None
+    ]
+    results.sort(key=lambda result: result["relevance_score"], reverse=True)
+    return {"results": results}
+
+
+async def get_rerank_token_counter(
+    model: BaseDeployment, ctx: Context
+) -> Callable[[str], int]:
+    """
+    Get the token counter of a deployment's rerank model.
+
+    Args:
+        model (BaseDeployment): The deployment to rerank with
+        ctx (Context): Context object
+
+    Returns:
+        Callable[[str], int]: Counts the tokens of a text
+    """
+    key = (model.id(), model.rerank_model())
+    with _lock:
+        count_tokens = _token_counters.get(key)
+    if count_tokens is None:
+        count_tokens = await model.get_token_counter(model.rerank_model(), ctx)
+        with _lock:
+            _token_counters[key] = count_tokens
+    return count_tokens
+
+
+def clear_rerank_cache() -> None:
+    """
+    Drop the cached relevance scores and token counters.
+    """
+    with _lock:
+        _scores.clear()
+        _token_counters.clear()
+
+
+async def _rerank_coalesced(
+    model: BaseDeployment,
+    query: str,
+    documents: list[str],
+    document_hashes: tuple[str, ...],
+    ctx: Context,
+) -> tuple[Any, dict[str, float]]:
+    key = (model.id(), query, document_hashes)
+    future = _in_flight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(
+            _rerank_and_cache(model, query, documents, document_hashes, ctx)
+        )
+        _in_flight[key] = future
+        future.add_done_callback(lambda _: _in_flight.pop(key, None))
+
+    # A cancelled caller does not cancel the rerank shared with the others
+    return await asyncio.shield(future)
+
+
+async def _rerank_and_cache(
+    model: BaseDeployment,
+    query: str,
+    documents: list[str],
+    document_hashes: tuple[str, ...],
+    ctx: Context,
+) -> tuple[Any, dict[str, float]]:
+    response = await model.invoke_rerank(query=query, documents=documents, ctx=ctx)
+    if not response:
+        return response, {}
+
+    new_scores = {
+        document_hashes[result["index"]]: result["relevance_score"]
+        for result in response.get("results", [])
+    }
+    _put_scores(model.id(), query, new_scores)
+    return response, new_scores
+
+
+def _get_scores(
+    deployment_id: str, query: str, document_hashes: list[str]
+) -> list[float | None]:
+    scores = []
+    with _lock:
+        for document_hash in document_hashes:
+            key = (deployment_id, query, document_hash)
+            score = _scores.get(key)
+            if score is not None:
+                _scores.move_to_end(key)
+            scores.append(score)
+    return scores
+
+
+def _put_scores(deployment_id: str, query: str, scores: dict[str, float]) -> None:
+    with _lock:
+        for document_hash, score in scores.items():
+            key = (deployment_id, query, document_hash)
+            _scores[key] = score
+            _scores.move_to_end(key)
+        while len(_scores) > RERANK_CACHE_MAX_ENTRIES:
+            _scores.popitem(last=False)
+
+
+def _hash(document: str) -> str:
+    return hashlib.sha256(document.encode()).hexdigest()
@@ -0,0 +1,322 @@
+"""
+Latency tracing of requests and of the stages of a chat turn.
+
+Spans follow the OpenTelemetry data model: they share the trace ID of the request context,
+reference their parent span, and are exported in the OTLP/JSON format so any OpenTelemetry
+backend can read them. The request span is the context's span, stages started with
+`start_span` are its children unless another parent is given.
+
+When tracing.enabled is not set, `start_span` returns a no-op span and tracing costs
+nothing but the function call.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import secrets
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any
+
+from backend.config.settings import Settings
+from backend.services.logger.utils import LoggerFactory
+
+TRACING_ENABLED = Settings().get("tracing.enabled")
+TRACING_EXPORT_PATH = Settings().get("tracing.export_path") or "./traces/traces.jsonl"
+TRACING_FLUSH_INTERVAL = 5
+SERVICE_NAME = "toolkit-backend"
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+logger = LoggerFactory().get_logger()
+
+
+class Span:
+    """
+    A timed operation of a trace. Spans are context managers, leaving the block ends the
+    span and records the exception raised in it, if any.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_span_id: str | None = None,
+        kind: int = SPAN_KIND_INTERNAL,
+        attributes: dict[str, Any] | None = None,
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent_span_id
+        self.kind = kind
+        self.attributes: dict[str, Any] = dict(attributes or {})
+        self.events: list[tuple[str, int, dict[str, Any]]] = []
+        self.status_code = STATUS_UNSET
+        self.status_message = ""
+        self.start_time_ns = time.time_ns()
+        self.end_time_ns: int | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def add_event(self, name: str, **attributes: Any) -> None:
+        self.events.append((name, time.time_ns(), attributes))
+
+    def record_exception(self, exception: BaseException) -> None:
+        self.status_code = STATUS_ERROR
+        self.status_message = str(exception) or exception.__class__.__name__
+        self.add_event(
+            "exception",
+            **{
+                "exception.type": exception.__class__.__name__,
+                "exception.message": str(exception),
+            },
+        )
+
+    def end(self) -> None:
+        if self.end_time_ns is not None:
+            return
+
+        self.end_time_ns = time.time_ns()
+        get_span_exporter().export(self)
+
+    @property
+    def duration_ms(self) -> float:
+        end_time_ns = self.end_time_ns or time.time_ns()
+        return (end_time_ns - self.start_time_ns) / 1e6
+
+    def to_otlp(self) -> dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_time_ns),
+            "endTimeUnixNano": str(self.end_time_ns or self.start_time_ns),
+            "attributes": _to_otlp_attributes(self.attributes),
+            "events": [
+                {
+                    "name": name,
+                    "timeUnixNano": str(time_ns),
+                    "attributes": _to_otlp_attributes(attributes),
+                }
+                for name, time_ns, attributes in self.events
+            ],
+            "status": {"code": self.status_code},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        return span
+
+    def __enter__(self) -> "Span":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        # A generator closed by its consumer did not fail
+        if exc_value is not None and not isinstance(exc_value, GeneratorExit):
+            self.record_exception(exc_value)
+        self.end()
+
+
+class NoOpSpan(Span):
+    """
+    Span returned while tracing is disabled, it records and exports nothing.
+    """
+
+    def __init__(self):
+        self.name = ""
+        self.trace_id = ""
+        self.span_id = ""
+        self.parent_span_id = None
+        self.attributes = {}
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def add_event(self, name: str, **attributes: Any) -> None:
+        pass
+
+    def record_exception(self, exception: BaseException) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+    @property
+    def duration_ms(self) -> float:
+        return 0.0
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        pass
+
+
+NOOP_SPAN = NoOpSpan()
+
+
+def start_span(
+    ctx: Any,
+    name: str,
+    parent: Span | None = None,
+    kind: int = SPAN_KIND_INTERNAL,
+    **attributes: Any,
+) -> Span:
+    """
+    Start a span of the request's trace.
+
+    Args:
+        ctx (Context): The request context, its trace ID is the span's trace ID
+        name (str): The span name
+        parent (Span | None): The parent span, defaults to the context's span
+        kind (int): The OTLP span kind
+        **attributes (Any): The span attributes
+
+    Returns:
+        Span: The started span, use it as a context manager or call `end`
+    """
+    if not TRACING_ENABLED:
+        return NOOP_SPAN
+
+    parent = parent or (ctx.get_span() if ctx is not None else None)
+    if parent is not None and parent.trace_id:
+        trace_id, parent_span_id = parent.trace_id, parent.span_id
+    else:
+        trace_id, parent_span_id = to_otlp_trace_id(ctx.get_trace_id() if ctx else None), None
+
+    return Span(name, trace_id, parent_span_id, kind, attributes)
+
+
+def to_otlp_trace_id(trace_id: str | None) -> str:
+    """
+    Convert a request trace ID to the 32 hexadecimal characters of an OTLP trace ID.
+    """
+    if not trace_id:
+        return secrets.token_hex(16)
+
+    try:
+        return uuid.UUID(trace_id).hex
+    except ValueError:
+        return hashlib.md5(trace_id.encode()).hexdigest()
+
+
+class OTLPJsonFileExporter:
+    """
+    Buffers finished spans in memory, a background thread appends them to the export file
+    as OTLP/JSON export requests, one per line, so ending a span never writes to disk.
+    """
+
+    def __init__(self, filename: str = TRACING_EXPORT_PATH, flush_interval: float = TRACING_FLUSH_INTERVAL):
+        self.filename = filename
+        self.flush_interval = flush_interval
+        self.spans: deque[Span] = deque()
+        self._flusher: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+        self._start_flusher()
+
+    def flush(self) -> None:
+        """
+        Append the buffered spans to the export file.
+        """
+        spans: list[Span] = []
+        while self.spans:
+            spans.append(self.spans.popleft())
+        if not spans:
+            return
+
+        export_request = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": _to_otlp_attributes({"service.name": SERVICE_NAME})
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": __name__},
+                            "spans": [span.to_otlp() for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        with self._lock:
+            os.makedirs(os.path.dirname(self.filename) or ".", exist_ok=True)
+            with open(self.filename, mode="a") as f:
+                f.write(json.dumps(export_request) + "\n")
+
+    def _start_flusher(self) -> None:
+        if self._flusher is not None:
+            return
+
+        with self._lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._flush_periodically, name="tracing-flusher", daemon=True
+                )
+                self._flusher.start()
+                # Write what is left in the buffer on shutdown
+                atexit.register(self.flush)
+
+    def _flush_periodically(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                # Never let a failed write stop the flusher, the batch is dropped
+                logger.warning(event="[Tracing] Error exporting spans", error=str(e))
+
+
+_exporter: OTLPJsonFileExporter | None = None
+_exporter_lock = threading.Lock()
+
+
+def get_span_exporter() -> OTLPJsonFileExporter:
+    global _exporter
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                _exporter = OTLPJsonFileExporter()
+    return _exporter
+
+
+def set_span_exporter(exporter: OTLPJsonFileExporter | None) -> None:
+    """
+    Replace the process-wide span exporter, None creates a default one on next use.
+    """
+    global _exporter
+    with _exporter_lock:
+        _exporter = exporter
+
+
+def _to_otlp_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    return [
+        {"key": key, "value": _to_otlp_value(value)}
+        for key, value in attributes.items()
+        if value is not None
+    ]
+
+
+def _to_otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # 64-bit integers are strings in OTLP/JSON
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_to_otlp_value(item) for item in value]}}
+    return {"stringValue": str(value)}
@@ -12,3 +12,19 @@ def validate_transaction(func):
             raise e
 
     return wrapper
+
+
+def validate_async_transaction(func):
+    async def wrapper(*args, **kwargs):
+        if "db" in kwargs:
+            db = kwargs["db"]
+        else:
+            db = args[0]
+
+        try:
+            return await func(*args, **kwargs)
+        except Exception as e:
+            await db.rollback()
+            raise e
+
+    return wrapper
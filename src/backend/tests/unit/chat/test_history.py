@@ -0,0 +1,67 @@
+from backend.chat.history import pack_chat_history
+from backend.schemas.chat import ChatMessage, ChatRole
+from backend.schemas.cohere_chat import CohereChatRequest
+
+
+def count_words(text: str) -> int:
+    return len(text.split())
+
+
+def tool_message(text: str) -> dict:
+    return {
+        "role": "TOOL",
+        "tool_results": [
+            {"call": {"name": "web_search"}, "outputs": [{"text": text}]}
+        ],
+    }
+
+
+def get_chat_request(chat_history: list, **kwargs) -> CohereChatRequest:
+    chat_request = CohereChatRequest(message="", **kwargs)
+    # Set like the chat history of a model response, without validation
+    chat_request.chat_history = chat_history
+    return chat_request
+
+
+def get_chat_history() -> list:
+    return [
+        ChatMessage(role=ChatRole.SYSTEM, message="Answer in English"),
+        ChatMessage(role=ChatRole.USER, message="Who climbed Everest first?"),
+        {"role": "CHATBOT", "tool_calls": [{"name": "web_search"}]},
+        tool_message("word " * 1000),
+        ChatMessage(role=ChatRole.CHATBOT, message="Tenzing Norgay and Edmund Hillary"),
+        ChatMessage(role=ChatRole.USER, message="And K2?"),
+        {"role": "CHATBOT", "tool_calls": [{"name": "web_search"}]},
+        tool_message("word " * 100),
+    ]
+
+
+def test_pack_chat_history_within_budget() -> None:
+    chat_history = get_chat_history()
+    chat_request = get_chat_request(chat_history)
+
+    assert pack_chat_history(chat_request, 10_000, count_words) == chat_history
+
+
+def test_pack_chat_history_compresses_older_tool_outputs() -> None:
+    chat_history = get_chat_history()
+    chat_request = get_chat_request(chat_history)
+
+    packed = pack_chat_history(chat_request, 500, count_words)
+
+    assert len(packed) == len(chat_history)
+    assert packed[3]["tool_results"][0]["outputs"][0]["text"] == "word " * 40 + "..."
+    # The latest turn and the request are not modified
+    assert packed[7] == chat_history[7]
+    assert chat_request.chat_history[3] == tool_message("word " * 1000)
+
+
+def test_pack_chat_history_drops_oldest_turns() -> None:
+    chat_history = get_chat_history()
+    chat_request = get_chat_request(
+        chat_history, tool_results=[{"outputs": ["word " * 100]}]
+    )
+
+    packed = pack_chat_history(chat_request, 200, count_words)
+
+    assert packed == [chat_history[0]] + chat_history[5:]
@@ -0,0 +1,45 @@
+from backend.chat.step_state import ChatStepState
+from backend.schemas.chat import ChatMessage, ChatRole
+from backend.schemas.cohere_chat import CohereChatRequest
+from backend.schemas.tool import Tool
+
+EXCLUDE = {"stream", "file_ids", "agent_id"}
+
+
+def get_chat_request() -> CohereChatRequest:
+    return CohereChatRequest(
+        message="Who climbed Everest first?",
+        preamble="Answer in English",
+        chat_history=[ChatMessage(role=ChatRole.USER, message="Hello")],
+        tools=[Tool(name="web_search", parameter_definitions={"query": {"type": "str"}})],
+    )
+
+
+def test_dump_matches_model_dump() -> None:
+    chat_request = get_chat_request()
+
+    assert ChatStepState().dump(chat_request, exclude=EXCLUDE) == chat_request.model_dump(
+        exclude=EXCLUDE
+    )
+
+
+def test_dump_serializes_static_fields_and_messages_once() -> None:
+    chat_request = get_chat_request()
+    step_state = ChatStepState()
+    first_step = step_state.dump(chat_request, exclude=EXCLUDE)
+
+    # The next step sends the model's history with the tool results
+    tool_results = [{"call": {"name": "web_search"}, "outputs": [{"text": "Tenzing"}]}]
+    chat_request.chat_history = chat_request.chat_history + [
+        {"role": "USER", "message": "Who climbed Everest first?"},
+        {"role": "CHATBOT", "tool_calls": [{"name": "web_search"}]},
+    ]
+    chat_request.message = ""
+    chat_request.tool_results = tool_results
+    second_step = step_state.dump(chat_request, exclude=EXCLUDE)
+
+    assert second_step["tools"] is first_step["tools"]
+    assert second_step["chat_history"][0] is first_step["chat_history"][0]
+    assert second_step["chat_history"][1:] == chat_request.chat_history[1:]
+    assert second_step["tool_results"] is tool_results
+    assert second_step["message"] == ""
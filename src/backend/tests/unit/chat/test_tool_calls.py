@@ -3,9 +3,13 @@ from typing import Any, Dict, List
 from unittest.mock import patch
 
 import pytest
-from fastapi import HTTPException
 
-from backend.chat.custom.tool_calls import async_call_tools
+from backend.chat.custom.tool_calls import (
+    SpeculativeToolCalls,
+    _call_all_tools_async,
+    async_call_tools,
+)
+from backend.chat.enums import StreamEvent
 from backend.config.tools import Tool
 from backend.schemas.tool import ToolCategory, ToolDefinition
 from backend.services.context import Context
@@ -160,12 +164,20 @@ def test_async_call_tools_timeout(mock_get_available_tools) -> None:
     ]
     mock_get_available_tools.return_value = {Tool.Calculator.value.ID: MockCalculator.get_tool_definition()}
 
-    with pytest.raises(HTTPException) as excinfo:
-        asyncio.run(async_call_tools(chat_history, MockCohereDeployment(), ctx))
-    assert str(excinfo.value.status_code) == "500"
-    assert (
-        str(excinfo.value.detail) == "Timeout while calling tools with timeout: 1"
-        )
+    results = asyncio.run(async_call_tools(chat_history, MockCohereDeployment(), ctx))
+    assert results == [
+        {
+            "call": {"name": "toolkit_calculator", "parameters": {"code": "6*7"}},
+            "outputs": [
+                {
+                    "type": "timeout",
+                    "success": False,
+                    "text": "Tool call timed out toolkit_calculator.",
+                    "details": "The tool did not respond within 1 seconds",
+                }
+            ],
+        }
+    ]
 
 
 def test_async_call_tools_failure_and_success(mock_get_available_tools) -> None:
@@ -388,3 +400,168 @@ def test_tools_params_checker_required_param_empty(mock_get_available_tools) ->
     assert {'call': {'name': 'toolkit_calculator', 'parameters': {'code': ''}}, 'outputs': [
         {'details': 'Model passed empty value for required parameter: code', 'success': False,
          'text': 'Error calling tool toolkit_calculator.', 'type': 'other'}]} in results
+
+
+class MockSlowCalculator(BaseTool):
+    ID = "toolkit_calculator"
+    calls: list[str] = []
+    cancelled: list[str] = []
+    running = 0
+    max_running = 0
+    # Set when a call starts, tests wait on it instead of sleeping
+    started = asyncio.Event()
+
+    @classmethod
+    def get_tool_definition(cls) -> ToolDefinition:
+        return ToolDefinition(
+            name=cls.ID,
+            display_name="Calculator",
+            implementation=cls,
+            parameter_definitions={
+                "code": {
+                    "description": "The expression for the calculator to evaluate.",
+                    "type": "str",
+                    "required": True,
+                }
+            },
+            is_visible=False,
+            is_available=True,
+            category=ToolCategory.Function,
+            error_message=cls.generate_error_message(),
+            description="A calculator.",
+        )
+
+    async def call(
+        self, parameters: dict, ctx: Any, **kwargs: Any
+    ) -> List[Dict[str, Any]]:
+        cls = self.__class__
+        cls.calls.append(parameters["code"])
+        cls.started.set()
+        cls.running += 1
+        cls.max_running = max(cls.max_running, cls.running)
+        try:
+            await asyncio.sleep(5 if parameters["code"] == "sleep" else 0.05)
+        except asyncio.CancelledError:
+            cls.cancelled.append(parameters["code"])
+            raise
+        finally:
+            cls.running -= 1
+        return [{"result": parameters["code"]}]
+
+
+def tool_call_chunk(index: int, name: str | None = None, parameters: str | None = None) -> dict:
+    return {
+        "event_type": StreamEvent.TOOL_CALLS_CHUNK,
+        "tool_call_delta": {"index": index, "name": name, "parameters": parameters},
+    }
+
+
+@pytest.fixture
+def slow_calculator(mock_get_available_tools):
+    MockSlowCalculator.calls = []
+    MockSlowCalculator.cancelled = []
+    MockSlowCalculator.running = 0
+    MockSlowCalculator.max_running = 0
+    MockSlowCalculator.started = asyncio.Event()
+    mock_get_available_tools.return_value = {
+        Tool.Calculator.value.ID: MockSlowCalculator.get_tool_definition()
+    }
+
+
+@pytest.fixture
+def speculative_tool_calls(slow_calculator):
+    speculative_tool_calls = SpeculativeToolCalls(None, MockCohereDeployment(), Context())
+    yield speculative_tool_calls
+    speculative_tool_calls.cancel()
+
+
+@pytest.mark.asyncio
+async def test_speculative_tool_calls_start_when_parameters_are_complete(speculative_tool_calls) -> None:
+    for event in [
+        {"event_type": StreamEvent.STREAM_START},
+        tool_call_chunk(0, name="toolkit_calculator"),
+        tool_call_chunk(0, parameters='{"code": '),
+        tool_call_chunk(0, parameters='"6*7"}'),
+        tool_call_chunk(1, name="toolkit_calculator"),
+    ]:
+        speculative_tool_calls.handle_event(event)
+    await asyncio.wait_for(MockSlowCalculator.started.wait(), timeout=5)
+    # The first tool call started before the second one is complete
+    assert MockSlowCalculator.calls == ["6*7"]
+
+    tool_calls = [
+        {"name": "toolkit_calculator", "parameters": {"code": "6*7"}},
+        {"name": "toolkit_calculator", "parameters": {"code": "1+1"}},
+    ]
+    speculative_tool_calls.handle_event(
+        {"event_type": StreamEvent.TOOL_CALLS_GENERATION, "tool_calls": tool_calls}
+    )
+    results = await speculative_tool_calls.join(tool_calls)
+
+    assert MockSlowCalculator.calls == ["6*7", "1+1"]
+    assert speculative_tool_calls.joined == 2
+    assert results == [
+        {"call": tool_calls[0], "outputs": [{"result": "6*7"}]},
+        {"call": tool_calls[1], "outputs": [{"result": "1+1"}]},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_speculative_tool_calls_not_kept_are_cancelled(speculative_tool_calls) -> None:
+    speculative_tool_calls.handle_event(tool_call_chunk(0, "toolkit_calculator", '{"code": "6*7"}'))
+    speculative_tool_calls.handle_event(tool_call_chunk(1, "toolkit_calculator"))
+    [started] = speculative_tool_calls._tasks.values()
+
+    tool_calls = [{"name": "toolkit_calculator", "parameters": {"code": "6*8"}}]
+    results = await speculative_tool_calls.join(tool_calls)
+    # Let the cancelled task finish
+    await asyncio.wait([started])
+
+    assert started.cancelled()
+    assert speculative_tool_calls.joined == 0
+    assert results == [{"call": tool_calls[0], "outputs": [{"result": "6*8"}]}]
+
+
+@pytest.mark.asyncio
+async def test_speculative_tool_calls_with_invalid_parameters_do_not_start(speculative_tool_calls) -> None:
+    speculative_tool_calls.handle_event(
+        {
+            "event_type": StreamEvent.TOOL_CALLS_GENERATION,
+            "tool_calls": [{"name": "toolkit_calculator", "parameters": {"code": 6}}],
+        }
+    )
+
+    # No task was started for the tool call
+    assert speculative_tool_calls._tasks == {}
+    assert MockSlowCalculator.calls == []
+
+
+@pytest.mark.asyncio
+@patch("backend.chat.custom.tool_calls.TOOL_CALL_TIMEOUTS", {"toolkit_calculator": 0.5})
+async def test_tool_calls_timeout_per_tool_with_partial_results(slow_calculator) -> None:
+    tool_calls = [
+        {"name": "toolkit_calculator", "parameters": {"code": "6*7"}},
+        {"name": "toolkit_calculator", "parameters": {"code": "sleep"}},
+    ]
+
+    results = await _call_all_tools_async(None, tool_calls, MockCohereDeployment(), Context())
+
+    assert results[0] == {"call": tool_calls[0], "outputs": [{"result": "6*7"}]}
+    assert results[1]["call"] == tool_calls[1]
+    assert results[1]["outputs"][0]["type"] == "timeout"
+    assert MockSlowCalculator.cancelled == ["sleep"]
+
+
+@pytest.mark.asyncio
+@patch("backend.chat.custom.tool_calls.TOOL_CALL_MAX_CONCURRENCY", {"toolkit_calculator": 2})
+async def test_tool_calls_concurrency_limited_per_tool(slow_calculator) -> None:
+    tool_calls = [
+        {"name": "toolkit_calculator", "parameters": {"code": f"{n}+1"}} for n in range(5)
+    ]
+
+    results = await _call_all_tools_async(None, tool_calls, MockCohereDeployment(), Context())
+
+    assert MockSlowCalculator.max_running == 2
+    assert [result["outputs"] for result in results] == [
+        [{"result": f"{n}+1"}] for n in range(5)
+    ]
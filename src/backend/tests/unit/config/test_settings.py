@@ -0,0 +1,48 @@
+import pytest
+from pydantic import ValidationError
+
+from backend.config.settings import Settings
+
+
+@pytest.fixture
+def restore_settings():
+    yield
+    Settings.reload()
+
+
+def test_settings_are_cached() -> None:
+    assert Settings() is Settings()
+
+
+def test_settings_are_read_only() -> None:
+    with pytest.raises(ValidationError):
+        Settings().redis = None
+
+
+def test_settings_get() -> None:
+    settings = Settings()
+
+    assert settings.get("tools.result_cache.max_entries") == settings.tools.result_cache.max_entries
+    assert settings.get("tools.missing.path") is None
+    # Memoized lookups return the same value
+    assert settings.get("tools.missing.path") is None
+
+
+def test_settings_reload(restore_settings, monkeypatch) -> None:
+    settings = Settings()
+    monkeypatch.setenv("REDIS_MAX_CONNECTIONS", "7")
+
+    assert Settings().get("redis.max_connections") == settings.get("redis.max_connections")
+
+    reloaded = Settings.reload()
+
+    assert reloaded is not settings
+    assert Settings() is reloaded
+    assert Settings().get("redis.max_connections") == 7
+
+
+def test_settings_with_values_are_not_cached() -> None:
+    settings = Settings(metrics={"enabled": True})
+
+    assert settings is not Settings()
+    assert settings.get("metrics.enabled") is True
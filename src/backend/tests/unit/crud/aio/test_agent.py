@@ -0,0 +1,57 @@
+import pytest
+
+from backend.crud.aio import agent as agent_crud
+from backend.database_models.agent import Agent
+from backend.schemas.agent import AgentVisibility, UpdateAgentDB
+
+
+@pytest.mark.asyncio
+async def test_create_and_get_agent(async_session, async_user):
+    await agent_crud.create_agent(
+        async_session,
+        Agent(id="1", name="test", user_id=async_user.id, is_private=True),
+    )
+    async_session.expunge_all()
+
+    agent = await agent_crud.get_agent_by_id(async_session, "1", async_user.id)
+    assert agent.name == "test"
+    assert agent.tools_metadata == []
+    assert agent.model is None
+
+    assert await agent_crud.get_agent_by_id(async_session, "1", "other") is None
+    assert await agent_crud.get_agent_by_name(async_session, "test", "other") is None
+
+
+@pytest.mark.asyncio
+async def test_get_agents_visibility(async_session, async_user):
+    async_session.add_all([
+        Agent(id="1", name="public", user_id=async_user.id, is_private=False),
+        Agent(id="2", name="private", user_id=async_user.id, is_private=True),
+    ])
+    await async_session.commit()
+
+    agents = await agent_crud.get_agents(
+        async_session, "other", visibility=AgentVisibility.ALL
+    )
+    assert [agent.name for agent in agents] == ["public"]
+
+    agents = await agent_crud.get_agents(
+        async_session, async_user.id, visibility=AgentVisibility.PRIVATE
+    )
+    assert [agent.name for agent in agents] == ["private"]
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_agent(async_session, async_user):
+    agent = await agent_crud.create_agent(
+        async_session, Agent(id="1", name="test", user_id=async_user.id)
+    )
+
+    agent = await agent_crud.update_agent(
+        async_session, agent, UpdateAgentDB(name="updated"), async_user.id
+    )
+    assert agent.name == "updated"
+
+    assert not await agent_crud.delete_agent(async_session, "1", "other")
+    assert await agent_crud.delete_agent(async_session, "1", async_user.id)
+    assert await agent_crud.get_agent_by_id(async_session, "1", async_user.id) is None
@@ -0,0 +1,75 @@
+import pytest
+
+from backend.crud.aio import conversation as conversation_crud
+from backend.database_models.conversation import Conversation
+from backend.database_models.message import Message, MessageAgent
+from backend.database_models.organization import Organization
+from backend.schemas.context import Context
+from backend.schemas.conversation import UpdateConversationRequest
+from backend.services.context import GLOBAL_REQUEST_CONTEXT
+
+
+@pytest.mark.asyncio
+async def test_create_and_get_conversation(async_session, async_user):
+    conversation = await conversation_crud.create_conversation(
+        async_session, Conversation(id="1", title="Hello", user_id=async_user.id)
+    )
+    async_session.add(
+        Message(
+            text="Hi",
+            user_id=async_user.id,
+            conversation_id=conversation.id,
+            position=0,
+            agent=MessageAgent.USER,
+        )
+    )
+    await async_session.commit()
+    async_session.expunge_all()
+
+    conversation = await conversation_crud.get_conversation(async_session, "1", async_user.id)
+    assert conversation.title == "Hello"
+    # Relationships are eagerly loaded, no lazy load is needed
+    assert [message.text for message in conversation.messages] == ["Hi"]
+    assert conversation.messages[0].documents == []
+    assert conversation.file_ids == []
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_conversation(async_session, async_user):
+    conversation = await conversation_crud.create_conversation(
+        async_session, Conversation(id="1", title="Hello", user_id=async_user.id)
+    )
+
+    conversation = await conversation_crud.update_conversation(
+        async_session,
+        conversation,
+        UpdateConversationRequest(title="Updated", user_id=async_user.id),
+    )
+    assert conversation.title == "Updated"
+
+    await conversation_crud.delete_conversation(async_session, "1", async_user.id)
+    assert await conversation_crud.get_conversation(async_session, "1", async_user.id) is None
+
+
+@pytest.mark.asyncio
+async def test_get_conversations_applies_global_filters(async_session, async_user):
+    organization = Organization(id="org", name="Org")
+    async_session.add(organization)
+    await async_session.commit()
+    await conversation_crud.create_conversation(
+        async_session, Conversation(id="1", user_id=async_user.id, organization_id="org")
+    )
+    await conversation_crud.create_conversation(
+        async_session, Conversation(id="2", user_id=async_user.id)
+    )
+
+    context = Context()
+    context.with_organization_id("org")
+    context.with_global_filtering()
+    token = GLOBAL_REQUEST_CONTEXT.set(context)
+    try:
+        conversations = await conversation_crud.get_conversations(async_session, async_user.id)
+    finally:
+        GLOBAL_REQUEST_CONTEXT.reset(token)
+
+    assert [conversation.id for conversation in conversations] == ["1"]
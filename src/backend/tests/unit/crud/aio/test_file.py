@@ -0,0 +1,65 @@
+import pytest
+
+from backend.crud.aio import file as file_crud
+from backend.database_models.conversation import (
+    Conversation,
+    ConversationFileAssociation,
+)
+from backend.database_models.file import File
+
+
+@pytest.mark.asyncio
+async def test_batch_create_and_get_files(async_session, async_user):
+    files = await file_crud.batch_create_files(
+        async_session,
+        [
+            File(file_name="test.txt", file_size=100, user_id=async_user.id),
+            File(file_name="test2.txt", file_size=100, user_id=async_user.id),
+        ],
+    )
+    assert len(files) == 2
+
+    files = await file_crud.get_files_by_ids(
+        async_session, [file.id for file in files], async_user.id
+    )
+    assert sorted(file.file_name for file in files) == ["test.txt", "test2.txt"]
+
+    files = await file_crud.get_files_by_file_names(
+        async_session, ["test.txt"], async_user.id
+    )
+    assert [file.file_name for file in files] == ["test.txt"]
+
+
+@pytest.mark.asyncio
+async def test_delete_file(async_session, async_user):
+    file = await file_crud.create_file(
+        async_session,
+        File(file_name="test.txt", file_size=100, user_id=async_user.id),
+    )
+
+    await file_crud.delete_file(async_session, file.id, async_user.id)
+
+    assert await file_crud.get_file(async_session, file.id, async_user.id) is None
+
+
+@pytest.mark.asyncio
+async def test_get_files_by_conversation_ids(async_session, async_user):
+    file = await file_crud.create_file(
+        async_session,
+        File(file_name="test.txt", file_size=100, user_id=async_user.id),
+    )
+    async_session.add(Conversation(id="1", user_id=async_user.id))
+    async_session.add(Conversation(id="2", user_id=async_user.id))
+    await async_session.commit()
+    async_session.add(
+        ConversationFileAssociation(
+            conversation_id="1", user_id=async_user.id, file_id=file.id
+        )
+    )
+    await async_session.commit()
+
+    pairs = await file_crud.get_files_by_conversation_ids(
+        async_session, ["1", "2"], async_user.id
+    )
+
+    assert [(conversation_id, f.id) for conversation_id, f in pairs] == [("1", file.id)]
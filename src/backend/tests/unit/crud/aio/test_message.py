@@ -0,0 +1,61 @@
+import pytest
+
+from backend.crud.aio import message as message_crud
+from backend.database_models.conversation import Conversation
+from backend.database_models.message import Message, MessageAgent
+from backend.database_models.tool_call import ToolCall
+
+
+@pytest.fixture
+def conversation(async_session, async_user):
+    conversation = Conversation(id="1", user_id=async_user.id)
+    async_session.add(conversation)
+    return conversation
+
+
+@pytest.mark.asyncio
+async def test_create_and_get_message(async_session, async_user, conversation):
+    message = await message_crud.create_message(
+        async_session,
+        Message(
+            id="1",
+            text="Hello",
+            user_id=async_user.id,
+            conversation_id=conversation.id,
+            position=0,
+            agent=MessageAgent.CHATBOT,
+            tool_calls=[ToolCall(name="web_search", parameters={"query": "cohere"})],
+        ),
+    )
+    assert message.text == "Hello"
+    async_session.expunge_all()
+
+    message = await message_crud.get_conversation_message(
+        async_session, "1", "1", async_user.id
+    )
+    assert message.text == "Hello"
+    assert [tool_call.name for tool_call in message.tool_calls] == ["web_search"]
+    assert message.file_ids == []
+
+
+@pytest.mark.asyncio
+async def test_delete_messages(async_session, async_user, conversation):
+    for i in range(3):
+        async_session.add(
+            Message(
+                id=str(i),
+                text=f"Message {i}",
+                user_id=async_user.id,
+                conversation_id=conversation.id,
+                position=i,
+                agent=MessageAgent.USER,
+            )
+        )
+    await async_session.commit()
+
+    await message_crud.delete_messages(async_session, ["0", "1"], async_user.id)
+
+    messages = await message_crud.get_messages_by_conversation_id(
+        async_session, conversation.id, async_user.id
+    )
+    assert [message.id for message in messages] == ["2"]
@@ -60,6 +60,20 @@ def test_get_file(session, user):
     assert file.id == "1"
 
 
+def test_get_file_defers_content(session, user):
+    _ = get_factory("File", session).create(
+        id="1", file_name="test.txt", file_content="hello world", user_id=user.id
+    )
+    session.expunge_all()
+
+    file = file_crud.get_file(session, "1", user.id)
+    assert "file_content" not in file.__dict__
+    session.expunge_all()
+
+    file = file_crud.get_file(session, "1", user.id, with_content=True)
+    assert file.__dict__["file_content"] == "hello world"
+
+
 def test_fail_get_nonexistent_file(session, user):
     file = file_crud.get_file(session, "123", user.id)
     assert file is None
@@ -110,6 +124,35 @@ def test_list_files_by_user_id_empty(session, user):
     assert len(files) == 0
 
 
+def test_get_files_by_conversation_ids(session, user):
+    get_factory("Conversation", session).create(id="2", user_id=user.id)
+    file = get_factory("File", session).create(
+        id="1", file_name="test.txt", file_content="content", user_id=user.id
+    )
+    file2 = get_factory("File", session).create(
+        id="2", file_name="test2.txt", user_id=user.id
+    )
+    for conversation_id, file_id in [("1", file.id), ("2", file.id), ("2", file2.id)]:
+        get_factory("ConversationFileAssociation", session).create(
+            conversation_id=conversation_id, file_id=file_id, user_id=user.id
+        )
+    session.expunge_all()
+
+    results = file_crud.get_files_by_conversation_ids(session, ["1", "2"], user.id)
+
+    assert sorted((conversation_id, file.id) for conversation_id, file in results) == [
+        ("1", "1"),
+        ("2", "1"),
+        ("2", "2"),
+    ]
+    assert all("file_content" not in file.__dict__ for _, file in results)
+
+
+def test_get_files_by_conversation_ids_empty(session, user):
+    assert file_crud.get_files_by_conversation_ids(session, [], user.id) == []
+    assert file_crud.get_files_by_conversation_ids(session, ["1"], user.id) == []
+
+
 def test_delete_file(session, user):
     file = get_factory("File", session).create(file_name="test.txt", user_id=user.id)
 
@@ -0,0 +1,53 @@
+from backend.crud import file_chunk as file_chunk_crud
+from backend.database_models.file_chunk import FileChunk
+from backend.tests.unit.factories import get_factory
+
+
+def test_search_file_chunks(session, user):
+    file = get_factory("File", session).create(id="1", user_id=user.id)
+    file_chunk_crud.batch_create_file_chunks(
+        session,
+        [
+            FileChunk(file_id=file.id, position=0, text="The cat sat on the mat."),
+            FileChunk(file_id=file.id, position=1, text="Quarterly revenue grew by ten percent."),
+            FileChunk(file_id=file.id, position=2, text="Revenue and profit were both up, revenue most."),
+        ],
+    )
+
+    chunks = file_chunk_crud.search_file_chunks(session, ["1"], user.id, "What was the revenue?")
+
+    assert [chunk.position for chunk in chunks] == [2, 1]
+
+
+def test_search_file_chunks_matches_any_term(session, user):
+    file = get_factory("File", session).create(id="1", user_id=user.id)
+    file_chunk_crud.batch_create_file_chunks(
+        session, [FileChunk(file_id=file.id, position=0, text="Cats are great pets.")]
+    )
+
+    chunks = file_chunk_crud.search_file_chunks(session, ["1"], user.id, "cat revenue")
+
+    assert [chunk.text for chunk in chunks] == ["Cats are great pets."]
+
+
+def test_search_file_chunks_other_user(session, user):
+    file = get_factory("File", session).create(id="1", user_id=user.id)
+    file_chunk_crud.batch_create_file_chunks(
+        session, [FileChunk(file_id=file.id, position=0, text="Cats are great pets.")]
+    )
+
+    assert file_chunk_crud.search_file_chunks(session, ["1"], "other", "cats") == []
+
+
+def test_get_chunked_file_ids(session, user):
+    get_factory("File", session).create(id="1", user_id=user.id)
+    get_factory("File", session).create(id="2", user_id=user.id)
+    file_chunk_crud.batch_create_file_chunks(
+        session,
+        [
+            FileChunk(file_id="1", position=0, text="First chunk."),
+            FileChunk(file_id="1", position=1, text="Second chunk."),
+        ],
+    )
+
+    assert file_chunk_crud.get_chunked_file_ids(session, ["1", "2"]) == {"1"}
@@ -48,6 +48,41 @@ def test_fail_get_nonexistent_message(session, user):
     assert message is None
 
 
+def test_get_last_message_position(session, conversation, user):
+    for position, is_active in [(0, True), (1, True), (2, False)]:
+        get_factory("Message", session).create(
+            conversation_id=conversation.id,
+            user_id=user.id,
+            position=position,
+            is_active=is_active,
+        )
+
+    position = message_crud.get_last_message_position(session, conversation.id, user.id)
+    assert position == 1
+
+
+def test_get_last_message_position_no_messages(session, conversation, user):
+    position = message_crud.get_last_message_position(session, conversation.id, user.id)
+    assert position is None
+
+
+def test_get_chat_history_messages(session, conversation, user):
+    for position, text in enumerate(["Hi", "Hello", "", "How are you?", "Fine", "Bye"]):
+        get_factory("Message", session).create(
+            text=text, conversation_id=conversation.id, user_id=user.id, position=position
+        )
+
+    messages = message_crud.get_chat_history_messages(
+        session, conversation.id, user.id, before_position=5, limit=3
+    )
+    assert [message.text for message in messages] == ["Hello", "How are you?", "Fine"]
+
+    messages = message_crud.get_chat_history_messages(
+        session, conversation.id, user.id, before_position=5
+    )
+    assert [message.text for message in messages] == ["Hi", "Hello", "How are you?", "Fine"]
+
+
 def test_get_conversation_message(session, conversation, user):
     _ = get_factory("Message", session).create(
         id="1", text="Hello, World!", conversation_id=conversation.id, user_id=user.id
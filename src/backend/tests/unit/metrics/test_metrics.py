@@ -0,0 +1,92 @@
+import csv
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.metrics.middleware import MetricsCollector, RequestMetricsMiddleware
+from backend.metrics.registry import MetricsRegistry, request_latency
+
+
+def test_counter_render() -> None:
+    registry = MetricsRegistry()
+    counter = registry.counter("lookups", "Lookups.", ("tool", "result"))
+
+    counter.inc(tool="wikipedia", result="hit")
+    counter.inc(tool="wikipedia", result="hit")
+    counter.inc(tool="arxiv", result="miss")
+
+    assert counter.get(tool="wikipedia", result="hit") == 2
+    assert registry.render().splitlines() == [
+        "# HELP lookups Lookups.",
+        "# TYPE lookups counter",
+        'lookups_total{tool="wikipedia",result="hit"} 2',
+        'lookups_total{tool="arxiv",result="miss"} 1',
+    ]
+
+
+def test_histogram_render() -> None:
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1))
+
+    histogram.observe(0.05, route="/chat")
+    histogram.observe(0.1, route="/chat")
+    histogram.observe(3, route="/chat")
+
+    assert histogram.get_count(route="/chat") == 3
+    assert registry.render().splitlines() == [
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/chat",le="0.1"} 2',
+        'latency_seconds_bucket{route="/chat",le="1"} 2',
+        'latency_seconds_bucket{route="/chat",le="+Inf"} 3',
+        'latency_seconds_sum{route="/chat"} 3.15',
+        'latency_seconds_count{route="/chat"} 3',
+    ]
+
+
+def test_label_values_are_escaped() -> None:
+    registry = MetricsRegistry()
+    registry.counter("errors", "Errors.", ("message",)).inc(message='say "hi"\n')
+
+    assert 'errors_total{message="say \\"hi\\"\\n"} 1' in registry.render()
+
+
+def test_collector_buffers_until_flushed(tmp_path) -> None:
+    filename = tmp_path / "metrics" / "metrics.csv"
+    collector = MetricsCollector(filename=str(filename), flush_interval=3600)
+
+    collector.add_metric("request", "/v1/chat-stream", 0.5)
+    collector.add_metric("call", "tool_call", 0.1, class_name="Calculator")
+
+    assert not filename.exists()
+
+    collector.save_to_csv()
+
+    with open(filename) as f:
+        rows = list(csv.DictReader(f))
+    assert [row["name"] for row in rows] == ["/v1/chat-stream", "tool_call"]
+    assert len(collector.metrics) == 0
+
+
+def test_request_metrics_middleware_records_route_template() -> None:
+    app = FastAPI()
+    app.add_middleware(RequestMetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: str):
+        return {"id": item_id}
+
+    labels = {
+        "method": "GET",
+        "route": "/items/{item_id}",
+        "status_code": "200",
+        "deployment": "",
+        "model": "",
+    }
+    count = request_latency.get_count(**labels)
+
+    client = TestClient(app)
+    client.get("/items/1")
+    client.get("/items/2")
+
+    assert request_latency.get_count(**labels) == count + 2
@@ -1,4 +1,6 @@
+import hashlib
 import random
+import re
 from typing import Any, Generator
 
 from cohere.types import StreamedChatResponse
@@ -31,6 +33,10 @@ class MockCohereDeployment(MockDeployment):
     def rerank_enabled() -> bool:
         return True
 
+    @staticmethod
+    def embed_model() -> str | None:
+        return "embed-english-v3.0"
+
     @classmethod
     def list_models(cls) -> list[str]:
         return cls.DEFAULT_MODELS
@@ -96,5 +102,19 @@ class MockCohereDeployment(MockDeployment):
         }
         return event
 
+    async def invoke_embed(
+        self, texts: list[str], input_type: str, ctx: Context, **kwargs: Any
+    ) -> list[list[float]]:
+        # Feature hashing, texts sharing words get similar embeddings
+        embeddings = []
+        for text in texts:
+            embedding = [0.0] * 256
+            for token in re.findall(r"\w+", text.lower()):
+                digest = hashlib.md5(token.encode()).digest()
+                index = int.from_bytes(digest[:4], "little") % len(embedding)
+                embedding[index] += 1.0 if digest[4] & 1 else -1.0
+            embeddings.append(embedding)
+        return embeddings
+
 # Overriding the name so that the proper deployment is selected
 MockCohereDeployment.__name__ = "CohereDeployment"
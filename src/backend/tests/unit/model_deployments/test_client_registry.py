@@ -0,0 +1,51 @@
+import pytest
+
+from backend.model_deployments import client_registry
+from backend.model_deployments.client_registry import get_client, invalidate_clients
+
+
+@pytest.fixture(autouse=True)
+def clear_registry():
+    invalidate_clients()
+    yield
+    invalidate_clients()
+
+
+def test_get_client_reuses_client_for_same_config() -> None:
+    first = get_client("CohereDeployment", {"api_key": "key"}, object)
+    second = get_client("CohereDeployment", {"api_key": "key"}, object)
+
+    assert first is second
+
+
+def test_get_client_new_client_for_different_config() -> None:
+    first = get_client("CohereDeployment", {"api_key": "key"}, object)
+    second = get_client("CohereDeployment", {"api_key": "other-key"}, object)
+
+    assert first is not second
+
+
+def test_get_client_keyed_by_deployment_class() -> None:
+    first = get_client("CohereDeployment", {"api_key": "key"}, object)
+    second = get_client("AzureDeployment", {"api_key": "key"}, object)
+
+    assert first is not second
+
+
+def test_invalidate_clients_by_deployment_class() -> None:
+    cohere_client = get_client("CohereDeployment", {"api_key": "key"}, object)
+    azure_client = get_client("AzureDeployment", {"api_key": "key"}, object)
+
+    invalidate_clients("CohereDeployment")
+
+    assert get_client("CohereDeployment", {"api_key": "key"}, object) is not cohere_client
+    assert get_client("AzureDeployment", {"api_key": "key"}, object) is azure_client
+
+
+def test_get_client_evicts_least_recently_used(monkeypatch) -> None:
+    monkeypatch.setattr(client_registry, "MAX_POOLED_CLIENTS", 2)
+    first = get_client("CohereDeployment", {"api_key": "1"}, object)
+    get_client("CohereDeployment", {"api_key": "2"}, object)
+    get_client("CohereDeployment", {"api_key": "3"}, object)
+
+    assert get_client("CohereDeployment", {"api_key": "1"}, object) is not first
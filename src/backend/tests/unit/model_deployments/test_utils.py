@@ -0,0 +1,73 @@
+import asyncio
+import threading
+
+from backend.model_deployments.utils import (
+    approximate_token_count,
+    run_sync_client,
+    stream_sync_client,
+)
+
+
+def test_run_sync_client_inline() -> None:
+    def call(value: int) -> tuple[int, int]:
+        return value, threading.get_ident()
+
+    value, thread_id = asyncio.run(run_sync_client(call, 42))
+
+    assert value == 42
+    assert thread_id == threading.get_ident()
+
+
+def test_run_sync_client_offloaded() -> None:
+    def call(value: int) -> tuple[int, int]:
+        return value, threading.get_ident()
+
+    value, thread_id = asyncio.run(run_sync_client(call, 42, offload=True))
+
+    assert value == 42
+    assert thread_id != threading.get_ident()
+
+
+def test_stream_sync_client_offloaded() -> None:
+    thread_ids = set()
+
+    def stream(count: int):
+        for i in range(count):
+            thread_ids.add(threading.get_ident())
+            yield {"index": i}
+
+    async def collect():
+        return [event async for event in stream_sync_client(stream, 3, offload=True)]
+
+    events = asyncio.run(collect())
+
+    assert events == [{"index": 0}, {"index": 1}, {"index": 2}]
+    assert threading.get_ident() not in thread_ids
+
+
+def test_stream_sync_client_does_not_block_event_loop() -> None:
+    release = threading.Event()
+
+    def stream():
+        release.wait(timeout=5)
+        yield "done"
+
+    async def unblock():
+        release.set()
+        return "unblocked"
+
+    async def run():
+        async def collect():
+            return [event async for event in stream_sync_client(stream, offload=True)]
+
+        return await asyncio.gather(collect(), unblock())
+
+    events, unblocked = asyncio.run(run())
+
+    assert events == ["done"]
+    assert unblocked == "unblocked"
+
+
+def test_approximate_token_count() -> None:
+    assert approximate_token_count("") == 0
+    assert approximate_token_count("Mount Everest") == 4
@@ -3,22 +3,30 @@ from unittest.mock import patch
 import pytest
 
 from backend.config.auth import ENABLED_AUTH_STRATEGY_MAPPING
+from backend.config.settings import Settings
 
 
 @pytest.fixture(autouse=True)
-def mock_auth_secret_key_env(monkeypatch):
+def restore_settings():
+    yield
+    # Set up before the env is mocked, so this runs once it is restored
+    Settings.reload()
+
+
+@pytest.fixture(autouse=True)
+def mock_auth_secret_key_env(restore_settings, monkeypatch):
     monkeypatch.setenv("AUTH_SECRET_KEY", "test")
 
 
 @pytest.fixture(autouse=True)
-def mock_google_env(monkeypatch):
+def mock_google_env(restore_settings, monkeypatch):
     monkeypatch.setenv("GOOGLE_CLIENT_ID", "test")
     monkeypatch.setenv("GOOGLE_CLIENT_SECRET", "test")
     monkeypatch.setenv("FRONTEND_HOSTNAME", "http://localhost:4000")
 
 
 @pytest.fixture(autouse=True)
-def mock_oidc_env(monkeypatch):
+def mock_oidc_env(restore_settings, monkeypatch):
     monkeypatch.setenv("OIDC_CLIENT_ID", "test")
     monkeypatch.setenv("OIDC_CLIENT_SECRET", "test")
     monkeypatch.setenv("OIDC_CONFIG_ENDPOINT", "test")
@@ -26,7 +34,13 @@ def mock_oidc_env(monkeypatch):
 
 
 @pytest.fixture(autouse=True)
-def mock_enabled_auth(mock_google_env, mock_oidc_env):
+def reload_settings(mock_auth_secret_key_env, mock_google_env, mock_oidc_env):
+    # Settings are cached per process, re-read them with the mocked env
+    Settings.reload()
+
+
+@pytest.fixture(autouse=True)
+def mock_enabled_auth(reload_settings):
     # Can directly use class since no external calls are made
     from backend.services.auth import BasicAuthentication, GoogleOAuth, OpenIDConnect
 
@@ -12,6 +12,8 @@ from backend.database_models.message import Message, MessageAgent
 from backend.database_models.user import User
 from backend.model_deployments.cohere_platform import CohereDeployment
 from backend.schemas.tool import ToolCategory
+from backend.services import tracing
+from backend.services.tracing import OTLPJsonFileExporter, set_span_exporter
 from backend.tests.unit.factories import get_factory
 from backend.tests.unit.model_deployments.mock_deployments.mock_cohere_platform import (
     MockCohereDeployment,
@@ -45,6 +47,56 @@ def test_streaming_new_chat(
     )
 
 
+def test_streaming_chat_traces_stages(
+    session_client_chat: TestClient,
+    session_chat: Session,
+    user: User,
+    mock_available_model_deployments: list[dict],
+    tmp_path,
+    monkeypatch,
+) -> None:
+    monkeypatch.setattr(tracing, "TRACING_ENABLED", True)
+    exporter = OTLPJsonFileExporter(str(tmp_path / "traces.jsonl"))
+    set_span_exporter(exporter)
+
+    try:
+        response = session_client_chat.post(
+            "/v1/chat-stream",
+            headers={
+                "User-Id": user.id,
+                "Deployment-Name": MockCohereDeployment.name(),
+            },
+            json={"message": "Hello", "max_tokens": 10},
+        )
+        exporter.flush()
+    finally:
+        set_span_exporter(None)
+
+    assert response.status_code == 200
+    with open(exporter.filename) as f:
+        spans = [
+            span
+            for line in f
+            for resource_spans in json.loads(line)["resourceSpans"]
+            for scope_spans in resource_spans["scopeSpans"]
+            for span in scope_spans["spans"]
+        ]
+    spans_by_name = {span["name"]: span for span in spans}
+    request_span = spans_by_name["POST /v1/chat-stream"]
+    for name in [
+        "chat.process_chat",
+        "chat.stream",
+        "chat.deployment_resolution",
+        "chat.model_step",
+        "chat.persistence",
+    ]:
+        assert spans_by_name[name]["traceId"] == request_span["traceId"]
+        assert spans_by_name[name]["parentSpanId"] == request_span["spanId"]
+    assert any(
+        event["name"] == "first_token" for event in spans_by_name["chat.stream"]["events"]
+    )
+
+
 def test_streaming_new_chat_with_agent(
     session_client_chat: TestClient,
     session_chat: Session,
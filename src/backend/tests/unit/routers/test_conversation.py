@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
@@ -34,6 +34,27 @@ def test_list_conversations(session_client: TestClient, session: Session, user)
     assert len(results) == 1
 
 
+def test_list_conversations_with_files(
+    session_client: TestClient, session: Session, user
+) -> None:
+    conversation = get_factory("Conversation", session).create(user_id=user.id)
+    get_factory("Conversation", session).create(user_id=user.id)
+    file = get_factory("File", session).create(file_name="test.txt", user_id=user.id)
+    get_factory("ConversationFileAssociation", session).create(
+        conversation_id=conversation.id, file_id=file.id, user_id=user.id
+    )
+
+    response = session_client.get("/v1/conversations", headers={"User-Id": user.id})
+    results = {result["id"]: result for result in response.json()}
+
+    assert response.status_code == 200
+    assert len(results) == 2
+    conversation_files = results[conversation.id]["files"]
+    assert [conversation_file["id"] for conversation_file in conversation_files] == [file.id]
+    assert conversation_files[0]["conversation_id"] == conversation.id
+    assert sum(len(result["files"]) for result in results.values()) == 1
+
+
 def test_list_conversations_with_agent(
     session_client: TestClient, session: Session, user
 ) -> None:
@@ -160,6 +181,37 @@ def test_get_conversation_lists_message_files(
     assert response_conversation["messages"][0]["files"][0]["id"] == file.id
 
 
+def test_get_conversation_lists_message_citations(
+    session_client: TestClient,
+    session: Session,
+    user: User,
+) -> None:
+    conversation = get_factory("Conversation", session).create(user_id=user.id)
+    message = get_factory("Message", session).create(
+        conversation_id=conversation.id,
+        user_id=user.id,
+        position=0,
+        is_active=True,
+        text="hello",
+    )
+    document = get_factory("Document", session).create(
+        conversation_id=conversation.id, message_id=message.id, user_id=user.id
+    )
+    _ = get_factory("Citation", session).create(
+        message_id=message.id, user_id=user.id, documents=[document]
+    )
+
+    response = session_client.get(
+        f"/v1/conversations/{conversation.id}",
+        headers={"User-Id": conversation.user_id},
+    )
+    response_conversation = response.json()
+
+    assert response.status_code == 200
+    # Citation documents are loaded up front by the async session
+    assert response_conversation["messages"][0]["citations"][0]["document_ids"] == [document.document_id]
+
+
 def test_get_organization_conversation_list(
     session_client: TestClient,
     session: Session,
@@ -672,6 +724,73 @@ def test_batch_upload_file_existing_conversation(
     assert len(files_stored) == len(file_paths)
 
 
+def test_batch_upload_file_indexes_files_in_background(
+    session_client: TestClient, session: Session, user
+) -> None:
+    conversation = get_factory("Conversation", session).create(user_id=user.id)
+
+    with patch("backend.routers.conversation.index_uploaded_files") as mock_index:
+        response = session_client.post(
+            "/v1/conversations/batch_upload_file",
+            headers={"User-Id": conversation.user_id},
+            files=[("files", ("notes.txt", b"Meeting notes."))],
+            data={"conversation_id": conversation.id},
+        )
+
+    assert response.status_code == 200
+    file_ids, _ = mock_index.call_args.args
+    assert file_ids == [file["id"] for file in response.json()]
+
+
+def test_batch_upload_file_too_large(
+    session_client: TestClient, session: Session, user, monkeypatch
+) -> None:
+    conversation = get_factory("Conversation", session).create(user_id=user.id)
+    monkeypatch.setattr("backend.services.file.MAX_FILE_SIZE", 10)
+
+    response = session_client.post(
+        "/v1/conversations/batch_upload_file",
+        headers={"User-Id": conversation.user_id},
+        files=[("files", ("notes.txt", b"Meeting notes."))],
+        data={"conversation_id": conversation.id},
+    )
+
+    assert response.status_code == 413
+    assert "larger than the maximum file size" in response.json()["detail"]
+
+
+def test_batch_upload_file_unsupported_extension(
+    session_client: TestClient, session: Session, user
+) -> None:
+    conversation = get_factory("Conversation", session).create(user_id=user.id)
+
+    response = session_client.post(
+        "/v1/conversations/batch_upload_file",
+        headers={"User-Id": conversation.user_id},
+        files=[("files", ("setup.exe", b"MZ"))],
+        data={"conversation_id": conversation.id},
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"] == "File extension exe is not supported"
+
+
+def test_batch_upload_file_corrupt_file(
+    session_client: TestClient, session: Session, user
+) -> None:
+    conversation = get_factory("Conversation", session).create(user_id=user.id)
+
+    response = session_client.post(
+        "/v1/conversations/batch_upload_file",
+        headers={"User-Id": conversation.user_id},
+        files=[("files", ("report.pdf", b"%PDF-1.4 truncated"))],
+        data={"conversation_id": conversation.id},
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"].startswith("File report.pdf could not be read")
+
+
 def test_batch_upload_file_nonexistent_conversation_creates_new_conversation(
     session_client: TestClient, session: Session, user
 ) -> None:
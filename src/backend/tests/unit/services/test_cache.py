@@ -1,6 +1,9 @@
+import time
+
 import pytest
 
 from backend.config.settings import Settings
+from backend.services import cache
 from backend.services.cache import get_client
 
 # skip if redis is not available
@@ -12,3 +15,92 @@ def test_redis_client():
     redis = get_client()
 
     assert redis.ping() is True
+
+
+@pytest.fixture
+def redis_backend(monkeypatch):
+    monkeypatch.setattr(cache, "get_redis_url", lambda: "redis://localhost:6379")
+    return cache.RedisCacheBackend()
+
+
+@pytest.fixture(params=["redis", "memory"])
+def cache_backend(request):
+    if request.param == "memory":
+        return cache.InMemoryCacheBackend()
+    return request.getfixturevalue("redis_backend")
+
+
+def test_get_client_is_pooled(redis_backend):
+    assert cache.get_client() is cache.get_client()
+
+
+def test_cache_backend_put_and_get(cache_backend):
+    cache_backend.put("key", "value")
+    cache_backend.put("hash", {"user_id": "1", "tool_id": "gmail"})
+
+    assert cache_backend.get("key") == "value"
+    assert cache_backend.get("missing") is None
+    assert cache_backend.get_dict("hash") == {"user_id": "1", "tool_id": "gmail"}
+    assert cache_backend.get_dict("missing") == {}
+
+
+def test_cache_backend_batch_operations(cache_backend):
+    cache_backend.put_many({"a": "1", "b": "2", "hash": {"field": "value"}})
+
+    assert cache_backend.mget(["a", "missing", "b"]) == ["1", None, "2"]
+    assert cache_backend.get_dicts(["hash", "missing"]) == [{"field": "value"}, {}]
+
+    cache_backend.delete("a", "hash")
+
+    assert cache_backend.mget(["a", "b"]) == [None, "2"]
+    assert cache_backend.get_dict("hash") == {}
+
+
+def test_cache_backend_ttl(cache_backend, redis_backend, mock_redis_client):
+    cache_backend.put("key", "value", ttl=60)
+    cache_backend.put("hash", {"field": "value"}, ttl=60)
+
+    if cache_backend is redis_backend:
+        assert 0 < mock_redis_client.ttl("key") <= 60
+        assert 0 < mock_redis_client.ttl("hash") <= 60
+    else:
+        assert cache_backend.get("key") == "value"
+        assert cache_backend.get_dict("hash") == {"field": "value"}
+
+
+def test_in_memory_cache_backend_expires_entries(monkeypatch):
+    backend = cache.InMemoryCacheBackend()
+    now = time.monotonic()
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now)
+    backend.put("key", "value", ttl=10)
+    backend.put("hash", {"field": "value"}, ttl=10)
+
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now + 11)
+
+    assert backend.get("key") is None
+    assert backend.get_dict("hash") == {}
+
+
+@pytest.mark.asyncio
+async def test_cache_backend_async_operations(cache_backend):
+    await cache_backend.async_put("key", "value")
+    await cache_backend.async_put("hash", {"field": "value"}, ttl=60)
+
+    assert await cache_backend.async_get("key") == "value"
+    assert await cache_backend.async_get_dict("hash") == {"field": "value"}
+
+    await cache_backend.async_delete("key", "hash")
+
+    assert await cache_backend.async_get("key") is None
+    assert cache_backend.get_dict("hash") == {}
+
+
+def test_get_cache_backend_memory(monkeypatch):
+    monkeypatch.setattr(
+        cache.Settings, "get", lambda self, path: "memory" if path == "redis.cache_backend" else None
+    )
+
+    backend = cache.get_cache_backend()
+
+    assert isinstance(backend, cache.InMemoryCacheBackend)
+    assert cache.get_cache_backend() is backend
@@ -1,14 +1,19 @@
 
 import pytest
 
-from backend.schemas.chat import EventState
+import backend.services.chat as chat_service
+from backend.schemas.chat import ChatRole, EventState
+from backend.schemas.cohere_chat import CohereChatRequest
 from backend.schemas.context import Context
 from backend.services.chat import (
     DEATHLOOP_SIMILARITY_THRESHOLDS,
     are_previous_actions_similar,
     check_death_loop,
     check_similarity,
+    create_chat_history,
+    get_next_message_position,
 )
+from backend.tests.unit.factories import get_factory
 
 
 def test_are_previous_actions_similar():
@@ -161,3 +166,30 @@ def test_check_no_death_loop():
 
     assert new_event_state.distances_plans[-1] < max(DEATHLOOP_SIMILARITY_THRESHOLDS)
     assert new_event_state.distances_actions[-1] < max(DEATHLOOP_SIMILARITY_THRESHOLDS)
+
+
+def test_create_chat_history_keeps_latest_messages(session, user, monkeypatch):
+    monkeypatch.setattr(chat_service, "CHAT_HISTORY_MAX_MESSAGES", 2)
+    conversation = get_factory("Conversation", session).create(user_id=user.id)
+    for position, (agent, text) in enumerate(
+        [("USER", "Hi"), ("CHATBOT", "Hello"), ("USER", "Bye"), ("CHATBOT", "Goodbye")]
+    ):
+        get_factory("Message", session).create(
+            text=text,
+            agent=agent,
+            conversation_id=conversation.id,
+            user_id=user.id,
+            position=position,
+            is_active=True,
+        )
+
+    position = get_next_message_position(session, conversation)
+    chat_history = create_chat_history(
+        session, conversation, position, CohereChatRequest(message="Hi again")
+    )
+
+    assert position == 4
+    assert [(message.role, message.message) for message in chat_history] == [
+        (ChatRole.USER, "Bye"),
+        (ChatRole.CHATBOT, "Goodbye"),
+    ]
@@ -0,0 +1,130 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from backend.database_models.conversation import Conversation
+from backend.database_models.document import Document
+from backend.database_models.message import Message, MessageAgent
+from backend.schemas.tool import ToolCall
+from backend.services.chat_persistence import ChatPersistenceBuffer
+from backend.tests.unit.factories import get_factory
+
+
+@pytest.fixture
+def conversation(session, user):
+    return get_factory("Conversation", session).create(user_id=user.id)
+
+
+def response_message(conversation, text="The answer") -> Message:
+    message = Message(
+        user_id=conversation.user_id,
+        conversation_id=conversation.id,
+        text=text,
+        position=0,
+        is_active=True,
+        agent=MessageAgent.CHATBOT,
+    )
+    message.documents = [
+        Document(
+            document_id="doc-1",
+            text="Document text",
+            title="Title",
+            url="https://example.com",
+            tool_name="web_search",
+            fields={},
+            user_id=conversation.user_id,
+            conversation_id=conversation.id,
+            message_id=message.id,
+        )
+    ]
+    return message
+
+
+def test_flush_persists_turn_in_single_commit(session, conversation):
+    buffer = ChatPersistenceBuffer(session)
+    tool_calls_message = buffer.add_tool_calls_message(
+        [ToolCall(name="web_search", parameters={"query": "test"})],
+        "I will search the web",
+        conversation.user_id,
+        0,
+        conversation.id,
+    )
+    message = response_message(conversation)
+    buffer.set_turn_result(message, conversation.id, "The answer", conversation.user_id)
+
+    with patch.object(session, "commit", wraps=session.commit) as mock_commit:
+        buffer.flush()
+
+    mock_commit.assert_called_once()
+    saved = session.query(Message).filter(Message.conversation_id == conversation.id).all()
+    assert {m.id for m in saved} == {tool_calls_message.id, message.id}
+    assert [tool_call.name for tool_call in tool_calls_message.tool_calls] == ["web_search"]
+    assert len(message.documents) == 1
+    assert tool_calls_message.created_at < message.created_at
+
+    session.refresh(conversation)
+    assert conversation.description == "The answer"
+
+
+def test_flush_deletes_previous_response_messages(session, conversation):
+    previous_id = get_factory("Message", session).create(
+        conversation_id=conversation.id, user_id=conversation.user_id, position=0
+    ).id
+    buffer = ChatPersistenceBuffer(session)
+    buffer.set_turn_result(
+        response_message(conversation), conversation.id, "The answer", conversation.user_id, [previous_id]
+    )
+
+    buffer.flush()
+
+    assert session.query(Message).filter(Message.id == previous_id).first() is None
+
+
+def test_add_tool_calls_message_flushes_at_checkpoint(session, conversation):
+    buffer = ChatPersistenceBuffer(session, checkpoint_size=2)
+    for i in range(2):
+        buffer.add_tool_calls_message(
+            [ToolCall(name="web_search", parameters={"query": str(i)})],
+            "",
+            conversation.user_id,
+            0,
+            conversation.id,
+        )
+
+    assert buffer.messages == []
+    assert session.query(Message).filter(Message.conversation_id == conversation.id).count() == 2
+
+
+def test_flush_without_pending_writes_does_nothing():
+    session = MagicMock()
+    ChatPersistenceBuffer(session).flush()
+
+    session.commit.assert_not_called()
+
+
+def test_flush_falls_back_to_individual_writes():
+    session = MagicMock()
+    session.commit.side_effect = Exception("Batch insert failed")
+    conversation = Conversation(id="conversation-id", user_id="user-id")
+    buffer = ChatPersistenceBuffer(session)
+    buffer.add_tool_calls_message(
+        [ToolCall(name="web_search", parameters={"query": "test"})],
+        "",
+        conversation.user_id,
+        0,
+        conversation.id,
+    )
+    buffer.set_turn_result(response_message(conversation), conversation.id, "The answer", conversation.user_id)
+
+    with (
+        patch("backend.crud.message.create_message", side_effect=lambda db, message: message) as mock_create_message,
+        patch("backend.crud.tool_call.create_tool_call") as mock_create_tool_call,
+        patch("backend.crud.conversation.get_conversation", return_value=conversation),
+        patch("backend.crud.conversation.update_conversation") as mock_update_conversation,
+    ):
+        buffer.flush()
+
+    session.rollback.assert_called_once()
+    assert mock_create_message.call_count == 2
+    mock_create_tool_call.assert_called_once()
+    mock_update_conversation.assert_called_once()
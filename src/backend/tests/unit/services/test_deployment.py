@@ -1,3 +1,4 @@
+import time
 from unittest.mock import patch
 
 import pytest
@@ -132,3 +133,71 @@ def test_update_config_no_db_deployments(session, mock_available_model_deploymen
         with patch("backend.services.deployment.get_deployment_definition", return_value=MockCohereDeployment.to_deployment_definition()):
             deployment_service.update_config(session, "some-deployment-id", {"API_KEY": "new-api-key"})
             mock_update_env_file.assert_called_with({"API_KEY": "new-api-key"})
+
+def test_update_config_invalidates_pooled_clients(session, db_deployment) -> None:
+    with patch("backend.services.deployment.invalidate_clients") as mock_invalidate_clients:
+        deployment_service.update_config(session, db_deployment.id, {"COHERE_API_KEY": "new-db-test-api-key"})
+        mock_invalidate_clients.assert_called_once_with(db_deployment.deployment_class_name)
+
+def test_get_deployment_definitions_cached(session, mock_available_model_deployments, clear_db_deployments) -> None:
+    with patch.object(MockCohereDeployment, "list_models", return_value=["command"]) as mock_list_models:
+        deployment_service.get_deployment_definitions(session)
+        deployment_service.get_deployment_definitions(session)
+
+    mock_list_models.assert_called_once()
+
+def test_get_deployment_definitions_returns_copies(session, mock_available_model_deployments, clear_db_deployments) -> None:
+    definitions = deployment_service.get_deployment_definitions(session)
+    for definition in definitions:
+        definition.config = {}
+
+    assert any(d.config for d in deployment_service.get_deployment_definitions(session))
+
+def test_invalidate_deployment_definitions(session, mock_available_model_deployments, clear_db_deployments) -> None:
+    with patch.object(MockCohereDeployment, "list_models", return_value=["command"]) as mock_list_models:
+        deployment_service.get_deployment_definitions(session)
+        deployment_service.invalidate_deployment_definitions()
+        deployment_service.get_deployment_definitions(session)
+
+    assert mock_list_models.call_count == 2
+
+def test_get_deployment_definitions_refreshes_expired_in_background(session, mock_available_model_deployments, clear_db_deployments) -> None:
+    cache = deployment_service.definitions_cache
+    deployment_service.get_deployment_definitions(session)
+    cache.installed_expires_at = 0
+
+    with patch.object(MockCohereDeployment, "list_models", return_value=["refreshed-model"]):
+        # Expired definitions are served while the refresh runs in the background
+        stale = deployment_service.get_deployment_definitions(session)
+        deadline = time.monotonic() + 5
+        while cache.refreshing and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    assert next(d for d in stale if d.name == MockCohereDeployment.name()).models != ["refreshed-model"]
+    assert cache.get_installed()[MockCohereDeployment.name()].models == ["refreshed-model"]
+
+def test_get_deployment_definition_by_name_sees_db_changes(session, mock_available_model_deployments, db_deployment) -> None:
+    deployment_service.get_deployment_definition_by_name(session, db_deployment.name)
+    # Changed by another worker, without invalidating this process's cache
+    session.query(Deployment).filter(Deployment.id == db_deployment.id).update(
+        {"default_deployment_config": {"COHERE_API_KEY": "rotated-api-key"}}
+    )
+    session.commit()
+
+    definition = deployment_service.get_deployment_definition_by_name(session, db_deployment.name)
+
+    assert definition.config == {"COHERE_API_KEY": "rotated-api-key"}
+
+def test_get_deployment_definition_by_name_created_concurrently(session, mock_available_model_deployments, db_deployment) -> None:
+    # The row was created by another worker between the lookup and the insert
+    with patch("backend.crud.deployment.get_deployment_by_name", side_effect=[None, db_deployment]):
+        definition = deployment_service.get_deployment_definition_by_name(session, db_deployment.name)
+
+    assert definition == DeploymentDefinition.from_db_deployment(db_deployment)
+
+def test_get_deployment_definition_by_name_builds_only_its_definition(session, mock_available_model_deployments, clear_db_deployments) -> None:
+    with patch.object(MockCohereDeployment, "list_models", return_value=["command"]) as mock_list_models:
+        definition = deployment_service.get_deployment_definition_by_name(session, MockAzureDeployment.name())
+
+    assert definition.name == MockAzureDeployment.name()
+    mock_list_models.assert_not_called()
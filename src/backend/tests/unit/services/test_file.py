@@ -0,0 +1,150 @@
+import asyncio
+import io
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+import backend.services.file as file_service
+from backend.services.file import (
+    MAX_FILE_SIZE,
+    ExtractionPool,
+    get_file_content,
+    insert_files_in_db,
+    recycle_extraction_pool,
+    validate_file_sizes,
+)
+from backend.services.file_extraction import FileExtractionError, extract_file_content
+
+
+def get_upload_file(file_name: str, contents: bytes, size: int | None = None) -> UploadFile:
+    return UploadFile(
+        file=io.BytesIO(contents),
+        filename=file_name,
+        size=len(contents) if size is None else size,
+    )
+
+
+def slow_extract_file_content(file_name: str, file_contents: bytes) -> str:
+    time.sleep(1)
+    return file_contents.decode("utf-8")
+
+
+def test_extract_file_content_text():
+    assert extract_file_content("notes.MD", b"# Notes") == "# Notes"
+
+
+def test_extract_file_content_unsupported_extension():
+    with pytest.raises(FileExtractionError, match="File extension exe is not supported"):
+        extract_file_content("setup.exe", b"")
+
+
+@pytest.mark.parametrize("file_name", ["report.pdf", "report.docx", "report.xlsx", "report.txt"])
+def test_extract_file_content_invalid_file(file_name):
+    with pytest.raises(FileExtractionError, match=f"File {file_name} could not be read"):
+        extract_file_content(file_name, b"\xff\xfe not a valid file")
+
+
+def test_validate_file_sizes_file_too_large():
+    with pytest.raises(HTTPException, match="larger than the maximum file size") as e:
+        validate_file_sizes([get_upload_file("big.txt", b"", size=MAX_FILE_SIZE + 1)])
+
+    assert e.value.status_code == 413
+
+
+def test_validate_file_sizes_total_too_large(monkeypatch):
+    monkeypatch.setattr(file_service, "MAX_TOTAL_FILE_SIZE", 10)
+
+    with pytest.raises(HTTPException, match="larger than the maximum total size") as e:
+        validate_file_sizes(
+            [get_upload_file("a.txt", b"123456"), get_upload_file("b.txt", b"123456")]
+        )
+
+    assert e.value.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_get_file_content_in_process_pool(monkeypatch):
+    monkeypatch.setattr(file_service, "EXTRACTION_WORKERS", 1)
+
+    try:
+        content = await get_file_content(get_upload_file("notes.txt", b"Hello world"))
+    finally:
+        file_service.shutdown_extraction_pool()
+
+    assert content == "Hello world"
+
+
+@pytest.mark.asyncio
+async def test_get_file_content_timeout(monkeypatch):
+    monkeypatch.setattr(file_service, "EXTRACTION_WORKERS", 0)
+    monkeypatch.setattr(file_service, "EXTRACTION_TIMEOUT", 0.1)
+    monkeypatch.setattr(file_service, "extract_file_content", slow_extract_file_content)
+
+    with pytest.raises(HTTPException, match="timed out") as e:
+        await get_file_content(get_upload_file("notes.txt", b"Hello world"))
+
+    assert e.value.status_code == 504
+
+
+@pytest.mark.asyncio
+async def test_get_file_content_timeout_excludes_queued_time(monkeypatch):
+    monkeypatch.setattr(file_service, "EXTRACTION_WORKERS", 1)
+    monkeypatch.setattr(file_service, "EXTRACTION_TIMEOUT", None)
+    monkeypatch.setattr(file_service, "extract_file_content", slow_extract_file_content)
+
+    try:
+        # The worker imports this module on its first job
+        await get_file_content(get_upload_file("warm_up.txt", b""))
+
+        # Each file takes 1 second, the second one waits for the first
+        monkeypatch.setattr(file_service, "EXTRACTION_TIMEOUT", 1.8)
+        contents = await asyncio.gather(
+            get_file_content(get_upload_file("a.txt", b"A")),
+            get_file_content(get_upload_file("b.txt", b"B")),
+        )
+    finally:
+        file_service.shutdown_extraction_pool()
+
+    assert contents == ["A", "B"]
+
+
+@pytest.mark.asyncio
+async def test_get_file_content_unsupported_extension(monkeypatch):
+    monkeypatch.setattr(file_service, "EXTRACTION_WORKERS", 0)
+
+    with pytest.raises(HTTPException, match="File extension exe is not supported") as e:
+        await get_file_content(get_upload_file("setup.exe", b""))
+
+    assert e.value.status_code == 422
+
+
+def test_recycle_extraction_pool_kills_stuck_worker(monkeypatch):
+    pool = ExtractionPool(1)
+    monkeypatch.setattr(file_service, "_extraction_pool", pool)
+    stuck_job = pool.submit(time.sleep, 60)
+
+    recycle_extraction_pool(pool, stuck_job)
+
+    # The stuck worker is killed, not waited for
+    assert isinstance(stuck_job.exception(timeout=30), BrokenProcessPool)
+    assert file_service._extraction_pool is None
+
+
+@pytest.mark.asyncio
+async def test_insert_files_in_db_keeps_file_order(session, user, monkeypatch):
+    monkeypatch.setattr(file_service, "EXTRACTION_WORKERS", 0)
+
+    files = await insert_files_in_db(
+        session,
+        [
+            get_upload_file("first.txt", b"first file"),
+            get_upload_file("second.csv", b"second,file"),
+            get_upload_file("third.md", b"third file"),
+        ],
+        user.id,
+    )
+
+    assert [file.file_name for file in files] == ["first.txt", "second.csv", "third.md"]
+    assert [file.preview for file in files] == ["first file", "second,file", "third file"]
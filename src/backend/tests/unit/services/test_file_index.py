@@ -0,0 +1,95 @@
+from unittest.mock import patch
+
+import pytest
+
+from backend.crud import file_chunk as file_chunk_crud
+from backend.database_models.file_chunk import FileChunk
+from backend.schemas.context import Context
+from backend.services.file_index import (
+    DeploymentEmbedder,
+    get_embedder,
+    index_files,
+    search_files,
+)
+from backend.tests.unit.factories import get_factory
+from backend.tests.unit.model_deployments.mock_deployments import (
+    MockCohereDeployment,
+)
+
+
+class CountingEmbedder(DeploymentEmbedder):
+    def __init__(self):
+        super().__init__(MockCohereDeployment(), Context())
+        self.embedded_texts = []
+
+    async def embed(self, texts, input_type):
+        self.embedded_texts.extend(texts)
+        return await super().embed(texts, input_type)
+
+
+@pytest.fixture
+def file(session, user):
+    file = get_factory("File", session).create(id="1", file_name="notes.txt", user_id=user.id)
+    file_chunk_crud.batch_create_file_chunks(
+        session,
+        [
+            FileChunk(file_id=file.id, position=0, text="The cat sat on the mat."),
+            FileChunk(file_id=file.id, position=1, text="Quarterly revenue grew by ten percent."),
+            FileChunk(file_id=file.id, position=2, text="The weather was sunny all week."),
+        ],
+    )
+    return file
+
+
+def test_get_embedder() -> None:
+    assert get_embedder(None, Context()) is None
+    assert isinstance(get_embedder(MockCohereDeployment(), Context()), DeploymentEmbedder)
+
+
+def test_get_embedder_deployment_cannot_embed() -> None:
+    with patch.object(MockCohereDeployment, "embed_model", return_value=None):
+        assert get_embedder(MockCohereDeployment(), Context()) is None
+
+
+@pytest.mark.asyncio
+async def test_search_files(session, file) -> None:
+    results = await search_files(
+        session,
+        [file.id],
+        "revenue growth this quarter",
+        DeploymentEmbedder(MockCohereDeployment(), Context()),
+        top_k=2,
+    )
+
+    assert len(results) == 2
+    assert results[0][0].text == "Quarterly revenue grew by ten percent."
+    assert results[0][1] >= results[1][1]
+
+
+@pytest.mark.asyncio
+async def test_search_files_never_re_embeds_chunks(session, file) -> None:
+    embedder = CountingEmbedder()
+
+    await search_files(session, [file.id], "revenue", embedder)
+    await search_files(session, [file.id], "weather", embedder)
+
+    assert embedder.embedded_texts == [
+        "The cat sat on the mat.",
+        "Quarterly revenue grew by ten percent.",
+        "The weather was sunny all week.",
+        "revenue",
+        "weather",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_index_files_only_embeds_new_chunks(session, file) -> None:
+    embedder = CountingEmbedder()
+    assert await index_files(session, [file.id], embedder) == 3
+
+    file_chunk_crud.batch_create_file_chunks(
+        session, [FileChunk(file_id=file.id, position=3, text="A new chunk.")]
+    )
+
+    assert await index_files(session, [file.id], embedder) == 1
+    assert embedder.embedded_texts[-1] == "A new chunk."
@@ -0,0 +1,59 @@
+import logging
+from unittest.mock import MagicMock
+
+import structlog
+
+from backend.services.logger.strategies.structured_log import StructuredLogging
+from backend.services.logger.utils import LoggerFactory
+
+
+def test_get_logger_is_singleton() -> None:
+    assert LoggerFactory().get_logger() is LoggerFactory().get_logger()
+
+
+def test_filtered_log_does_not_serialize_context() -> None:
+    logger = LoggerFactory().get_logger()
+    ctx = MagicMock()
+    original_level = logger.level
+    logger.level = logging.INFO
+
+    try:
+        logger.debug(event="Filtered", ctx=ctx)
+    finally:
+        logger.level = original_level
+
+    ctx.model_dump.assert_not_called()
+
+
+def test_emitted_log_serializes_context() -> None:
+    logger = LoggerFactory().get_logger()
+    ctx = MagicMock()
+    ctx.model_dump.return_value = {"trace_id": "trace"}
+
+    logger.error(event="Emitted", ctx=ctx)
+
+    ctx.model_dump.assert_called_once()
+    assert "request" in ctx.model_dump.call_args.kwargs["exclude"]
+
+
+def test_is_enabled_for() -> None:
+    logger = StructuredLogging.__new__(StructuredLogging)
+    logger.level = logging.WARNING
+
+    assert not logger.is_enabled_for(logging.DEBUG)
+    assert not logger.is_enabled_for(logging.INFO)
+    assert logger.is_enabled_for(logging.WARNING)
+    assert logger.is_enabled_for(logging.ERROR)
+
+
+def test_bind_uses_contextvars() -> None:
+    logger = LoggerFactory().get_logger()
+
+    logger.bind(trace_id="trace", user_id="user")
+    assert structlog.contextvars.get_contextvars() == {"trace_id": "trace", "user_id": "user"}
+
+    logger.unbind("user_id")
+    assert structlog.contextvars.get_contextvars() == {"trace_id": "trace"}
+
+    logger.clear_context()
+    assert structlog.contextvars.get_contextvars() == {}
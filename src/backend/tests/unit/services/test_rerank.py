@@ -0,0 +1,88 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from backend.schemas.context import Context
+from backend.services import rerank as rerank_service
+from backend.services.rerank import invoke_rerank
+from backend.tests.unit.model_deployments.mock_deployments import MockCohereDeployment
+
+
+class CountingRerankDeployment(MockCohereDeployment):
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.calls: list[list[str]] = []
+
+    async def invoke_rerank(
+        self, query: str, documents: list[str], ctx: Context, **kwargs: Any
+    ) -> Any:
+        self.calls.append(documents)
+        await asyncio.sleep(0.01)
+        return {
+            "results": [
+                {"index": index, "relevance_score": 1 / len(document)}
+                for index, document in enumerate(documents)
+            ]
+        }
+
+
+@pytest.mark.asyncio
+async def test_rerank_only_sends_uncached_documents() -> None:
+    model = CountingRerankDeployment(model_config={})
+
+    await invoke_rerank(model, "mountain", ["Everest", "K2"], Context())
+    response = await invoke_rerank(model, "mountain", ["K2", "Everest", "Denali"], Context())
+
+    assert model.calls == [["Everest", "K2"], ["Denali"]]
+    assert response == {
+        "results": [
+            {"index": 0, "relevance_score": 1 / 2},
+            {"index": 2, "relevance_score": 1 / 6},
+            {"index": 1, "relevance_score": 1 / 7},
+        ]
+    }
+
+
+@pytest.mark.asyncio
+async def test_rerank_cached_per_query() -> None:
+    model = CountingRerankDeployment(model_config={})
+
+    await invoke_rerank(model, "mountain", ["Everest"], Context())
+    await invoke_rerank(model, "peak", ["Everest"], Context())
+
+    assert len(model.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reranks_are_coalesced() -> None:
+    model = CountingRerankDeployment(model_config={})
+
+    responses = await asyncio.gather(
+        *[invoke_rerank(model, "mountain", ["Everest", "K2"], Context()) for _ in range(3)]
+    )
+
+    assert model.calls == [["Everest", "K2"]]
+    assert responses[0] == responses[1] == responses[2]
+
+
+@pytest.mark.asyncio
+async def test_rerank_cache_disabled(monkeypatch) -> None:
+    monkeypatch.setattr(rerank_service, "RERANK_CACHE_MAX_ENTRIES", 0)
+    model = CountingRerankDeployment(model_config={})
+
+    await invoke_rerank(model, "mountain", ["Everest"], Context())
+    await invoke_rerank(model, "mountain", ["Everest"], Context())
+
+    assert len(model.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_rerank_cache_evicts_least_recently_used(monkeypatch) -> None:
+    monkeypatch.setattr(rerank_service, "RERANK_CACHE_MAX_ENTRIES", 2)
+    model = CountingRerankDeployment(model_config={})
+
+    await invoke_rerank(model, "mountain", ["Everest", "K2", "Denali"], Context())
+    await invoke_rerank(model, "mountain", ["Everest"], Context())
+
+    assert model.calls[-1] == ["Everest"]
@@ -0,0 +1,113 @@
+import json
+import time
+import uuid
+
+import pytest
+
+from backend.metrics import inter_token_latency, time_to_first_token
+from backend.schemas.context import Context
+from backend.services import tracing
+from backend.services.chat import record_token_latency
+from backend.services.tracing import (
+    NOOP_SPAN,
+    STATUS_ERROR,
+    OTLPJsonFileExporter,
+    set_span_exporter,
+    start_span,
+)
+
+
+@pytest.fixture
+def exporter(tmp_path, monkeypatch):
+    monkeypatch.setattr(tracing, "TRACING_ENABLED", True)
+    exporter = OTLPJsonFileExporter(str(tmp_path / "traces" / "traces.jsonl"))
+    set_span_exporter(exporter)
+    yield exporter
+    set_span_exporter(None)
+
+
+def read_spans(exporter: OTLPJsonFileExporter) -> list[dict]:
+    exporter.flush()
+    with open(exporter.filename) as f:
+        export_requests = [json.loads(line) for line in f]
+    return [
+        span
+        for export_request in export_requests
+        for resource_spans in export_request["resourceSpans"]
+        for scope_spans in resource_spans["scopeSpans"]
+        for span in scope_spans["spans"]
+    ]
+
+
+def get_context() -> Context:
+    ctx = Context()
+    ctx.with_trace_id(str(uuid.uuid4()))
+    return ctx
+
+
+def test_start_span_disabled() -> None:
+    span = start_span(get_context(), "chat.stream")
+
+    assert span is NOOP_SPAN
+    with span:
+        span.set_attribute("chat.step", 1)
+
+
+def test_spans_share_the_context_trace(exporter) -> None:
+    ctx = get_context()
+    request_span = start_span(ctx, "POST /v1/chat-stream")
+    ctx.with_span(request_span)
+
+    with start_span(ctx, "chat.model_step", **{"chat.step": 1}) as span:
+        span.set_attribute("chat.has_tool_calls", False)
+    request_span.end()
+
+    request, step = sorted(read_spans(exporter), key=lambda span: span["name"])
+    assert request["traceId"] == step["traceId"] == uuid.UUID(ctx.get_trace_id()).hex
+    assert "parentSpanId" not in request
+    assert step["parentSpanId"] == request["spanId"]
+    assert step["attributes"] == [
+        {"key": "chat.step", "value": {"intValue": "1"}},
+        {"key": "chat.has_tool_calls", "value": {"boolValue": False}},
+    ]
+    assert int(step["startTimeUnixNano"]) <= int(step["endTimeUnixNano"])
+
+
+def test_span_records_exception(exporter) -> None:
+    with pytest.raises(ValueError):
+        with start_span(get_context(), "chat.tool_calls"):
+            raise ValueError("Tool failed")
+
+    [span] = read_spans(exporter)
+    assert span["status"] == {"code": STATUS_ERROR, "message": "Tool failed"}
+    assert span["events"][0]["name"] == "exception"
+
+
+@pytest.mark.asyncio
+async def test_closed_generator_span_is_not_an_error(exporter) -> None:
+    ctx = get_context()
+
+    async def steps():
+        with start_span(ctx, "chat.model_step"):
+            yield "event"
+            yield "never consumed"
+
+    stream = steps()
+    await stream.__anext__()
+    await stream.aclose()
+
+    [span] = read_spans(exporter)
+    assert span["status"] == {"code": 0}
+
+
+def test_record_token_latency() -> None:
+    ctx = get_context()
+    ctx.with_stream_start_ms(time.time() * 1000 - 250)
+    labels = {"deployment": "tracing-test", "model": "command-r"}
+
+    last_token_time = record_token_latency(ctx, NOOP_SPAN, None, labels)
+    for _ in range(3):
+        last_token_time = record_token_latency(ctx, NOOP_SPAN, last_token_time, labels)
+
+    assert time_to_first_token.get_count(**labels) == 1
+    assert inter_token_latency.get_count(**labels) == 3
@@ -1,3 +1,6 @@
+import asyncio
+from typing import Any
+
 import pytest
 
 from backend.chat import collate
@@ -70,6 +73,79 @@ async def test_rerank() -> None:
     assert output == expected_output
 
 
+class ConcurrencyTrackingDeployment(MockCohereDeployment):
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.running = 0
+        self.max_running = 0
+
+    async def invoke_rerank(
+        self, query: str, documents: list[str], ctx: Context, **kwargs: Any
+    ) -> Any:
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        # Later queries are answered first
+        await asyncio.sleep(0.05 / len(query))
+        self.running -= 1
+        return {
+            "results": [
+                {"index": index, "relevance_score": 0.5}
+                for index in range(len(documents))
+            ]
+        }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("max_concurrency", [2, 5])
+async def test_rerank_concurrently(monkeypatch, max_concurrency) -> None:
+    monkeypatch.setattr(collate, "RERANK_MAX_CONCURRENCY", max_concurrency)
+    model = ConcurrencyTrackingDeployment(model_config={})
+    tool_results = [
+        {
+            "call": {"parameters": {"query": "q" * (i + 1)}, "name": "retriever"},
+            "outputs": [{"text": f"Document {i}"}],
+        }
+        for i in range(5)
+    ]
+
+    output = await collate.rerank_and_chunk(tool_results, model, Context())
+
+    assert model.max_running == max_concurrency
+    assert output == tool_results
+
+
+@pytest.mark.asyncio
+async def test_rerank_chunks_with_deployment_token_counter(monkeypatch) -> None:
+    model = MockCohereDeployment(model_config={})
+    token_counter_models = []
+    reranked_documents = []
+
+    async def get_token_counter(model_name: str | None, ctx: Context):
+        token_counter_models.append(model_name)
+        return lambda text: 100 * len(text.split())
+
+    async def invoke_rerank(model, query, documents, ctx):
+        reranked_documents.extend(documents)
+        return {"results": []}
+
+    monkeypatch.setattr(model, "get_token_counter", get_token_counter)
+    monkeypatch.setattr(collate, "invoke_rerank", invoke_rerank)
+    tool_results = [
+        {
+            "call": {"parameters": {"query": "numbers"}, "name": "retriever"},
+            "outputs": [{"text": "one two three four five"}],
+        }
+    ]
+
+    await collate.rerank_and_chunk(tool_results, model, Context())
+    await collate.rerank_and_chunk(tool_results, model, Context())
+
+    # The counter is fetched once per deployment and model
+    assert token_counter_models == [model.rerank_model()]
+    # Four words fill the hard limit in tokens
+    assert reranked_documents == ["one two three four", "five"] * 2
+
+
 def test_chunk_normal_mode() -> None:
     content = "This is a test. We are testing the chunk function."
     expected_output = ["This is a test.", "We are testing the chunk function."]
@@ -110,3 +186,73 @@ def test_chunk_empty_content() -> None:
     expected_output = []
     output = collate.chunk(content, False, 3, 10)
     assert output == expected_output
+
+
+def test_chunk_collapses_whitespace() -> None:
+    content = "This is a test.\nWe are  testing\tthe chunk function."
+    expected_output = ["This is a test.", "We are testing the chunk function."]
+    output = collate.chunk(content, False, 3, 10)
+    assert output == expected_output
+
+
+def test_chunk_sentence_endings() -> None:
+    content = 'Is this a test? "It is!" This sentence has no end'
+    expected_output = ["Is this a test?", '"It is!"', "This sentence has no end"]
+    output = collate.chunk(content, False, 1, 10)
+    assert output == expected_output
+
+
+def test_chunk_overlap() -> None:
+    content = "One two three. Four five six. Seven eight nine."
+    expected_output = ["One two three.", "three. Four five six.", "six. Seven eight nine."]
+    output = collate.chunk(content, False, 2, 10, overlap=1)
+    assert output == expected_output
+
+
+def test_chunk_token_limits() -> None:
+    content = "tokenization counts subwords of long words"
+    expected_output = ["tokenization counts", "subwords", "of long words"]
+    output = collate.chunk(
+        content, False, 100, 6, count_tokens=lambda text: (len(text) + 3) // 4
+    )
+    assert output == expected_output
+
+
+def test_chunk_token_limits_counts_chunks() -> None:
+    content = " ".join(["This is a test."] * 1000)
+    counted = []
+
+    def count_tokens(text: str) -> int:
+        counted.append(text)
+        return len(text.split())
+
+    output = collate.chunk(content, False, 100, 300, count_tokens=count_tokens)
+
+    assert output == collate.chunk(content, False, 100, 300)
+    # The start of the text, then each chunk, are counted rather than every word
+    assert len(counted) == len(output) + 1
+
+
+def test_chunk_spans_offsets() -> None:
+    content = "  This is a test. We are testing."
+    assert collate.chunk_spans(content, 3, 10) == [(2, 17), (18, 33)]
+
+
+@pytest.mark.parametrize("soft_limit,hard_limit", [(3, 10), (11, 10), (0, 1), (5, 7)])
+def test_chunk_vectorized_same_chunks(monkeypatch, soft_limit, hard_limit) -> None:
+    content = " ".join(
+        ["This is a test.", 'He said "stop!"', "Really?", "Another sentence without end"] * 20
+    )
+    expected_output = collate.chunk(content, False, soft_limit, hard_limit)
+
+    monkeypatch.setattr(collate, "VECTORIZED_CHUNKING_MIN_LENGTH", 0)
+    output = collate.chunk(content, False, soft_limit, hard_limit)
+
+    assert output == expected_output
+
+
+def test_chunk_many() -> None:
+    contents = ["This is a test. We are testing.", "", "Another test."]
+    expected_output = [["This is a test.", "We are testing."], [], ["Another test."]]
+    output = collate.chunk_many(contents, soft_word_cut_off=3, hard_word_cut_off=10)
+    assert output == expected_output
@@ -0,0 +1,141 @@
+import pytest
+
+from backend.crud import file_chunk as file_chunk_crud
+from backend.schemas.context import Context
+from backend.services.file import get_file_chunks
+from backend.tests.unit.factories import get_factory
+from backend.tests.unit.model_deployments.mock_deployments import (
+    MockCohereDeployment,
+)
+from backend.tools.files import SearchFileTool, VectorSearchFileTool
+
+
+@pytest.mark.asyncio
+async def test_search_file_returns_matching_chunks(session, user) -> None:
+    content = "Cats are small. " * 200 + "Quarterly revenue grew by ten percent."
+    get_factory("File", session).create(
+        id="1",
+        file_name="report.txt",
+        file_content=content,
+        user_id=user.id,
+        chunks=get_file_chunks(content),
+    )
+
+    results = await SearchFileTool().call(
+        {"search_query": "revenue", "files": [("report.txt", "1")]},
+        Context(),
+        session=session,
+        user_id=user.id,
+    )
+
+    assert len(results) == 1
+    assert "Quarterly revenue grew" in results[0]["text"]
+    assert len(results[0]["text"]) < len(content)
+    assert results[0]["title"] == "report.txt"
+
+
+@pytest.mark.asyncio
+async def test_search_file_chunks_files_uploaded_without_chunks(session, user) -> None:
+    get_factory("File", session).create(
+        id="1",
+        file_name="notes.txt",
+        file_content="Meeting notes about the revenue forecast.",
+        user_id=user.id,
+    )
+
+    results = await SearchFileTool().call(
+        {"search_query": "forecast", "files": [("notes.txt", "1")]},
+        Context(),
+        session=session,
+        user_id=user.id,
+    )
+
+    assert results[0]["text"] == "Meeting notes about the revenue forecast."
+    assert file_chunk_crud.get_chunked_file_ids(session, ["1"]) == {"1"}
+
+
+@pytest.mark.asyncio
+async def test_search_file_no_match_returns_leading_chunks(session, user) -> None:
+    get_factory("File", session).create(
+        id="1",
+        file_name="notes.txt",
+        file_content="Meeting notes.",
+        user_id=user.id,
+        chunks=get_file_chunks("Meeting notes."),
+    )
+
+    results = await SearchFileTool().call(
+        {"search_query": "revenue", "files": [("notes.txt", "1")]},
+        Context(),
+        session=session,
+        user_id=user.id,
+    )
+
+    assert results == [{"text": "Meeting notes.", "title": "notes.txt", "url": "notes.txt"}]
+
+
+@pytest.mark.asyncio
+async def test_search_file_empty_file_is_chunked_once(session, user) -> None:
+    get_factory("File", session).create(
+        id="1", file_name="empty.txt", file_content="", user_id=user.id
+    )
+
+    results = await SearchFileTool().call(
+        {"search_query": "revenue", "files": [("empty.txt", "1")]},
+        Context(),
+        session=session,
+        user_id=user.id,
+    )
+
+    assert results[0]["success"] is False
+    assert file_chunk_crud.get_chunked_file_ids(session, ["1"]) == {"1"}
+
+
+@pytest.mark.asyncio
+async def test_vector_search_file_returns_similar_chunks(session, user) -> None:
+    content = "The cat sat on the mat. " * 60 + "Quarterly revenue grew by ten percent."
+    get_factory("File", session).create(
+        id="1", file_name="report.txt", file_content=content, user_id=user.id
+    )
+
+    results = await VectorSearchFileTool().call(
+        {"search_query": "quarterly revenue", "files": [("report.txt", "1")]},
+        Context(),
+        session=session,
+        user_id=user.id,
+        model_deployment=MockCohereDeployment(),
+    )
+
+    assert "Quarterly revenue grew" in results[0]["text"]
+    assert results[0]["title"] == "report.txt"
+
+
+@pytest.mark.asyncio
+async def test_vector_search_file_deployment_cannot_embed(session, user) -> None:
+    get_factory("File", session).create(
+        id="1", file_name="report.txt", file_content="Revenue grew.", user_id=user.id
+    )
+
+    results = await VectorSearchFileTool().call(
+        {"search_query": "revenue", "files": [("report.txt", "1")]},
+        Context(),
+        session=session,
+        user_id=user.id,
+        model_deployment=None,
+    )
+
+    assert results[0]["success"] is False
+    assert "does not support embeddings" in results[0]["details"]
+
+
+@pytest.mark.asyncio
+async def test_vector_search_file_missing_files(session, user) -> None:
+    results = await VectorSearchFileTool().call(
+        {"search_query": "revenue", "files": [("report.txt", "1")]},
+        Context(),
+        session=session,
+        user_id=user.id,
+        model_deployment=MockCohereDeployment(),
+    )
+
+    assert results[0]["success"] is False
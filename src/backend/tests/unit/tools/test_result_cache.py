@@ -0,0 +1,137 @@
+from typing import Any
+
+import pytest
+
+from backend.schemas.context import Context
+from backend.schemas.tool import ToolCategory, ToolDefinition
+from backend.services import cache
+from backend.tools.base import BaseTool, ToolArgument
+from backend.tools.utils import result_cache
+from backend.tools.utils.result_cache import get_result_cache_stats
+
+
+class CountingSearchTool(BaseTool):
+    ID = "counting_search"
+    RESULT_CACHE_TTL = 60
+
+    def __init__(self):
+        self.calls = 0
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return True
+
+    @classmethod
+    def get_tool_definition(cls) -> ToolDefinition:
+        return ToolDefinition(
+            name=cls.ID,
+            display_name="Counting Search",
+            implementation=cls,
+            parameter_definitions={
+                "query": {
+                    "description": "Query to search with",
+                    "type": "str",
+                    "required": True,
+                }
+            },
+            is_visible=False,
+            is_available=cls.is_available(),
+            error_message=cls.generate_error_message(),
+            category=ToolCategory.WebSearch,
+            description="Counts its calls.",
+        )  # type: ignore
+
+    async def call(
+        self, parameters: dict, ctx: Context, **kwargs: Any,
+    ) -> list[dict[str, Any]]:
+        self.calls += 1
+        if parameters["query"] == "nothing":
+            return self.get_no_results_error()
+        return [{"text": f"result {self.calls}", "url": "https://example.com"}]
+
+
+class UncachedSearchTool(CountingSearchTool):
+    ID = "uncached_search"
+    RESULT_CACHE_TTL = None
+
+
+@pytest.mark.asyncio
+async def test_tool_results_are_cached() -> None:
+    tool = CountingSearchTool()
+
+    first = await tool.call({"query": "Python  programming"}, Context())
+    second = await tool.call({"query": "python programming "}, Context())
+
+    assert tool.calls == 1
+    assert first == second == [{"text": "result 1", "url": "https://example.com"}]
+    assert get_result_cache_stats()["counting_search"] == {"hits": 1, "misses": 1}
+
+
+@pytest.mark.asyncio
+async def test_cached_tool_results_are_copies() -> None:
+    tool = CountingSearchTool()
+
+    first = await tool.call({"query": "python"}, Context())
+    first[0]["text"] = "changed"
+    second = await tool.call({"query": "python"}, Context())
+
+    assert second[0]["text"] == "result 1"
+
+
+@pytest.mark.asyncio
+async def test_tool_results_cached_per_filter() -> None:
+    tool = CountingSearchTool()
+
+    await tool.call({"query": "python"}, Context())
+    await tool.call(
+        {"query": "python"}, Context(), **{ToolArgument.DOMAIN_FILTER: ["python.org"]}
+    )
+
+    assert tool.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_tool_error_results_are_not_cached() -> None:
+    tool = CountingSearchTool()
+
+    await tool.call({"query": "nothing"}, Context())
+    await tool.call({"query": "nothing"}, Context())
+
+    assert tool.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_tool_results_not_cached_without_ttl() -> None:
+    tool = UncachedSearchTool()
+
+    await tool.call({"query": "python"}, Context())
+    await tool.call({"query": "python"}, Context())
+
+    assert tool.calls == 2
+    assert "uncached_search" not in get_result_cache_stats()
+
+
+@pytest.mark.asyncio
+async def test_tool_result_cache_ttl_override(monkeypatch) -> None:
+    monkeypatch.setattr(result_cache, "RESULT_CACHE_TTLS", {"counting_search": 0})
+    tool = CountingSearchTool()
+
+    await tool.call({"query": "python"}, Context())
+    await tool.call({"query": "python"}, Context())
+
+    assert tool.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_tool_results_shared_through_redis(monkeypatch) -> None:
+    monkeypatch.setattr(result_cache, "USE_REDIS", True)
+    monkeypatch.setattr(cache, "get_redis_url", lambda: "redis://localhost:6379")
+    tool = CountingSearchTool()
+
+    await tool.call({"query": "python"}, Context())
+    # Another worker only shares the Redis tier
+    result_cache.clear_tool_result_cache()
+    result = await tool.call({"query": "python"}, Context())
+
+    assert tool.calls == 1
+    assert result == [{"text": "result 1", "url": "https://example.com"}]
@@ -0,0 +1,37 @@
+import pytest
+
+from backend.config.tools import (
+    Tool,
+    get_available_tools,
+    get_tool_schemas,
+    reload_available_tools,
+)
+
+
+def test_get_available_tools_is_memoized() -> None:
+    assert get_available_tools() is get_available_tools()
+    assert get_tool_schemas() is get_tool_schemas()
+
+
+def test_get_available_tools_is_read_only() -> None:
+    with pytest.raises(TypeError):
+        get_available_tools()["new_tool"] = None
+
+
+def test_tool_schemas_match_available_tools() -> None:
+    tool_id = Tool.Calculator.value.ID
+    tool = get_available_tools()[tool_id]
+    schema = get_tool_schemas()[tool_id]
+
+    assert schema.name == tool.name
+    assert schema.parameter_definitions == tool.parameter_definitions
+
+
+def test_reload_available_tools() -> None:
+    tools = get_available_tools()
+
+    reloaded_tools = reload_available_tools()
+
+    assert reloaded_tools is not tools
+    assert get_available_tools() is reloaded_tools
+    assert reloaded_tools.keys() == tools.keys()
@@ -1,6 +1,6 @@
 from backend.tools.brave_search import BraveWebSearch
 from backend.tools.calculator import Calculator
-from backend.tools.files import ReadFileTool, SearchFileTool
+from backend.tools.files import ReadFileTool, SearchFileTool, VectorSearchFileTool
 from backend.tools.github import GithubAuth, GithubTool
 from backend.tools.gmail import GmailAuth, GmailTool
 from backend.tools.google_drive import GoogleDrive, GoogleDriveAuth
@@ -20,6 +20,7 @@ __all__ = [
     "LangChainWikiRetriever",
     "ReadFileTool",
     "SearchFileTool",
+    "VectorSearchFileTool",
     "GoogleDrive",
     "GoogleDriveAuth",
     "WebScrapeTool",
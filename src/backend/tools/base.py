@@ -15,6 +15,7 @@ from backend.metrics import track_tool_call_time
 from backend.schemas.context import Context
 from backend.schemas.tool import ToolDefinition
 from backend.services.logger.utils import LoggerFactory
+from backend.tools.utils.result_cache import cache_tool_results
 from backend.tools.utils.tools_checkers import check_tool_parameters
 
 logger = LoggerFactory().get_logger()
@@ -22,6 +23,7 @@ logger = LoggerFactory().get_logger()
 class ToolErrorCode(StrEnum):
     HTTP_ERROR = "http_error"
     AUTH = "auth"
+    TIMEOUT = "timeout"
     OTHER = "other"
 
 
@@ -42,19 +44,21 @@ class ToolArgument(StrEnum):
 
 class ParametersValidationMeta(type):
     """
-    Metaclass to decorate all tools `call` methods with the parameter checker.
+    Metaclass to decorate all tools `call` methods with the parameter checker and the result cache.
     """
     def __new__(cls, name, bases, class_dict):
         for attr_name, attr_value in class_dict.items():
             if callable(attr_value) and attr_name == "call":
+                # Parameters are checked before looking up cached results
+                cached_call = cache_tool_results()(attr_value)
                 metrics_enabled = Settings().get('metrics.enabled')
                 if metrics_enabled:
                     # Decorate methods with the metrics collector and parameter checker
                     class_dict[attr_name] = track_tool_call_time()(
-                        check_tool_parameters(lambda self: self.__class__.get_tool_definition())(attr_value))
+                        check_tool_parameters(lambda self: self.__class__.get_tool_definition())(cached_call))
                 else:
                     # Decorate methods with the parameter checker
-                    class_dict[attr_name] = check_tool_parameters(lambda self: self.__class__.get_tool_definition())(attr_value)
+                    class_dict[attr_name] = check_tool_parameters(lambda self: self.__class__.get_tool_definition())(cached_call)
         return super().__new__(cls, name, bases, class_dict)
 
 
@@ -121,9 +125,11 @@ class BaseTool(metaclass=ParametersValidationMeta):
 
     Attributes:
         ID (str): The name of the tool.
+        RESULT_CACHE_TTL (int): Seconds the tool's results are cached for, not cached if None.
     """
     ID = None
     TOOL_DEFAULT_PREAMBLE = None
+    RESULT_CACHE_TTL = None
 
     def __init_subclass__(cls, **kwargs):
         """
@@ -9,6 +9,7 @@ from backend.tools.brave_search.client import BraveClient
 
 class BraveWebSearch(BaseTool):
     ID = "brave_web_search"
+    RESULT_CACHE_TTL = 60 * 60  # 1 hour
     BRAVE_API_KEY = Settings().get('tools.brave_web_search.api_key')
 
     def __init__(self):
@@ -2,8 +2,11 @@ from enum import StrEnum
 from typing import Any
 
 import backend.crud.file as file_crud
+import backend.crud.file_chunk as file_chunk_crud
 from backend.schemas.context import Context
 from backend.schemas.tool import ToolCategory, ToolDefinition
+from backend.services.file import get_file_chunks
+from backend.services.file_index import get_embedder, search_files
 from backend.tools.base import BaseTool
 
 
@@ -65,7 +68,7 @@ class ReadFileTool(BaseTool):
             return self.get_tool_error(details="Files are not passed in model generated params")
 
         _, file_id = file
-        retrieved_file = file_crud.get_file(session, file_id, user_id)
+        retrieved_file = file_crud.get_file(session, file_id, user_id, with_content=True)
         if not retrieved_file:
             return self.get_tool_error(details="The wrong files were passed in the tool parameters, or files were not found")
 
@@ -139,13 +142,152 @@ class SearchFileTool(BaseTool):
             return self.get_tool_error(
                 details="Missing files. The wrong files might have been passed in the tool parameters")
 
+        file_names = {file.id: file.file_name for file in retrieved_files}
+        self.chunk_unchunked_files(session, list(file_names), user_id)
+
+        chunks = file_chunk_crud.search_file_chunks(
+            session, list(file_names), user_id, query, limit=self.MAX_NUM_CHUNKS
+        )
+        if not chunks:
+            # No term matched, e.g. a paraphrased or non-English query, return the
+            # beginning of each file rather than nothing
+            chunks = file_chunk_crud.get_leading_file_chunks(
+                session,
+                list(file_names),
+                user_id,
+                chunks_per_file=max(1, self.MAX_NUM_CHUNKS // len(file_names)),
+            )
+
+        results = []
+        for chunk in chunks:
+            results.append(
+                {
+                    "text": chunk.text,
+                    "title": file_names[chunk.file_id],
+                    "url": file_names[chunk.file_id],
+                }
+            )
+        if not results:
+            return self.get_no_results_error()
+
+        return results
+
+    @staticmethod
+    def chunk_unchunked_files(session: Any, file_ids: list[str], user_id: str) -> None:
+        """
+        Files are chunked on upload, chunk the ones uploaded before file chunks existed.
+        """
+        unchunked_file_ids = set(file_ids) - file_chunk_crud.get_chunked_file_ids(
+            session, file_ids
+        )
+        if not unchunked_file_ids:
+            return
+
+        file_chunks = []
+        for file in file_crud.get_files_by_ids(
+            session, list(unchunked_file_ids), user_id, with_content=True
+        ):
+            for file_chunk in get_file_chunks(file.file_content):
+                file_chunk.file_id = file.id
+                file_chunks.append(file_chunk)
+
+        if file_chunks:
+            file_chunk_crud.batch_create_file_chunks(session, file_chunks)
+
+
+class VectorSearchFileTool(BaseTool):
+    """
+    Tool to semantically search a list of files with their embeddings.
+    """
+
+    ID = "vector_search_file"
+    DISPLAY_NAME = "Semantic File Search"
+    TOP_K = 10
+
+    def __init__(self):
+        pass
+
+    @classmethod
+    def is_available(cls) -> bool:
+        # Import here to avoid circular imports
+        from backend.config.deployments import AVAILABLE_MODEL_DEPLOYMENTS
+
+        return any(
+            deployment.is_available() and deployment.embed_model()
+            for deployment in AVAILABLE_MODEL_DEPLOYMENTS.values()
+        )
+
+    @classmethod
+    def generate_error_message(cls) -> str | None:
+        if cls.is_available():
+            return None
+
+        return f"{cls.__name__} is not available. It requires a model deployment that supports embeddings."
+
+    @classmethod
+    def get_tool_definition(cls) -> ToolDefinition:
+        return ToolDefinition(
+            name=cls.ID,
+            display_name=cls.DISPLAY_NAME,
+            implementation=cls,
+            parameter_definitions={
+                "search_query": {
+                    "description": "Natural language query to find the most relevant passages of the files for",
+                    "type": "str",
+                    "required": True,
+                },
+                "files": {
+                    "description": "A list of files represented as tuples of (filename, file ID) to search over",
+                    "type": "list[tuple[str, str]]",
+                    "required": True,
+                },
+            },
+            is_visible=True,
+            is_available=cls.is_available(),
+            error_message=cls.generate_error_message(),
+            category=ToolCategory.FileLoader,
+            description="Finds the passages of one or more attached files most similar in meaning to a query.",
+        ) # type: ignore
+
+    async def call(
+        self, parameters: dict, ctx: Context, **kwargs: Any,
+    ) -> list[dict[str, Any]]:
+        query = parameters.get("search_query")
+        files = parameters.get("files")
+
+        session = kwargs.get("session")
+        user_id = kwargs.get("user_id", "")
+
+        if not query or not files:
+            return self.get_tool_error(
+                details="Missing query or files. The wrong files might have been passed in the tool parameters")
+
+        embedder = get_embedder(kwargs.get("model_deployment"), ctx)
+        if embedder is None:
+            return self.get_tool_error(
+                details="The model deployment does not support embeddings, use the search_file tool instead")
+
+        file_ids = [file_id for _, file_id in files]
+        retrieved_files = file_crud.get_files_by_ids(session, file_ids, user_id)
+
+        if not retrieved_files:
+            return self.get_tool_error(
+                details="Missing files. The wrong files might have been passed in the tool parameters")
+
+        file_names = {file.id: file.file_name for file in retrieved_files}
+        SearchFileTool.chunk_unchunked_files(session, list(file_names), user_id)
+
+        chunks = await search_files(
+            session, list(file_names), query, embedder, top_k=self.TOP_K
+        )
+
         results = []
-        for file in retrieved_files:
+        for chunk, _ in chunks:
             results.append(
                 {
-                    "text": file.file_content,
-                    "title": file.file_name,
-                    "url": file.file_name,
+                    "text": chunk.text,
+                    "title": file_names[chunk.file_id],
+                    "url": file_names[chunk.file_id],
                 }
             )
         if not results:
@@ -10,6 +10,7 @@ from backend.tools.base import BaseTool, ToolArgument
 
 class GoogleWebSearch(BaseTool):
     ID = "google_web_search"
+    RESULT_CACHE_TTL = 60 * 60  # 1 hour
     API_KEY = Settings().get('tools.google_web_search.api_key')
     CSE_ID = Settings().get('tools.google_web_search.cse_id')
 
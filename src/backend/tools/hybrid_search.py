@@ -6,6 +6,7 @@ from backend.config.settings import Settings
 from backend.model_deployments.base import BaseDeployment
 from backend.schemas.context import Context
 from backend.schemas.tool import ToolCategory, ToolDefinition
+from backend.services.rerank import invoke_rerank
 from backend.tools.base import BaseTool, ToolArgument
 from backend.tools.brave_search.tool import BraveWebSearch
 from backend.tools.google_search import GoogleWebSearch
@@ -143,7 +144,8 @@ class HybridWebSearch(BaseTool):
                 and "text" in result
             ]
 
-            batch_output = await model.invoke_rerank(
+            batch_output = await invoke_rerank(
+                model,
                 query=query,
                 documents=documents,
                 ctx=ctx,
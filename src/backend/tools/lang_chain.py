@@ -25,6 +25,7 @@ class LangChainWikiRetriever(BaseTool):
     This requires wikipedia package to be installed.
     """
     ID = "wikipedia"
+    RESULT_CACHE_TTL = 24 * 60 * 60  # 1 day
 
     def __init__(self, chunk_size: int = 300, chunk_overlap: int = 0):
         self.chunk_size = chunk_size
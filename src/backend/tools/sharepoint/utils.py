@@ -1,4 +1,4 @@
-from backend.services.file import (
+from backend.services.file_extraction import (
     CALENDAR_EXTENSION,
     CSV_EXTENSION,
     DOCX_EXTENSION,
@@ -14,8 +14,8 @@ from backend.services.file import (
     read_docx,
     read_excel,
     read_parquet,
+    read_pdf,
 )
-from backend.services.utils import read_pdf
 
 
 def serialize_metadata(resource: dict) -> dict:
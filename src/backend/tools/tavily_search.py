@@ -10,6 +10,7 @@ from backend.tools.base import BaseTool, ToolArgument
 
 class TavilyWebSearch(BaseTool):
     ID = "tavily_web_search"
+    RESULT_CACHE_TTL = 60 * 60  # 1 hour
     TAVILY_API_KEY = Settings().get('tools.tavily_web_search.api_key')
 
     def __init__(self):
@@ -1,5 +1,7 @@
 from backend.services.auth.crypto import encrypt
-from backend.services.cache import cache_get_dict, cache_put
+from backend.services.cache import cache_put
+
+TOOL_AUTH_CACHE_TTL = 60 * 60  # 1 hour
 
 
 class ToolAuthenticationCacheMixin:
@@ -12,11 +14,8 @@ class ToolAuthenticationCacheMixin:
         # Encrypt value with Fernet and convert to string
         key = encrypt(value).decode()
 
-        # Existing cache entry
-        if cache_get_dict(key):
-            return key
-
+        # Fernet tokens are unique per call, so the key is never already cached
         payload = {"user_id": user_id, "tool_id": tool_id}
-        cache_put(key, payload)
+        cache_put(key, payload, ttl=TOOL_AUTH_CACHE_TTL)
 
         return key
@@ -0,0 +1,257 @@
+"""
+Two-tier cache of tool call results.
+
+Tools opt in by setting `RESULT_CACHE_TTL`, which tools.result_cache.ttls can override per
+tool ID. Results are keyed by tool ID, the normalized call parameters and filter arguments,
+and the user for tools that require authentication. They are looked up in an in-process
+LRU first, then in Redis (if redis.url is set) so they are shared across workers.
+"""
+
+import functools
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable
+
+from backend.config.settings import Settings
+from backend.metrics import collector, tool_result_cache_lookups
+from backend.services.cache import async_cache_get, async_cache_put
+from backend.services.logger.utils import LoggerFactory
+
+RESULT_CACHE_KEY_PREFIX = "tool_result"
+RESULT_CACHE_ENABLED = Settings().get('tools.result_cache.enabled')
+RESULT_CACHE_TTLS = Settings().get('tools.result_cache.ttls') or {}
+RESULT_CACHE_MAX_ENTRIES = Settings().get('tools.result_cache.max_entries') or 0
+USE_REDIS = bool(Settings().get('redis.url'))
+METRICS_ENABLED = Settings().get('metrics.enabled')
+
+logger = LoggerFactory().get_logger()
+
+_results: "OrderedDict[str, tuple[str, float]]" = OrderedDict()
+_policies: dict[type, tuple[int, bool]] = {}
+_stats: dict[str, dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0})
+_lock = threading.Lock()
+
+
+def cache_tool_results() -> Callable:
+    """
+    Decorator caching the results of a tool `call` method for the tool's cache TTL.
+    Error results are never cached.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs) -> Any:
+            ttl, per_user = get_result_cache_policy(self.__class__)
+            if not ttl:
+                return await func(self, *args, **kwargs)
+
+            start_time = time.time()
+            parameters = kwargs.get("parameters", {}) or (args[0] if args else {})
+            key = get_result_cache_key(self.__class__.ID, parameters, kwargs, per_user)
+            if key is None:
+                return await func(self, *args, **kwargs)
+
+            result = await get_cached_result(key, ttl)
+            _record(self.__class__, result is not None, time.time() - start_time)
+            if result is not None:
+                return result
+
+            result = await func(self, *args, **kwargs)
+            if is_cacheable_result(result):
+                await put_cached_result(key, result, ttl)
+
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def get_result_cache_policy(tool_class: type) -> tuple[int, bool]:
+    """
+    Get how a tool's results are cached, resolved once per tool class.
+
+    Args:
+        tool_class (type): The tool class
+
+    Returns:
+        tuple[int, bool]: The cache TTL in seconds, 0 if not cached, and whether results
+            are cached per user
+    """
+    policy = _policies.get(tool_class)
+    if policy is not None:
+        return policy
+
+    ttl = 0
+    per_user = False
+    if RESULT_CACHE_ENABLED:
+        ttl = RESULT_CACHE_TTLS.get(tool_class.ID, tool_class.RESULT_CACHE_TTL) or 0
+
+    if ttl:
+        per_user = tool_class.get_tool_definition().auth_implementation is not None
+
+    policy = (ttl, per_user)
+    _policies[tool_class] = policy
+    return policy
+
+
+def get_result_cache_key(
+    tool_id: str, parameters: dict, kwargs: dict[str, Any], per_user: bool
+) -> str | None:
+    """
+    Build the cache key of a tool call.
+
+    Args:
+        tool_id (str): The tool ID
+        parameters (dict): The parameters passed by the model
+        kwargs (dict[str, Any]): The other arguments of the call
+        per_user (bool): Whether the result depends on the calling user
+
+    Returns:
+        str | None: The cache key, None if the result depends on an unknown user
+    """
+    # Import here to avoid circular imports
+    from backend.tools.base import ToolArgument
+
+    key_parts = {
+        "parameters": _normalize(parameters),
+        "arguments": {
+            argument.value: _normalize(kwargs[argument])
+            for argument in ToolArgument
+            if kwargs.get(argument)
+        },
+    }
+    if per_user:
+        if not kwargs.get("user_id"):
+            return None
+        key_parts["user_id"] = kwargs["user_id"]
+
+    serialized = json.dumps(key_parts, sort_keys=True, default=str)
+    return f"{RESULT_CACHE_KEY_PREFIX}:{tool_id}:{hashlib.sha256(serialized.encode()).hexdigest()}"
+
+
+def is_cacheable_result(result: Any) -> bool:
+    if not isinstance(result, list) or not result:
+        return False
+
+    # Errors and "no results" answers are ToolError dicts with success set to False
+    return not any(isinstance(item, dict) and item.get("success") is False for item in result)
+
+
+async def get_cached_result(key: str, ttl: int) -> list[dict[str, Any]] | None:
+    """
+    Get a cached tool result from the in-process cache, or from Redis.
+
+    Args:
+        key (str): The cache key
+        ttl (int): The cache TTL in seconds, used to keep results found in Redis locally
+
+    Returns:
+        list[dict[str, Any]] | None: A copy of the cached result, None if not cached
+    """
+    now = time.monotonic()
+    with _lock:
+        entry = _results.get(key)
+        if entry is not None:
+            if entry[1] > now:
+                _results.move_to_end(key)
+                return json.loads(entry[0])
+            del _results[key]
+
+    if not USE_REDIS:
+        return None
+
+    try:
+        serialized = await async_cache_get(key)
+    except Exception as e:
+        logger.warning(event="[Tool Result Cache] Error reading from Redis", error=str(e))
+        return None
+
+    if serialized is None:
+        return None
+
+    _put_local(key, serialized, ttl)
+    return json.loads(serialized)
+
+
+async def put_cached_result(key: str, result: list[dict[str, Any]], ttl: int) -> None:
+    """
+    Cache a tool result in-process and in Redis.
+
+    Args:
+        key (str): The cache key
+        result (list[dict[str, Any]]): The tool result
+        ttl (int): The cache TTL in seconds
+    """
+    try:
+        serialized = json.dumps(result)
+    except (TypeError, ValueError):
+        # Results that are not JSON serializable are not cached
+        return
+
+    _put_local(key, serialized, ttl)
+
+    if not USE_REDIS:
+        return
+
+    try:
+        await async_cache_put(key, serialized, ttl=ttl)
+    except Exception as e:
+        logger.warning(event="[Tool Result Cache] Error writing to Redis", error=str(e))
+
+
+def get_result_cache_stats() -> dict[str, dict[str, int]]:
+    """
+    Get the cache hits and misses per tool ID since the process started.
+    """
+    with _lock:
+        return {tool_id: dict(stats) for tool_id, stats in _stats.items()}
+
+
+def clear_tool_result_cache() -> None:
+    """
+    Drop the in-process cached results, statistics and resolved cache policies.
+    """
+    with _lock:
+        _results.clear()
+        _policies.clear()
+        _stats.clear()
+
+
+def _put_local(key: str, serialized: str, ttl: int) -> None:
+    if RESULT_CACHE_MAX_ENTRIES <= 0:
+        return
+
+    with _lock:
+        _results[key] = (serialized, time.monotonic() + ttl)
+        _results.move_to_end(key)
+        while len(_results) > RESULT_CACHE_MAX_ENTRIES:
+            _results.popitem(last=False)
+
+
+def _record(tool_class: type, hit: bool, latency: float) -> None:
+    with _lock:
+        _stats[tool_class.ID]["hits" if hit else "misses"] += 1
+
+    if METRICS_ENABLED:
+        tool_result_cache_lookups.inc(tool=tool_class.ID, result="hit" if hit else "miss")
+        collector.add_metric(
+            "tool_cache",
+            "hit" if hit else "miss",
+            latency,
+            class_name=tool_class.__name__,
+            method_name="call",
+        )
+
+
+def _normalize(value: Any) -> Any:
+    # Queries differing only by case or whitespace share a cache entry
+    if isinstance(value, str):
+        return " ".join(value.split()).casefold()
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
@@ -88,6 +88,33 @@ def _check_type_recursive(value, expected_type) -> bool:
     return False
 
 
+def validate_tool_parameters(parameter_definitions: dict, parameters: dict) -> None:
+    """
+    Check the parameters passed by the model to a tool against its parameter definitions.
+
+    Args:
+        parameter_definitions (dict): The parameter definitions of the tool.
+        parameters (dict): The parameters passed by the model.
+
+    Raises:
+        ValueError: If a required parameter is missing.
+        TypeError: If a parameter has an invalid type.
+    """
+    for param, rules in parameter_definitions.items():
+        is_required = rules.get("required", False)
+        if param not in parameters:
+            if is_required:
+                raise ValueError(f"Model didn't pass required parameter: {param}")
+        else:
+            value = parameters[param]
+            if not value and is_required:
+                raise ValueError(f"Model passed empty value for required parameter: {param}")
+            if not check_type(value, rules["type"]):
+                raise TypeError(
+                    f"Model passed invalid parameter. Parameter '{param}' must be of type {rules['type']}, but got {type(value).__name__}"
+                )
+
+
 def check_tool_parameters(tool_definition: ToolDefinition) -> None:
     """
     Decorator to check the parameters of a tool that was passed to a method by the model.
@@ -104,20 +131,7 @@ def check_tool_parameters(tool_definition: ToolDefinition) -> None:
         def wrapper(self, *args, **kwargs):
             parameter_definitions = tool_definition(self).parameter_definitions
             passed_method_params = kwargs.get("parameters", {}) or args[0]
-            # Validate parameters
-            for param, rules in parameter_definitions.items():
-                is_required = rules.get("required", False)
-                if param not in passed_method_params:
-                    if is_required:
-                        raise ValueError(f"Model didn't pass required parameter: {param}")
-                else:
-                    value = passed_method_params[param]
-                    if not value and is_required:
-                        raise ValueError(f"Model passed empty value for required parameter: {param}")
-                    if not check_type(value, rules["type"]):
-                        raise TypeError(
-                            f"Model passed invalid parameter. Parameter '{param}' must be of type {rules['type']}, but got {type(value).__name__}"
-                        )
+            validate_tool_parameters(parameter_definitions, passed_method_params)
 
             return func(self, *args, **kwargs)
 
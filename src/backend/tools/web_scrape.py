@@ -5,8 +5,8 @@ from bs4 import BeautifulSoup
 
 from backend.schemas.context import Context
 from backend.schemas.tool import ToolCategory, ToolDefinition
+from backend.services.file_extraction import read_pdf
 from backend.services.logger.utils import LoggerFactory
-from backend.services.utils import read_pdf
 from backend.tools.base import BaseTool
 from backend.tools.constants import ASYNC_TIMEOUT
 
@@ -8,6 +8,7 @@ from backend.tools.base import BaseTool
 
 class ArxivRetriever(BaseTool):
     ID = "arxiv"
+    RESULT_CACHE_TTL = 24 * 60 * 60  # 1 day
 
     def __init__(self):
         self.client = ArxivAPIWrapper()
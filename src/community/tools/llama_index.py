@@ -86,7 +86,9 @@ class LlamaIndexUploadPDFRetriever(BaseTool):
             return []
 
         file_ids = [file_id for _, file_id in files]
-        retrieved_files = file_crud.get_files_by_ids(session, file_ids, user_id)
+        retrieved_files = file_crud.get_files_by_ids(
+            session, file_ids, user_id, with_content=True
+        )
         if not retrieved_files:
             return self.get_no_results_error()
 